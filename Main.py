@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 import time
@@ -7,6 +8,7 @@ from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtWidgets import QApplication, QSplashScreen
 
 from gui.Alloyact_GUI_Pro import AlloyActProGUI
+from models.integral_cache import enable_persistent_cache
 
 
 def get_resource_path (relative_path):
@@ -18,12 +20,21 @@ def get_resource_path (relative_path):
 	return os.path.join(base_path, relative_path)
 
 
+def init_calculation_cache ():
+	"""启用二元积分的磁盘缓存，再次启动时可直接复用之前计算过的 GSM/UEM2 积分。"""
+	try:
+		enable_persistent_cache()
+	except Exception as e:
+		print(f"启用积分磁盘缓存失败: {e}")
+
+
 def run_gui ():
 	"""
 	设置并运行 PyQt5 图形用户界面应用程序。
 	"""
 	# 创建应用程序实例
 	app = QApplication(sys.argv)
+	init_calculation_cache()
 	
 	# 设置高 DPI 缩放支持
 	app.setAttribute(Qt.AA_EnableHighDpiScaling, True)
@@ -114,6 +125,7 @@ def run_gui_with_timer ():
 	使用定时器的启动画面版本（更流畅的用户体验）
 	"""
 	app = QApplication(sys.argv)
+	init_calculation_cache()
 	app.setAttribute(Qt.AA_EnableHighDpiScaling, True)
 	app.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 	
@@ -256,6 +268,8 @@ def create_default_splash ():
 
 
 if __name__ == "__main__":
+	# 打包后的程序中，扫描计算的子进程从这里启动
+	multiprocessing.freeze_support()
 	# 选择启动方式
 	# run_gui()           # 简单启动画面版本
 	run_gui_with_timer()  # 带进度的启动画面版本（推荐）
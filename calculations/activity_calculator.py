@@ -2,13 +2,231 @@
 
 import re
 from copy import deepcopy
-from typing import Callable, Dict
+from typing import Callable, Dict, Sequence
+
+import numpy as np
 
 from core.element import Element
 from models.activity_interaction_parameters import TernaryMelts
 
 extrap_func = Callable[[str, str, str, float, str], float]
 
+
+class SystemContext:
+    """
+    一次计算或一次扫描共用的体系上下文：溶剂、元素集合、温度、相态与外推模型固定不变。
+
+    ln γ°、ε、ρ 与成分无关，首次使用时计算并保存，之后每个成分点的 ln γ 只需对摩尔分数
+    做多项式求值。参数计算出错时保存异常，每次求值时重新抛出，与逐点计算的行为一致。
+    """
+
+    def __init__(self, components, solvent: str, Tem: float, state: str, extra_model: extrap_func,
+                 extra_model_name: str, full_alloy_str: str = ""):
+        self.solvent = solvent
+        self.solute_keys = [k for k in dict.fromkeys(components) if k != solvent]
+        self.Tem = Tem
+        self.state = state
+        self.extra_model = extra_model
+        self.extra_model_name = extra_model_name
+        self.full_alloy_str = full_alloy_str
+        self._position = {name: idx for idx, name in enumerate(self.solute_keys)}
+        self._solv = Element(solvent)
+        self._solute_elements = [Element(name) for name in self.solute_keys]
+        self._ternary_melts = TernaryMelts(Tem, state)
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            try:
+                self._cache[key] = (True, compute())
+            except Exception as e:
+                self._cache[key] = (False, e)
+        ok, value = self._cache[key]
+        if not ok:
+            raise value
+        return value
+
+    @property
+    def epsilon(self):
+        """ε 矩阵，形状为 (N, N)，下标顺序与 solute_keys 一致。"""
+        return self._cached("epsilon", lambda: self._ternary_melts.first_order_matrix(
+                self._solv, self._solute_elements, self.Tem, self.state, self.extra_model, self.extra_model_name,
+                self.full_alloy_str))
+
+    @property
+    def ln_y0(self):
+        """各溶质的 ln γ°，形状为 (N,)。"""
+        return self._cached("ln_y0", lambda: np.array([self._ternary_melts.ln_y0(self._solv, e)
+                                                       for e in self._solute_elements]))
+
+    @property
+    def rho(self):
+        """ρ 张量，形状为 (N, N, N)，rho[i, j, k] = ρ_i^{jk}。"""
+        return self._cached("rho", lambda: self._ternary_melts.second_order_tensor(
+                self._solv, self._solute_elements, self.Tem, self.state, self.extra_model, self.extra_model_name,
+                self.full_alloy_str, self.epsilon))
+
+    def rho_row(self, solute: str):
+        """溶质 i 的 ρ_i^{jk}，形状为 (N, N)；只计算这一层。"""
+        i = self._position[solute]
+        if self._cache.get("rho", (False,))[0]:
+            return self._cache["rho"][1][i]
+        return self._cached(("rho", solute), lambda: self._ternary_melts.second_order_tensor(
+                self._solv, self._solute_elements, self.Tem, self.state, self.extra_model, self.extra_model_name,
+                self.full_alloy_str, self.epsilon, targets=[self._solute_elements[i]])[0])
+
+    def covers(self, comp_dict) -> bool:
+        """成分中的元素是否都属于本体系。"""
+        return all(k == self.solvent or k in self._position for k in comp_dict)
+
+    def ln_gamma(self, comp_dict: Dict[str, float], component: str, activity_model_type: str) -> float:
+        """
+        计算给定成分下组元 component 的 ln γ，结果与 ActivityCoefficient.get_ln_gamma 相同。
+        溶剂按 UIPF 公式计算；成分中含有本体系以外的元素时按该成分重新建立上下文。
+        """
+        if component not in comp_dict or self.solvent not in comp_dict:
+            print(f"警告: 组分 {component} 或溶剂 {self.solvent} 不在成分中。")
+            return 0.0
+        if not self.covers(comp_dict):
+            return SystemContext(comp_dict.keys(), self.solvent, self.Tem, self.state, self.extra_model,
+                                 self.extra_model_name, self.full_alloy_str).ln_gamma(comp_dict, component,
+                                                                                      activity_model_type)
+
+        solute_keys = [k for k in comp_dict.keys() if k != self.solvent]
+        # 如果体系中只有溶剂，则 ln γ_solvent = 0 (活度系数为 1)
+        if not solute_keys:
+            return 0.0
+        idx = [self._position[name] for name in solute_keys]
+        x = np.array([comp_dict[name] for name in solute_keys], dtype=float)
+        epsilon = self.epsilon[np.ix_(idx, idx)]
+
+        if component == self.solvent:
+            # UIPF: ln γ₁ = - (1/2) * Σ(j,k=2 to N) ε_jk * X_j * X_k
+            return -0.5 * float(np.einsum('j,k,jk->', x, x, epsilon))
+
+        i = solute_keys.index(component)
+        ln_yi_0 = float(self.ln_y0[self._position[component]])
+
+        # Σ_j ε_i^j x_j
+        linear_sum = float(np.einsum('j,j->', epsilon[i], x))
+
+        if activity_model_type == "Wagner" or activity_model_type == "wagner":
+            return ln_yi_0 + linear_sum
+
+        # Σ_j Σ_k ε_j^k x_j x_k
+        quadratic_sum_darken = float(np.einsum('j,k,jk->', x, x, epsilon))
+
+        if activity_model_type == "Darken" or activity_model_type == "darken":
+            return ln_yi_0 + linear_sum - 0.5 * quadratic_sum_darken
+
+        # ρ_i^{jk}，Elliott 只需要 i 这一层
+        rho_i = self.rho_row(component)[np.ix_(idx, idx)]
+        # 1/2 Σ_j Σ_k ρ_i^{jk} x_j x_k
+        quadratic_sum_elliot = 0.5 * float(np.einsum('jk,j,k->', rho_i, x, x))
+
+        if activity_model_type == "Elliott" or activity_model_type == "elliott":
+            return ln_yi_0 + linear_sum + quadratic_sum_elliot
+
+        # ρ[i, j, k] = ρ_i^{jk}，整个体系一次算出
+        rho = self.rho[np.ix_(idx, idx, idx)]
+        # Σ_j Σ_k Σ_p x_p x_j x_k (ρ_k^{pj} + ε_j^k)
+        corrected_term_sum = float(np.einsum('p,j,k,kpj->', x, x, x, rho)) + float(np.sum(x)) * quadratic_sum_darken
+        if activity_model_type == "Elliot1" or activity_model_type == "elliot1":
+            # 仿照Darken修正项：添加三次修正项
+            return ln_yi_0 + linear_sum + quadratic_sum_elliot  - 1.0/3*corrected_term_sum
+
+        return 0.0 # Should not happen
+
+class TemperatureSweep:
+    """
+    固定成分下的温度扫描：成分、溶剂、相态与外推模型固定，温度作为数组一次求值。
+
+    元素属性、Fab 与体积项只整理一次，ε、ρ、ln γ° 按 (温度, ...) 数组整体计算，
+    各模型的 ln γ 再由同一组参数一次得到。贡献系数 α 仍需在每个温度下调用外推模型。
+    某一温度下逐点计算会出现零除或模型出错时，该温度改为逐点计算，出错的结果为 NaN。
+    """
+
+    def __init__(self, comp_dict: Dict[str, float], solvent: str, state: str, extra_model: extrap_func,
+                 extra_model_name: str, full_alloy_str: str = ""):
+        self.comp_dict = dict(comp_dict)
+        self.solvent = solvent
+        self.state = state
+        self.extra_model = extra_model
+        self.extra_model_name = extra_model_name
+        self.full_alloy_str = full_alloy_str
+        self.solute_keys = [k for k in self.comp_dict if k != solvent]
+        self._solv = Element(solvent)
+        self._solute_elements = [Element(name) for name in self.solute_keys]
+        self._x = np.array([self.comp_dict[name] for name in self.solute_keys], dtype=float)
+
+    def _point_ln_gamma(self, Tem: float, component: str, formalisms):
+        """逐点计算一个温度下的 ln γ，出错时为 NaN。"""
+        context = SystemContext(self.comp_dict.keys(), self.solvent, Tem, self.state, self.extra_model,
+                                self.extra_model_name, self.full_alloy_str)
+        values = []
+        for formalism in formalisms:
+            try:
+                values.append(context.ln_gamma(self.comp_dict, component, formalism))
+            except Exception:
+                values.append(np.nan)
+        return values
+
+    def evaluate(self, temperatures, component: str, formalisms=("Darken", "Elliott")):
+        """
+        计算组元 component 在一组温度下的 ln γ。
+
+        参数:
+        temperatures: 温度数组 (K)。
+        component: 待计算的组元，溶剂按 UIPF 公式计算。
+        formalisms: 活度模型列表 (Wagner、Darken、Elliott、Elliot1)。
+
+        返回:
+        np.ndarray: 形状为 (温度数, 模型数) 的 ln γ。
+        """
+        temperatures = np.atleast_1d(np.asarray(temperatures, dtype=float))
+        formalisms = list(formalisms)
+        result = np.zeros((len(temperatures), len(formalisms)))
+        if component not in self.comp_dict or self.solvent not in self.comp_dict:
+            print(f"警告: 组分 {component} 或溶剂 {self.solvent} 不在成分中。")
+            return result
+        if not self.solute_keys or not len(temperatures):
+            return result
+
+        melts = TernaryMelts(float(temperatures[0]), self.state)
+        names = [self.solvent] + self.solute_keys
+        tensors = melts.contribution_tensors(names, temperatures, self.state, self.extra_model)
+        epsilon = melts.first_order_matrices(self._solv, self._solute_elements, temperatures, self.state,
+                                             self.extra_model, self.extra_model_name, self.full_alloy_str,
+                                             tensors=tensors)
+        x = self._x
+
+        if component == self.solvent:
+            # UIPF: ln γ₁ = - (1/2) * Σ(j,k=2 to N) ε_jk * X_j * X_k
+            result[:] = -0.5 * np.einsum('j,k,mjk->m', x, x, epsilon)[:, None]
+        else:
+            i = self.solute_keys.index(component)
+            ln_y0 = melts.ln_y0_array(self._solv, self._solute_elements, temperatures)
+            models = [f.lower() for f in formalisms]
+            rho = None
+            if "elliot1" in models:
+                rho = melts.second_order_tensors(self._solv, self._solute_elements, temperatures, self.state,
+                                                 self.extra_model, self.extra_model_name, self.full_alloy_str,
+                                                 epsilon, tensors=tensors)
+            elif "elliott" in models:
+                # Elliott 只需要 i 这一层，其余各层不参与结果
+                rho = np.full(epsilon.shape[:1] + (len(x),) * 3, np.nan)
+                rho[:, i] = melts.second_order_tensors(self._solv, self._solute_elements, temperatures,
+                                                       self.state, self.extra_model, self.extra_model_name,
+                                                       self.full_alloy_str, epsilon,
+                                                       targets=[self._solute_elements[i]], tensors=tensors)[:, 0]
+            for column, formalism in enumerate(formalisms):
+                result[:, column] = ActivityCoefficient._solute_ln_gamma(formalism, x, ln_y0, epsilon, rho)[:, i]
+
+        for m in np.flatnonzero(np.isnan(result).any(axis=1)):
+            result[m] = self._point_ln_gamma(float(temperatures[m]), component, formalisms)
+        return result
+
+
 class ActivityCoefficient:
     """提供计算活度和活度系数的高级接口。"""
     def __init__(self):
@@ -49,85 +267,10 @@ class ActivityCoefficient:
             print(f"警告: 组分 {solute_i} 或溶剂 {solvent} 不在成分中。")
             return 0.0
 
-        solv = Element(solvent)
-        solui = Element(solute_i)
-        solute_keys = [k for k in comp_dict.keys() if k != solvent]
-        
-        ternary_melts = TernaryMelts(Tem, state)
-        ln_yi_0 = ternary_melts.ln_y0(solv, solui)
-
-        linear_sum = 0.0
-        for j_name in solute_keys:
-            xj = comp_dict[j_name]
-            epsilon_i_j = ternary_melts.activity_interact_coefficient_1st(solv, solui, Element(j_name), Tem, state,
-                                                                          geo_model, geo_model_name, full_alloy_str)
-            linear_sum += epsilon_i_j * xj
-
-        if activity_model_type == "Wagner" or activity_model_type == "wagner":
-            return ln_yi_0 + linear_sum
-
-        quadratic_sum_darken = 0.0
-        for j_name in solute_keys:
-            xj = comp_dict[j_name]
-            for k_name in solute_keys:
-                xk = comp_dict[k_name]
-                epsilon_j_k = ternary_melts.activity_interact_coefficient_1st(solv, Element(j_name), Element(k_name),
-                                                                              Tem, state, geo_model, geo_model_name,
-                                                                              full_alloy_str)
-                quadratic_sum_darken += xj * xk * epsilon_j_k
+        context = SystemContext(comp_dict.keys(), solvent, Tem, state, geo_model, geo_model_name, full_alloy_str)
+        return context.ln_gamma(comp_dict, solute_i, activity_model_type)
 
-        if activity_model_type == "Darken" or activity_model_type == "darken":
-            return ln_yi_0 + linear_sum - 0.5 * quadratic_sum_darken
-
-        quadratic_sum_elliot = 0.0
-        for j_name in solute_keys:
-            xj = comp_dict[j_name]
-            soluj = Element(j_name)
-            for k_name in solute_keys:
-                xk = comp_dict[k_name]
-                soluk = Element(k_name)
-                rho_i_jk = ternary_melts.roui_jk(solv, solui, soluj, soluk, Tem, state, geo_model, geo_model_name)
-                
-                quadratic_sum_elliot += 0.5 * rho_i_jk * xj * xk
-               
-
-        if activity_model_type == "Elliott" or activity_model_type == "elliott":
-            return ln_yi_0 + linear_sum + quadratic_sum_elliot
-            
-        
-        corrected_term_sum = 0
-        for j_name in solute_keys:
-            xj = comp_dict[j_name]
-            soluj = Element(j_name)
-            for k_name in solute_keys:
-                xk = comp_dict[k_name]
-                soluk = Element(k_name)
-                for p_name in solute_keys:
-                    xp = comp_dict[p_name]
-                    solup = Element(p_name)
-                    epislon_j_k = ternary_melts.activity_interact_coefficient_1st(solv, Element(j_name),
-                                                                                  Element(k_name), Tem, state,
-                                                                                  geo_model, geo_model_name,
-                                                                                  full_alloy_str)
-                    epislon_j_p = ternary_melts.activity_interact_coefficient_1st(solv, Element(j_name),
-                                                                                  Element(p_name), Tem, state,
-                                                                                  geo_model, geo_model_name,
-                                                                                  full_alloy_str)
-                    epislon_p_k = ternary_melts.activity_interact_coefficient_1st(solv, Element(p_name),
-                                                                                  Element(k_name), Tem, state,
-                                                                                  geo_model, geo_model_name,
-                                                                                  full_alloy_str)
-                    rho_p_jk = ternary_melts.roui_jk(solv, soluk, solup, soluj, Tem, state, geo_model, geo_model_name)
-                    corrected_term_sum +=  xp * xj * xk * (rho_p_jk + epislon_j_k)
-        if activity_model_type == "Elliot1" or activity_model_type == "elliot1":
-            # 仿照Darken修正项：添加三次修正项
-            return ln_yi_0 + linear_sum + quadratic_sum_elliot  - 1.0/3*corrected_term_sum
-            
-            
-        return 0.0 # Should not happen
-        
-       
-        # 📍 新增功能 1: 根据 Kang-2020.pdf (UIPF模型) 实现溶剂活度系数的计算
+    # 📍 新增功能 1: 根据 Kang-2020.pdf (UIPF模型) 实现溶剂活度系数的计算
     def _calculate_ln_gamma_solvent_UIPF (self, comp_dict: Dict[str, float], solvent: str, Tem: float, state: str,
                                               geo_model: extrap_func, geo_model_name: str,activity_model_type:str,
                                               full_alloy_str: str = "") -> float:
@@ -140,34 +283,139 @@ class ActivityCoefficient:
             print(f"警告: 溶剂 {solvent} 不在成分中。")
             return 0.0
 
-        solv = Element(solvent)
-        solute_keys = [k for k in comp_dict.keys() if k != solvent]
-        
-        # 如果体系中只有溶剂，则 ln γ_solvent = 0 (活度系数为 1)
+        context = SystemContext(comp_dict.keys(), solvent, Tem, state, geo_model, geo_model_name, full_alloy_str)
+        return context.ln_gamma(comp_dict, solvent, activity_model_type)
+
+    def create_system_context(self, components, solvent: str, Tem: float, state: str, extra_model: extrap_func,
+                              extra_model_name: str, full_alloy_str: str = "") -> SystemContext:
+        """
+        为一次扫描建立体系上下文：相互作用参数只计算一次，各成分点通过 context.ln_gamma 求值。
+
+        参数:
+        components: 扫描中可能出现的全部元素 (含溶剂)。
+        其余参数与 get_ln_gamma 相同。
+        """
+        return SystemContext(components, solvent, Tem, state, extra_model, extra_model_name, full_alloy_str)
+
+    def create_temperature_sweep(self, comp_dict: Dict[str, float], solvent: str, state: str,
+                                 extra_model: extrap_func, extra_model_name: str,
+                                 full_alloy_str: str = "") -> TemperatureSweep:
+        """为固定成分建立温度扫描，sweep.evaluate(temperatures, component, formalisms) 一次计算全部温度。"""
+        return TemperatureSweep(comp_dict, solvent, state, extra_model, extra_model_name, full_alloy_str)
+
+    @staticmethod
+    def _solute_ln_gamma(activity_model_type: str, x, ln_y0, epsilon, rho=None):
+        """
+        由相互作用参数计算全部溶质的 ln γ。
+
+        参数:
+        activity_model_type: 活度模型 (Wagner、Darken、Elliott、Elliot1)。
+        x: 溶质摩尔分数，形状为 (N,) 或 (M, N)。
+        ln_y0: 各溶质的 ln γ°，形状为 (N,)，按温度堆叠时为 (M, N)。
+        epsilon: ε 矩阵，形状为 (N, N)，按温度堆叠时为 (M, N, N)。
+        rho: ρ 张量，形状为 (N, N, N) 或 (M, N, N, N)，仅 Elliott、Elliot1 需要。
+
+        返回:
+        np.ndarray: x 与参数广播后形状的 ln γ。
+        """
+        model = activity_model_type.lower()
+        linear_sum = np.einsum('...ij,...j->...i', epsilon, x)
+        if model == "wagner":
+            return ln_y0 + linear_sum
+
+        quadratic_sum_darken = np.einsum('...j,...k,...jk->...', x, x, epsilon)[..., None]
+        if model == "darken":
+            return ln_y0 + linear_sum - 0.5 * quadratic_sum_darken
+
+        quadratic_sum_elliot = 0.5 * np.einsum('...ijk,...j,...k->...i', rho, x, x)
+        if model == "elliott":
+            return ln_y0 + linear_sum + quadratic_sum_elliot
+
+        corrected_term_sum = np.einsum('...p,...j,...k,...kpj->...', x, x, x, rho)[..., None] + \
+                             np.sum(x, axis=-1)[..., None] * quadratic_sum_darken
+        if model == "elliot1":
+            return ln_y0 + linear_sum + quadratic_sum_elliot - 1.0/3*corrected_term_sum
+
+        return np.zeros(np.broadcast(x, ln_y0).shape)
+
+    def get_all_ln_gamma(self, comp_dict: Dict[str, float], solvent: str, Tem: float, state: str,
+                         extra_model: extrap_func, extra_model_name: str,
+                         formalisms=("Wagner", "Darken", "Elliott", "Elliot1"), full_alloy_str: str = ""):
+        """
+        一次计算合金中全部组元在多种活度模型下的 ln γ。
+
+        ε、ρ 等相互作用参数对整个体系只计算一次，各组元、各模型共用。
+        溶剂按 UIPF 公式计算，与 get_ln_gamma 相同，不随模型变化。
+
+        返回:
+        np.ndarray: 形状为 (组元数, 模型数) 的数组，行顺序与 comp_dict 的键一致，列顺序与 formalisms 一致。
+        """
+        components = list(comp_dict.keys())
+        formalisms = list(formalisms)
+        result = np.zeros((len(components), len(formalisms)))
+        if solvent not in comp_dict:
+            print(f"警告: 溶剂 {solvent} 不在成分中。")
+            return result
+
+        solute_keys = [k for k in components if k != solvent]
         if not solute_keys:
-            return 0.0
+            return result
+
+        context = SystemContext(components, solvent, Tem, state, extra_model, extra_model_name, full_alloy_str)
+        epsilon = context.epsilon
+        rho = context.rho if any(f.lower() in ("elliott", "elliot1") for f in formalisms) else None
+        ln_y0 = context.ln_y0
+        x = np.array([comp_dict[name] for name in solute_keys], dtype=float)
+
+        rows = [components.index(name) for name in solute_keys]
+        for column, formalism in enumerate(formalisms):
+            result[rows, column] = self._solute_ln_gamma(formalism, x, ln_y0, epsilon, rho)
+        # 溶剂: ln γ₁ = - (1/2) * Σ ε_jk * X_j * X_k
+        result[components.index(solvent), :] = -0.5 * float(np.einsum('j,k,jk->', x, x, epsilon))
+        return result
+
+    def get_ln_gamma_batch(self, components: Sequence[str], compositions, solvent: str, Tem: float, state: str,
+                           extra_model: extrap_func, extra_model_name: str, activity_model: str,
+                           full_alloy_str: str = ""):
+        """
+        批量计算多组成分下全部组元的 ln γ。
+
+        相互作用参数与成分无关，只计算一次，各成分点通过矩阵运算得到结果，
+        适用于浓度扫描等大量成分点的计算。
+
+        参数:
+        components: 组元符号列表 (含溶剂)，与 compositions 的列对应。
+        compositions: 摩尔分数数组，形状为 (M, N)，每行为一个成分点。
+        solvent: 溶剂符号。
+        Tem, state: 温度 (K) 与相态。
+        extra_model, extra_model_name: 外推模型函数及其名称。
+        activity_model: 活度模型 (Wagner、Darken、Elliott、Elliot1)。
+        full_alloy_str: 完整的合金成分字符串，用于贡献系数日志。
+
+        返回:
+        np.ndarray: 形状为 (M, N) 的 ln γ，列顺序与 components 一致；溶剂列按 UIPF 公式计算。
+        """
+        components = list(components)
+        compositions = np.atleast_2d(np.asarray(compositions, dtype=float))
+        result = np.zeros(compositions.shape)
+        if solvent not in components:
+            print(f"警告: 溶剂 {solvent} 不在成分中。")
+            return result
+
+        solute_columns = [c for c, name in enumerate(components) if name != solvent]
+        if not solute_columns:
+            return result
+        solute_keys = [components[c] for c in solute_columns]
+
+        context = SystemContext(components, solvent, Tem, state, extra_model, extra_model_name, full_alloy_str)
+        epsilon = context.epsilon
+        rho = context.rho if activity_model.lower() in ("elliott", "elliot1") else None
+        ln_y0 = context.ln_y0
+        x = compositions[:, solute_columns]
+        result[:, solute_columns] = self._solute_ln_gamma(activity_model, x, ln_y0, epsilon, rho)
+        result[:, components.index(solvent)] = -0.5 * np.einsum('mj,mk,jk->m', x, x, epsilon)
+        return result
 
-        ternary_melts = TernaryMelts(Tem, state)
-        
-        quadratic_sum = 0.0
-        # 根据UIPF公式进行双重求和
-        for j_name in solute_keys:
-            xj = comp_dict[j_name]
-            soluj = Element(j_name)
-            for k_name in solute_keys:
-                xk = comp_dict[k_name]
-                soluk = Element(k_name)
-                
-                # 获取溶质j和溶质k之间的一阶相互作用参数 ε_jk (在溶剂1中)
-                epsilon_j_k = ternary_melts.activity_interact_coefficient_1st(solv, soluj, soluk, Tem, state, geo_model,
-                                                                              geo_model_name, full_alloy_str)
-                
-                quadratic_sum += epsilon_j_k * xj * xk
-
-        return -0.5 * quadratic_sum
-        
-      
-        
     # 📍 新增功能 2: 创建一个统一的计算入口函数
     def get_ln_gamma(self, comp_dict: Dict[str, float], component_to_calculate: str, solvent: str,
                      Tem: float, state: str, extra_model: extrap_func, extra_model_name: str,activity_model:str,
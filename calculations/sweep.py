@@ -0,0 +1,345 @@
+# sweep.py
+
+import atexit
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Sequence
+
+import numpy as np
+
+from calculations.activity_calculator import SystemContext, TemperatureSweep
+from core.element import ElementRegistry
+from models.model_kernels import get_model_kernel
+
+
+def composition_at_point(base_comp: Dict[str, float], varying_elem: str, matrix_elem: str, value: float):
+    """
+    浓度扫描中的成分点：其余组元按原比例归一化后，变化组分取 value，基体元素扣除相同的量。
+    基体元素不足时返回 None。
+    """
+    try:
+        others = {k: v for k, v in base_comp.items() if k != varying_elem}
+        total = sum(others.values())
+        comp = {k: v / total for k, v in others.items()}
+        comp[varying_elem] = value
+        new_matrix_elem_con = comp[matrix_elem] - value
+        if new_matrix_elem_con < 0:
+            return None
+        comp[matrix_elem] = new_matrix_elem_con
+        return comp
+    except Exception as e:
+        print(f"构建组成时出错: {e}")
+        return None
+
+
+def composition_with_addition(base_comp: Dict[str, float], addition_elem: str, value: float):
+    """添加元素扫描中的成分点：基体各组元按 (1 - value) 等比例缩减后加入 value 的添加元素。"""
+    try:
+        if value >= 1.0:
+            return None
+        base_scale_factor = 1.0 - value
+        comp = {elem: frac * base_scale_factor for elem, frac in base_comp.items()}
+        comp[addition_elem] = value
+        total = sum(comp.values())
+        if abs(total - 1.0) > 1e-6:
+            print(f"警告：组成总和不为1: {total}")
+            return None
+        return comp
+    except Exception as e:
+        print(f"构建添加组成时出错: {e}")
+        return None
+
+
+class SweepSpec:
+    """
+    一次扫描的完整描述，不含任何界面对象，可以传给子进程。
+
+    axis:
+        "composition": 浓度扫描，values 为 varying_element 的摩尔分数 (composition_at_point)；
+        "addition": 添加元素扫描，values 为 varying_element 的添加量 (composition_with_addition)；
+        "temperature": 温度扫描，values 为温度 (K)，成分固定为 composition。
+    models: 外推模型名称，如 "UEM1"、"Toop-Muggianu"，对应 models.model_kernels 中的同名计算核。
+    formalisms: 活度模型，如 ("Darken", "Elliott")。
+    """
+
+    AXES = ("composition", "addition", "temperature")
+
+    def __init__(self, composition: Dict[str, float], solvent: str, target: str, axis: str, values,
+                 models: Sequence[str], formalisms: Sequence[str] = ("Darken", "Elliott"),
+                 temperature: float = 1873.0, state: str = "liquid", varying_element: str = None,
+                 full_alloy_str: str = ""):
+        if axis not in self.AXES:
+            raise ValueError(f"未知的扫描类型: {axis}")
+        if axis != "temperature" and not varying_element:
+            raise ValueError("浓度扫描需要指定变化组分 varying_element")
+        self.composition = dict(composition)
+        self.solvent = solvent
+        self.target = target
+        self.axis = axis
+        self.values = np.asarray(values, dtype=float)
+        self.models = list(models)
+        self.formalisms = list(formalisms)
+        self.temperature = float(temperature)
+        self.state = state
+        self.varying_element = varying_element
+        self.full_alloy_str = full_alloy_str
+
+    @property
+    def components(self):
+        """扫描中出现的全部元素 (含溶剂)。"""
+        names = list(self.composition)
+        if self.varying_element and self.varying_element not in names:
+            names.append(self.varying_element)
+        return names
+
+    def point_composition(self, index: int):
+        """第 index 个扫描点的成分，无法构建时为 None。"""
+        value = float(self.values[index])
+        if self.axis == "composition":
+            return composition_at_point(self.composition, self.varying_element, self.solvent, value)
+        if self.axis == "addition":
+            return composition_with_addition(self.composition, self.varying_element, value)
+        return self.composition
+
+    def key(self):
+        """用于子进程内缓存体系上下文的键。"""
+        return (tuple(sorted(self.composition.items())), self.solvent, self.axis, self.varying_element,
+                self.temperature, self.state, self.full_alloy_str)
+
+
+class SweepPointError(Exception):
+    """扫描点计算失败 (成分无法构建或计算时出错)。"""
+
+
+class SweepResult:
+    """
+    扫描结果：每个外推模型一个 (点数, 活度模型数) 的 ln γ 数组。
+    计算出错的位置保存错误信息，ln_gamma() 取值时以 SweepPointError 抛出。
+    """
+
+    def __init__(self, spec: SweepSpec):
+        self.spec = spec
+        shape = (len(spec.values), len(spec.formalisms))
+        self.values = {model: np.full(shape, np.nan) for model in spec.models}
+        self.errors = {model: np.full(shape, None, dtype=object) for model in spec.models}
+        self.done = {model: np.zeros(len(spec.values), dtype=bool) for model in spec.models}
+
+    def add(self, model: str, indices, values, errors):
+        self.values[model][indices] = values
+        self.errors[model][indices] = errors
+        self.done[model][indices] = True
+
+    def is_done(self, model: str, index: int) -> bool:
+        return bool(self.done[model][index])
+
+    def ln_gamma(self, model: str, index: int, formalism: str) -> float:
+        column = [f.lower() for f in self.spec.formalisms].index(formalism.lower())
+        error = self.errors[model][index, column]
+        if error is not None:
+            raise SweepPointError(error)
+        return float(self.values[model][index, column])
+
+
+# 需要数值积分、单点计算代价较高的外推模型
+EXPENSIVE_MODELS = ("GSM", "UEM2", "UEM2_Adv")
+# 其余情况下 (模型数 × 扫描点数) 达到该值才启动进程池
+PARALLEL_MIN_POINTS = 200
+# 每个任务块最多包含的扫描点数
+MAX_CHUNK_POINTS = 16
+
+
+# ---- 子进程中的状态 ----
+# 外推模型使用 models.model_kernels 中的无状态计算核，结果与各模型在进程中的计算先后无关
+_worker_contexts = {}
+_in_worker_process = False
+
+
+def _init_worker(persistent_cache: bool = True, logging_enabled: bool = True):
+    """子进程初始化：预载元素参数表，挂接积分磁盘缓存，使各进程无需重复读库或求积。"""
+    global _in_worker_process
+    _in_worker_process = True
+    ElementRegistry.preload()
+    if persistent_cache:
+        from models.integral_cache import enable_persistent_cache
+        try:
+            enable_persistent_cache()
+        except Exception as e:
+            print(f"启用积分磁盘缓存失败: {e}")
+    from utils.DataLogger import set_logging_enabled
+    set_logging_enabled(logging_enabled)
+
+
+def _evaluate_chunk(spec: SweepSpec, model_name: str, indices):
+    """计算一个外推模型在一组扫描点上的 ln γ，返回 (模型, 点序号, 数值, 错误信息)。"""
+    result = _evaluate_points(spec, model_name, indices)
+    if _in_worker_process:
+        # 子进程退出时不执行 atexit，日志与积分缓存在每块结束后写入
+        from models.integral_cache import get_integral_cache
+        from utils.DataLogger import flush_contribution_logs
+        flush_contribution_logs()
+        store = get_integral_cache().store
+        if store is not None:
+            store.flush()
+    return result
+
+
+def _evaluate_points(spec: SweepSpec, model_name: str, indices):
+    values = np.full((len(indices), len(spec.formalisms)), np.nan)
+    errors = np.full(values.shape, None, dtype=object)
+    extra_model = get_model_kernel(model_name)
+
+    if spec.axis == "temperature":
+        try:
+            sweep = TemperatureSweep(spec.composition, spec.solvent, spec.state, extra_model, model_name,
+                                     spec.full_alloy_str)
+            values[:] = sweep.evaluate(spec.values[indices], spec.target, spec.formalisms)
+        except Exception as e:
+            errors[:] = str(e)
+        return model_name, indices, values, errors
+
+    # 温度、相态、外推模型与元素集合在整个扫描中不变，每个进程中每个模型的 ε、ρ 只计算一次
+    context_key = (spec.key(), model_name)
+    context = _worker_contexts.get(context_key)
+    if context is None:
+        if len(_worker_contexts) >= 64:
+            _worker_contexts.clear()
+        context = _worker_contexts[context_key] = SystemContext(
+                spec.components, spec.solvent, spec.temperature, spec.state, extra_model, model_name,
+                spec.full_alloy_str)
+    for row, index in enumerate(indices):
+        comp = spec.point_composition(index)
+        if comp is None:
+            errors[row, :] = "组成构建失败"
+            continue
+        for column, formalism in enumerate(spec.formalisms):
+            try:
+                values[row, column] = context.ln_gamma(comp, spec.target, formalism)
+            except Exception as e:
+                errors[row, column] = str(e)
+    return model_name, indices, values, errors
+
+
+def clear_sweep_contexts():
+    """
+    清空本进程中缓存的体系上下文 (含元素参数与已算出的 ε、ρ)。
+    计算量较小的扫描在当前进程中执行并复用这些上下文，元素或相互作用参数被修改后应调用。
+    """
+    _worker_contexts.clear()
+
+
+def _chunks(spec: SweepSpec, workers: int):
+    """
+    将 (模型 × 扫描点) 切分为任务块。
+
+    每个模型的扫描点按顺序切分，块数约为进程数的 4 倍，每块不超过 MAX_CHUNK_POINTS 个点，
+    使进度显示与取消请求在计算过程中及时生效。浓度扫描的 ε、ρ 在每个进程中按模型只算一次
+    (见 _worker_contexts)，切分不会带来重复计算。
+    """
+    n = len(spec.values)
+    per_model = max(1, min(n, math.ceil(4 * workers / max(1, len(spec.models)))))
+    size = min(MAX_CHUNK_POINTS, math.ceil(n / per_model)) if n else 1
+    return [(model, list(range(start, min(n, start + size))))
+            for model in spec.models for start in range(0, n, size)]
+
+
+def _use_process_pool(spec: SweepSpec, tasks) -> bool:
+    """启动进程池需要数秒，只有计算量足够大 (含积分模型或扫描点很多) 时才值得并行。"""
+    if len(tasks) < 2:
+        return False
+    expensive = any(model.replace('-', '_') in EXPENSIVE_MODELS for model in spec.models)
+    return expensive or len(spec.models) * len(spec.values) >= PARALLEL_MIN_POINTS
+
+
+_executor = None
+_executor_config = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers: int, persistent_cache: bool, logging_enabled: bool) -> ProcessPoolExecutor:
+    """返回模块级共享的进程池，首次使用时创建；进程数或初始化参数变化时重建。"""
+    global _executor, _executor_config
+    config = (workers, persistent_cache, logging_enabled)
+    with _executor_lock:
+        if _executor is not None and _executor_config != config:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        if _executor is None:
+            # 界面程序中从工作线程启动进程池，统一使用 spawn 避免 fork 复制线程状态
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_worker, initargs=(persistent_cache, logging_enabled))
+            _executor_config = config
+        return _executor
+
+
+def shutdown_executor(wait: bool = False):
+    """
+    关闭共享进程池。程序退出时自动调用；元素参数被修改后也应调用，
+    使下次扫描重新启动并预加载参数的工作进程。
+    """
+    global _executor, _executor_config
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+        _executor_config = None
+
+
+atexit.register(shutdown_executor, True)
+
+
+def iter_sweep(spec: SweepSpec, max_workers: int = None, persistent_cache: bool = True):
+    """
+    执行扫描，按完成顺序逐块产出 (模型, 点序号列表, ln γ 数组, 错误信息数组)。
+
+    (模型 × 扫描点) 的任务分配给模块级共享的进程池 (跨扫描复用，避免每次重新启动解释器和预加载参数)；
+    max_workers 为 1 或计算量较小时在当前进程中依次计算。中途关闭生成器 (如用户取消) 时，
+    尚未开始的任务被取消，进程池保留供下次扫描使用。
+    """
+    from utils.DataLogger import is_logging_enabled
+
+    workers = max_workers or os.cpu_count() or 1
+    tasks = _chunks(spec, workers)
+    if workers == 1 or not _use_process_pool(spec, tasks):
+        for model_name, indices in tasks:
+            yield _evaluate_chunk(spec, model_name, indices)
+        return
+
+    executor = _get_executor(workers, persistent_cache, is_logging_enabled())
+    pending = set()
+    try:
+        pending = {executor.submit(_evaluate_chunk, spec, model_name, indices) for model_name, indices in tasks}
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+    except BrokenProcessPool:
+        # 工作进程异常退出后进程池不可再用，丢弃以便下次重建
+        shutdown_executor()
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def run_sweep(spec: SweepSpec, max_workers: int = None, progress=None) -> SweepResult:
+    """
+    执行完整扫描并返回 SweepResult。
+
+    参数:
+    spec: 扫描描述。
+    max_workers: 进程数，缺省为 CPU 核数；为 1 时不启动进程池。
+    progress(done, total): 每完成一块调用一次 (可选)。
+    """
+    result = SweepResult(spec)
+    total = len(spec.models) * len(spec.values)
+    done = 0
+    for model_name, indices, values, errors in iter_sweep(spec, max_workers):
+        result.add(model_name, indices, values, errors)
+        done += len(indices)
+        if progress is not None:
+            progress(done, total)
+    return result
@@ -1,11 +1,13 @@
 # database_handler.py
+import atexit
 import math
 import os
-import re
 import sqlite3
 import sys
+import threading
+from typing import NamedTuple
 
-import models.extrapolation_models
+from core.temperature_expression import NAN_EXPRESSION, compile_temp_expression
 
 
 def get_database_path ():
@@ -32,115 +34,281 @@ def get_database_path ():
 	return db_path
 
 
-def get_database_connection ():
-	"""获取数据库连接"""
-	try:
+class DatabaseConnectionManager:
+	"""只读数据库连接管理器。
+
+	每个线程持有一个长期复用的 mode=ro 连接，首次使用时创建；sqlite3 按 SQL 文本在连接内缓存
+	已编译的语句，因此固定的查询语句在重复调用时无需重新编译。程序退出时由 close_all() 统一关闭。
+	"""
+	
+	def __init__ (self, cached_statements=128):
+		self._cached_statements = cached_statements
+		self._local = threading.local()
+		self._lock = threading.Lock()
+		self._connections = []
+		self._generation = 0
+		self.query_count = 0
+	
+	def _open (self):
 		db_path = get_database_path()
-		# 以只读模式连接数据库（推荐用于只读数据库）
-		conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-		return conn
-	except Exception as e:
-		print(f"数据库连接失败: {e}")
-		print(f"尝试连接的数据库路径: {get_database_path()}")
-		# 如果只读模式失败，尝试普通模式
 		try:
-			db_path = get_database_path()
-			conn = sqlite3.connect(db_path)
+			# 以只读模式连接数据库（推荐用于只读数据库）
+			# 连接只在创建它的线程中使用，关闭统一由 close_all 完成，因此关闭同线程检查
+			return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False,
+			                       cached_statements=self._cached_statements)
+		except Exception as e:
+			print(f"数据库连接失败: {e}")
+			print(f"尝试连接的数据库路径: {db_path}")
+			# 如果只读模式失败，尝试普通模式
+			try:
+				return sqlite3.connect(db_path, check_same_thread=False, cached_statements=self._cached_statements)
+			except Exception as e2:
+				print(f"普通模式连接也失败: {e2}")
+				return None
+	
+	def get_connection (self):
+		"""返回当前线程的连接，调用方不应关闭它。"""
+		conn = getattr(self._local, "conn", None)
+		if conn is not None and self._local.generation == self._generation:
 			return conn
-		except Exception as e2:
-			print(f"普通模式连接也失败: {e2}")
+		
+		conn = self._open()
+		if conn is not None:
+			with self._lock:
+				self._connections.append(conn)
+				self._local.conn = conn
+				self._local.generation = self._generation
+		return conn
+	
+	def execute (self, query, params=()):
+		"""在当前线程的连接上执行查询并返回游标，连接不可用时返回 None。"""
+		conn = self.get_connection()
+		if conn is None:
 			return None
+		cursor = conn.execute(query, params)
+		self.query_count += 1
+		return cursor
+	
+	def close_all (self):
+		"""关闭所有线程的连接；之后的查询会重新建立连接。"""
+		with self._lock:
+			connections, self._connections = self._connections, []
+			self._generation += 1
+		for conn in connections:
+			try:
+				conn.close()
+			except Exception as e:
+				print(f"关闭数据库连接时出错: {e}")
+
+
+_connection_manager = DatabaseConnectionManager()
+
+
+def get_database_connection ():
+	"""获取当前线程复用的只读数据库连接（由连接管理器负责关闭）。"""
+	return _connection_manager.get_connection()
+
+
+def close_database_connections ():
+	"""关闭所有线程的数据库连接，供程序退出时调用。"""
+	_connection_manager.close_all()
+
+
+atexit.register(close_database_connections)
+
+
+def get_db_query_count ():
+	"""返回本进程累计执行的数据库查询次数。"""
+	return _connection_manager.query_count
+
+
+_MIEDEMA_QUERY = "SELECT phi, nws, V, u, alpha_beta, hybirdvalue, isTrans, dHtrans, mass, Tm, Tb FROM MiedemaParameter WHERE Symbol = ?"
+_MIEDEMA_ALL_QUERY = "SELECT Symbol, phi, nws, V, u, alpha_beta, hybirdvalue, isTrans, dHtrans, mass, Tm, Tb FROM MiedemaParameter ORDER BY rowid"
+_FIRST_ORDER_ALL_QUERY = "SELECT solv, solui, soluj, eji, Rank, sji, T, reference FROM first_order ORDER BY rowid"
+_LN_YI0_ALL_QUERY = "SELECT solv, solui, lnYi0, Yi0, T FROM lnY0 ORDER BY rowid"
+_SECOND_ORDER_ALL_QUERY = "SELECT solv, solui, soluj, soluk, ri_ij, pi_ij, ri_jk, pi_jk, T, Rank, reference FROM second_order ORDER BY rowid"
 
 
 def get_miedema_data (element_name):
 	"""从数据库加载元素的 Miedema 参数。"""
 	try:
-		# 使用新的连接方式
-		conn = get_database_connection()
-		if conn is None:
+		cursor = _connection_manager.execute(_MIEDEMA_QUERY, (element_name,))
+		if cursor is None:
 			return None
-		
-		cursor = conn.cursor()
-		query = "SELECT phi, nws, V, u, alpha_beta, hybirdvalue, isTrans, dHtrans, mass, Tm, Tb FROM MiedemaParameter WHERE Symbol = ?"
-		cursor.execute(query, (element_name,))
-		row = cursor.fetchone()
-		conn.close()
-		return row
+		return cursor.fetchone()
 	except Exception as e:
 		print(f"加载元素数据时出错 ({element_name}): {e}")
 		return None
 
 
-def query_first_order_wagner_intp_db (solv, solui, soluj):
-	"""从数据库查询一阶瓦格纳相互作用参数。"""
-	conn = None  # 初始化连接变量
+def get_all_miedema_data ():
+	"""一次性加载 MiedemaParameter 全表，返回 {Symbol: row} 字典。
+
+	row 的字段顺序与 get_miedema_data 相同；同一元素存在多条记录时保留第一条。
+	"""
 	try:
-		# 使用新的连接方式
-		conn = get_database_connection()
-		if conn is None:
-			return None, None
-		
-		cursor = conn.cursor()
-		
-		# 第一次查询 - 查找 solv-solui-soluj 的组合
-		query1 = "SELECT eji, Rank, sji, T, reference FROM first_order WHERE solv = ? AND solui = ? AND soluj = ?"
-		cursor.execute(query1, (solv, solui, soluj))
-		row1 = cursor.fetchone()
-		
-		if row1:
-			return row1, True  # ji_flag = True
-		else:
-			print("查询1无结果")
-		
-		# 第二次查询 - 交换solui和soluj查找
-		query2 = "SELECT eji, Rank, sji, T, reference FROM first_order WHERE solv = ? AND solui = ? AND soluj = ?"
-		cursor.execute(query2, (solv, soluj, solui))  # 交换solui和soluj
-		row2 = cursor.fetchone()
-		
-		if row2:
-			return row2, False  # ji_flag = False (交换了顺序)
-		else:
-			print("查询2无结果")
-		
-		return None, None
+		cursor = _connection_manager.execute(_MIEDEMA_ALL_QUERY)
+		if cursor is None:
+			return {}
+		rows = {}
+		for row in cursor.fetchall():
+			rows.setdefault(row[0], row[1:])
+		return rows
+	except Exception as e:
+		print(f"加载 Miedema 参数表时出错: {e}")
+		return {}
+
+
+class _InteractionTables(NamedTuple):
+	"""InteractionDataIndex 的一份完整索引，建立后不再修改。"""
+	first_order: dict
+	ln_yi0: dict
+	second_order_ij: dict
+	second_order_jk: dict
+
+
+class InteractionDataIndex:
+	"""first_order、second_order、lnY0 三张表的内存索引。
+
+	三张表都只有数百行，首次查询时各用一次 SELECT 全部读入，之后的查询都是字典查找。
+	first_order 的交换溶质顺序回退在建索引时解析：(solv, solui, soluj) 没有记录时，
+	直接映射到 (solv, soluj, solui) 的记录并标记 ji_flag=False。
+	同一键存在多条记录时，与逐条 SQL 查询一样保留 rowid 最小的一条。
+	四个字典作为一份快照整体替换，查询时先取得快照的引用，invalidate() 与查询并发时不会读到半空的索引。
+	"""
+	
+	def __init__ (self):
+		self._lock = threading.Lock()
+		self._tables = None
+		self.build_count = 0
+	
+	def _ensure_loaded (self) -> _InteractionTables:
+		"""返回当前索引快照，尚未建立 (或已失效) 时先建立。"""
+		tables = self._tables
+		if tables is not None:
+			return tables
+		with self._lock:
+			if self._tables is None:
+				self._tables = self._build()
+				self.build_count += 1
+			return self._tables
+	
+	def _build (self) -> _InteractionTables:
+		direct = {}
+		for row in _fetch_all_rows(_FIRST_ORDER_ALL_QUERY):
+			if None not in row[:3]:
+				direct.setdefault(row[:3], row[3:])
+		
+		first_order = {key: (row, True) for key, row in direct.items()}
+		for (solv, solui, soluj), row in direct.items():
+			first_order.setdefault((solv, soluj, solui), (row, False))
+		
+		ln_yi0 = {}
+		for row in _fetch_all_rows(_LN_YI0_ALL_QUERY):
+			if None not in row[:2]:
+				ln_yi0.setdefault(row[:2], row[2:])
+		
+		second_order_ij = {}
+		second_order_jk = {}
+		for row in _fetch_all_rows(_SECOND_ORDER_ALL_QUERY):
+			if None not in row[:3]:
+				second_order_ij.setdefault(row[:3], row[4:])
+				if row[3] is not None:
+					second_order_jk.setdefault(row[:4], row[4:])
+		
+		# 建索引时预编译全部系数文本，之后按温度求值不再解析字符串
+		for row, _ in first_order.values():
+			compile_temp_expression(row[0], row[3])
+			compile_temp_expression(row[2], row[3])
+		for row in ln_yi0.values():
+			compile_temp_expression(row[0], row[2])
+			compile_temp_expression(row[1], row[2])
+		for row in second_order_ij.values():
+			for value in row[:4]:
+				compile_temp_expression(value, row[4])
+		
+		return _InteractionTables(first_order, ln_yi0, second_order_ij, second_order_jk)
+	
+	def invalidate (self):
+		"""数据库内容被修改后调用，下次查询时重新建立索引。"""
+		with self._lock:
+			self._tables = None
+	
+	def first_order (self, solv, solui, soluj):
+		"""返回 (row, ji_flag)，无记录时返回 (None, None)。"""
+		return self._ensure_loaded().first_order.get((solv, solui, soluj), (None, None))
+	
+	def first_order_expressions (self, solv, solui, soluj):
+		"""返回 (eji, sji, ji_flag)，eji/sji 为预编译的温度表达式，可直接对温度数组求值。"""
+		row, flag = self.first_order(solv, solui, soluj)
+		if row is None:
+			return NAN_EXPRESSION, NAN_EXPRESSION, None
+		return compile_temp_expression(row[0], row[3]), compile_temp_expression(row[2], row[3]), flag
 	
+	def ln_yi0 (self, solv, solui):
+		return self._ensure_loaded().ln_yi0.get((solv, solui))
+	
+	def second_order (self, solv, solui, soluj, soluk=None):
+		"""返回 (row, interaction_type)，无记录时返回 (None, None)。"""
+		tables = self._ensure_loaded()
+		if soluk is None:
+			row = tables.second_order_ij.get((solv, solui, soluj))
+			return (row, "ij") if row else (None, None)
+		row = tables.second_order_jk.get((solv, solui, soluj, soluk))
+		return (row, "jk") if row else (None, None)
+	
+	def alloy_first_order (self, solv, solutes):
+		"""批量查询合金中全部溶质对的一阶相互作用参数，返回 {(solui, soluj): (row, ji_flag)}，只包含有记录的溶质对。"""
+		first_order = self._ensure_loaded().first_order
+		result = {}
+		for solui in solutes:
+			for soluj in solutes:
+				entry = first_order.get((solv, solui, soluj))
+				if entry is not None:
+					result[(solui, soluj)] = entry
+		return result
+
+
+def _fetch_all_rows (query):
+	cursor = _connection_manager.execute(query)
+	return cursor.fetchall() if cursor is not None else []
+
+
+_interaction_index = InteractionDataIndex()
+
+
+def get_interaction_index ():
+	"""返回进程共享的相互作用参数索引。"""
+	return _interaction_index
+
+
+def query_first_order_wagner_intp_db (solv, solui, soluj):
+	"""查询一阶瓦格纳相互作用参数。
+
+	返回 (row, ji_flag)：ji_flag 为 True 表示按 solv-solui-soluj 顺序找到记录，
+	False 表示记录来自交换溶质顺序后的 solv-soluj-solui。
+	"""
+	try:
+		return _interaction_index.first_order(solv, solui, soluj)
 	except Exception as e:
 		print(f"查询一阶瓦格纳相互作用参数时出错: {e}")
 		print(f"查询参数: solv={solv}, solui={solui}, soluj={soluj}")
 		return None, None
-	
-	finally:
-		# 确保连接被关闭
-		if conn:
-			conn.close()
 
 
 def query_ln_yi0_db (solv, solui):
-	"""从数据库查询无限稀释活度系数。"""
-	conn = None
+	"""查询无限稀释活度系数。"""
 	try:
-		# 使用新的连接方式
-		conn = get_database_connection()
-		if conn is None:
-			return None
-		
-		cursor = conn.cursor()
-		query = "SELECT lnYi0, Yi0, T FROM lnY0 WHERE solv = ? AND solui = ?"
-		cursor.execute(query, (solv, solui))
-		row = cursor.fetchone()
-		return row
+		return _interaction_index.ln_yi0(solv, solui)
 	except Exception as e:
 		print(f"查询无限稀释活度系数时出错: {e}")
 		return None
-	finally:
-		if conn:
-			conn.close()
 
 
 # 查询二阶活度相互作用系数
 def query_second_order_interaction_db (solv, solui, soluj, soluk=None):
 	"""
-	从数据库查询二阶活度相互作用系数
+	查询二阶活度相互作用系数
 
 	参数:
 	solv: 基体元素 (如 'Fe')
@@ -158,47 +326,11 @@ def query_second_order_interaction_db (solv, solui, soluj, soluk=None):
 	(row_data, interaction_type):
 	- row_data: 查询结果元组 (ri_ij, pi_ij, ri_jk, pi_jk, T, Rank, reference)
 	"""
-	conn = None
 	try:
-		conn = get_database_connection()
-		if conn is None:
-			return None, None
-		
-		cursor = conn.cursor()
-		
-		if soluk is None:
-			# 查找i,j对i的影响 (ri_ij, pi_ij)
-			query = """
-			SELECT ri_ij, pi_ij, ri_jk, pi_jk, T, Rank, reference
-			FROM second_order
-			WHERE solv = ? AND solui = ? AND soluj = ?
-			"""
-			cursor.execute(query, (solv, solui, soluj))  # 只传递3个参数
-			row1 = cursor.fetchone()
-			if row1:
-				return row1, "ij"
-		else:
-			# 查找j,k对i的影响 (ri_jk, pi_jk)
-			query1 = """
-			SELECT ri_ij, pi_ij, ri_jk, pi_jk, T, Rank, reference
-			FROM second_order
-			WHERE solv = ? AND solui = ? AND soluj = ? AND soluk = ?
-			"""
-			cursor.execute(query1, (solv, solui, soluj, soluk))
-			row2 = cursor.fetchone()
-			
-			if row2:
-				return row2, "jk"
-		
-		return None, None
-	
+		return _interaction_index.second_order(solv, solui, soluj, soluk)
 	except Exception as e:
 		print(f"查询二阶相互作用系数时出错: {e}")
 		return None, None
-	
-	finally:
-		if conn:
-			conn.close()
 
 
 class Melt:
@@ -375,54 +507,17 @@ class Melt:
 			return float('nan'), float('nan'), float('nan'), float('nan')
 	
 	def _process_temp_data (self, text_info, t):
-		"""处理含温度依赖性的数据。"""
-		if not t or not text_info or not text_info[0]:
+		"""处理含温度依赖性的数据，t 可以是标量或 NumPy 温度数组。"""
+		if not text_info:
 			return float('nan')
 		
 		data_str, t_str = text_info
-		
-		# 确保 data_str 不是 None 或空值
-		if data_str is None or str(data_str).strip() == '':
-			return float('nan')
-		
-		if t_str == "T":
-			# 处理温度相关公式，如 "-126300/T+39.0" 或 "744.06/T-0.33"
-			try:
-				# 修复：使用更严格的正则表达式模式，确保至少匹配一个数字
-				pattern1 = r"^([-]?\d+\.?\d*)/T([\+\-]\d+\.?\d*)$"
-				match1 = re.match(pattern1, str(data_str))
-				if match1:
-					a = float(match1.group(1))
-					b = float(match1.group(2))
-					result = a / t + b
-					return result
-				
-				# 匹配纯数字
-				try:
-					result = float(data_str)
-					return result
-				except (ValueError, TypeError):
-					return float('nan')
-			
-			except Exception as e:
-				print(f"处理温度相关数据时出错: {e}, data_str: {data_str}")
-				return float('nan')
-		
-		elif t_str and str(t_str).strip():
-			# 固定温度的数据
-			try:
-				if float(t_str) == t:
-					result = float(data_str)
-					return result
-				else:
-					return float('nan')
-			except (ValueError, TypeError):
-				return float('nan')
-		
-		return float('nan')
+		return compile_temp_expression(data_str, t_str).evaluate(t)
 	
 	def _safe_isnan (self, value):
 		"""安全地检查是否为 NaN，避免类型错误"""
+		if type(value) is float:
+			return value != value
 		try:
 			if value is None:
 				return True
@@ -495,6 +590,7 @@ class Melt:
 		"获取在基体1中组分k对组分j的以质量分数表示的一阶活度相互作用系数，有实验值采用实验值，无实验值采用计算值，默认采用UEM1计算值"
 		from .element import Element  # 延迟导入避免循环依赖
 		from models.activity_interaction_parameters import TernaryMelts  # 延迟导入
+		from models.extrapolation_models import BinaryModel  # 延迟导入
 		
 		eki, _, eik, _ = self._get_first_order_activity_interaction_coefficient(element_i, element_k, solv)
 		
@@ -505,7 +601,7 @@ class Melt:
 			'''calculate eki by UEM1'''
 			try:
 				ski = TernaryMelts().activity_interact_coefficient_1st(solv, element_i, element_k, tem, "Liquid",
-				                                                       models.extrapolation_models.BinaryModel.UEM1)
+				                                                       BinaryModel.UEM1)
 				eki = self._first_order_m_to_w(ski, Element(element_k), Element(solv))
 				return eki
 			except Exception as e:
@@ -1,39 +1,126 @@
 # element.py
+import threading
 
 from core.constants import Constants
-from core.database_handler import get_miedema_data
+from core.database_handler import get_all_miedema_data
+
 
 class Element:
-    """定义 Element 类，负责加载和管理单个元素的属性。"""
+    """定义 Element 类，负责加载和管理单个元素的属性。
+
+    Element 为只读的共享对象：同名元素在进程内只创建一次，由 ElementRegistry 统一分发，
+    重复构造 Element(name) 只需一次字典查找，不会访问数据库。
+    """
+    __slots__ = ("name", "phi", "n_ws", "v", "u", "hybrid_factor", "hybrid_value", "is_trans_group",
+                 "dh_trans", "m", "tm", "tb", "bkm", "shm", "is_exist")
+
+    def __new__(cls, name):
+        return ElementRegistry.get(name)
+
     def __init__(self, name):
-        self.name = name
-        self.phi = 0.0
-        self.n_ws = 0.0
-        self.v = 0.0
-        self.u = 0.0
-        self.hybrid_factor = ""
-        self.hybrid_value = 0.0
-        self.is_trans_group = False
-        self.dh_trans = 0.0
-        self.m = 0.0
-        self.tm = 0.0
-        self.tb = 0.0
-        self.bkm = 0.0  # Bulk modulus (需要从数据库或常量添加)
-        self.shm = 0.0  # Shear modulus (需要从数据库或常量添加)
-        self.is_exist = False
-
-        if name in Constants.periodic_table:
-            self.is_exist = True
-            self._load_miedema_data()
-
-    def _load_miedema_data(self):
-        """从数据库加载元素数据。"""
-        row = get_miedema_data(self.name)
-        if row:
-            self.phi, self.n_ws, self.v, self.u, self.hybrid_factor, \
-            self.hybrid_value, self.is_trans_group, self.dh_trans, \
-            self.m, self.tm, self.tb = row
-            self.is_trans_group = bool(self.is_trans_group)
+        # 实例已在 ElementRegistry 中初始化完毕
+        pass
+
+    @classmethod
+    def _create(cls, name, row):
+        """由 ElementRegistry 调用，根据数据库记录创建新实例。"""
+        self = object.__new__(cls)
+        values = {
+            "name": name,
+            "phi": 0.0,
+            "n_ws": 0.0,
+            "v": 0.0,
+            "u": 0.0,
+            "hybrid_factor": "",
+            "hybrid_value": 0.0,
+            "is_trans_group": False,
+            "dh_trans": 0.0,
+            "m": 0.0,
+            "tm": 0.0,
+            "tb": 0.0,
+            "bkm": 0.0,  # Bulk modulus (需要从数据库或常量添加)
+            "shm": 0.0,  # Shear modulus (需要从数据库或常量添加)
+            "is_exist": False,
+        }
+
+        if name in Constants.periodic_table and row:
+            values["is_exist"] = True
+            values["phi"], values["n_ws"], values["v"], values["u"], values["hybrid_factor"], \
+            values["hybrid_value"], values["is_trans_group"], values["dh_trans"], \
+            values["m"], values["tm"], values["tb"] = row
+            values["is_trans_group"] = bool(values["is_trans_group"])
             # 注意: bkm 和 shm 没有在原始代码的数据库查询中，需要确认来源
-        else:
-            self.is_exist = False
\ No newline at end of file
+
+        for attr, value in values.items():
+            object.__setattr__(self, attr, value)
+        return self
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"Element '{self.name}' 为只读共享对象，不能修改属性 '{key}'")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"Element '{self.name}' 为只读共享对象，不能删除属性 '{key}'")
+
+    def __reduce__(self):
+        # 反序列化时重新从注册表获取，保证进程内仍是同一个共享实例
+        return Element, (self.name,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"Element({self.name!r})"
+
+
+class ElementRegistry:
+    """进程级元素注册表。
+
+    首次访问时一次性读取 MiedemaParameter 全表，之后按元素符号缓存 Element 实例。
+    数据库中的元素参数被修改后调用 clear()，下次访问时重新载入。
+    """
+    _lock = threading.Lock()
+    _rows = None
+    _elements = {}
+    load_count = 0
+
+    @classmethod
+    def get(cls, name):
+        element = cls._elements.get(name)
+        if element is not None:
+            return element
+
+        with cls._lock:
+            element = cls._elements.get(name)
+            if element is None:
+                if cls._rows is None:
+                    cls._rows = get_all_miedema_data()
+                    cls.load_count += 1
+                element = Element._create(name, cls._rows.get(name))
+                cls._elements[name] = element
+        return element
+
+    @classmethod
+    def get_row(cls, name):
+        """返回元素在 MiedemaParameter 表中的原始记录，不存在时返回 None。"""
+        cls.get(name)
+        return cls._rows.get(name)
+
+    @classmethod
+    def preload(cls):
+        """预热：载入周期表中全部元素。"""
+        for name in Constants.periodic_table:
+            cls.get(name)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._rows = None
+            cls._elements = {}
+
+    @classmethod
+    def stats(cls):
+        """返回注册表状态：已缓存元素数和参数表载入次数。"""
+        return {"elements": len(cls._elements), "loads": cls.load_count}
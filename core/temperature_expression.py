@@ -0,0 +1,126 @@
+# temperature_expression.py
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# 温度相关公式，如 "-126300/T+39.0" 或 "744.06/T-0.33"
+_INVERSE_T_PATTERN = re.compile(r"^([-]?\d+\.?\d*)/T([\+\-]\d+\.?\d*)$")
+
+
+class TempExpression:
+	"""数据库中温度相关系数的预编译表达式。
+
+	evaluate(t) 接受标量温度或 NumPy 温度数组；t 为 0/None 或表达式无效时结果为 NaN。
+	"""
+
+	def evaluate (self, t):
+		if t is None:
+			return float('nan')
+		if np.ndim(t) == 0:
+			return self._evaluate_scalar(t) if t else float('nan')
+		t = np.asarray(t, dtype=float)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			return np.where(t != 0, self._evaluate_array(t), np.nan)
+
+	def _evaluate_scalar (self, t):
+		return float('nan')
+
+	def _evaluate_array (self, t):
+		return np.full(t.shape, np.nan)
+
+	@property
+	def is_valid (self):
+		return False
+
+
+class ConstantExpression(TempExpression):
+	"""与温度无关的常数。"""
+
+	def __init__ (self, value):
+		self.value = value
+
+	def _evaluate_scalar (self, t):
+		return self.value
+
+	def _evaluate_array (self, t):
+		return np.full(t.shape, self.value)
+
+	@property
+	def is_valid (self):
+		return True
+
+	def __repr__ (self):
+		return f"ConstantExpression({self.value})"
+
+
+class InverseTExpression(TempExpression):
+	"""A/T + B 形式的温度函数。"""
+
+	def __init__ (self, a, b):
+		self.a = a
+		self.b = b
+
+	def _evaluate_scalar (self, t):
+		return self.a / t + self.b
+
+	def _evaluate_array (self, t):
+		return self.a / t + self.b
+
+	@property
+	def is_valid (self):
+		return True
+
+	def __repr__ (self):
+		return f"InverseTExpression({self.a}/T{self.b:+})"
+
+
+class FixedTExpression(TempExpression):
+	"""仅在测定温度下有效的数值，其他温度返回 NaN。"""
+
+	def __init__ (self, value, t_ref):
+		self.value = value
+		self.t_ref = t_ref
+
+	def _evaluate_scalar (self, t):
+		return self.value if self.t_ref == t else float('nan')
+
+	def _evaluate_array (self, t):
+		return np.where(t == self.t_ref, self.value, np.nan)
+
+	@property
+	def is_valid (self):
+		return True
+
+	def __repr__ (self):
+		return f"FixedTExpression({self.value} @ {self.t_ref}K)"
+
+
+NAN_EXPRESSION = TempExpression()
+
+
+@lru_cache(maxsize=None)
+def compile_temp_expression (data_str, t_str):
+	"""将数据库中的系数文本及其温度列编译为 TempExpression，相同输入只编译一次。
+
+	t_str 为 "T" 时 data_str 可以是 "A/T+B" 公式或纯数字；t_str 为数字时 data_str 只在该温度下有效。
+	"""
+	if not data_str or str(data_str).strip() == '':
+		return NAN_EXPRESSION
+
+	if t_str == "T":
+		match = _INVERSE_T_PATTERN.match(str(data_str))
+		if match:
+			return InverseTExpression(float(match.group(1)), float(match.group(2)))
+		try:
+			return ConstantExpression(float(data_str))
+		except (ValueError, TypeError):
+			return NAN_EXPRESSION
+
+	if t_str and str(t_str).strip():
+		try:
+			return FixedTExpression(float(data_str), float(t_str))
+		except (ValueError, TypeError):
+			return NAN_EXPRESSION
+
+	return NAN_EXPRESSION
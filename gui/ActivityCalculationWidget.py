@@ -337,19 +337,13 @@ class ActivityCalculationWidget(QWidget):
 			model_func = self.get_model_function(model_name)
 			self.activity_calc_module.set_composition_dict(alloy_composition_str)
 			
-			# 计算不同方法的活度系数
-			ln_gamma_darken = self.activity_calc_module.get_ln_gamma(comp_dict, solute, solvent, temp, state,
-			                                                                model_func, model_name,
-			                                                                activity_model='Darken',
-			                                                                full_alloy_str=alloy_composition_str)
-			ln_gamma_wagner = self.activity_calc_module.get_ln_gamma(comp_dict, solute, solvent,  temp, state,
-			                                                                model_func, model_name,
-			                                                                activity_model='Wagner',
-			                                                                full_alloy_str=alloy_composition_str)
-			ln_gamma_elliot = self.activity_calc_module.get_ln_gamma(comp_dict, solute, solvent, temp, state,
-			                                                                 model_func, model_name,
-			                                                                 activity_model='Elliott',
-			                                                                 full_alloy_str=alloy_composition_str)
+			# 计算不同方法的活度系数 (相互作用参数只计算一次)
+			ln_gamma_all = self.activity_calc_module.get_all_ln_gamma(comp_dict, solvent, temp, state,
+			                                                          model_func, model_name,
+			                                                          formalisms=('Darken', 'Wagner', 'Elliott'),
+			                                                          full_alloy_str=alloy_composition_str)
+			ln_gamma_darken, ln_gamma_wagner, ln_gamma_elliot = (float(v) for v in
+			                                                     ln_gamma_all[list(comp_dict).index(solute)])
 			
 			# 计算活度
 			Activity_darken = math.exp(ln_gamma_darken) * xi
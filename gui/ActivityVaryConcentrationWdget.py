@@ -15,7 +15,9 @@ from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navigatio
 from matplotlib.figure import Figure
 
 from calculations.activity_calculator import ActivityCoefficient
+from calculations.sweep import SweepResult, SweepSpec, composition_at_point, iter_sweep
 from core.utils import *
+from gui.sweep_worker import start_sweep, sweep_running
 from models.extrapolation_models import BinaryModel
 
 # Matplotlib 全局设置
@@ -1033,6 +1035,11 @@ class CompositionVariationWidget(QWidget):
 	
 	def run_calculation_thread (self):
 		"""运行计算线程"""
+		# 取消后进度对话框已关闭，但后台计算要到当前计算点结束才停止
+		if sweep_running(self):
+			QMessageBox.information(self, "计算进行中", "上一次计算仍在进行，请等待其结束后再开始新的计算。")
+			return
+		
 		# 验证输入
 		if not self.alloy_compositions.text().strip():
 			QMessageBox.warning(self, "输入缺失", "请输入合金基础组成。")
@@ -1062,21 +1069,12 @@ class CompositionVariationWidget(QWidget):
 		
 		self.status_bar.set_status("正在计算...")
 		self.calculate_all_properties()
-		
-		if hasattr(self, 'progress_dialog') and self.progress_dialog:
-			self.progress_dialog.close()
 	
 	def calculate_all_properties (self):
 		"""计算所有属性 - 使用预分配大数组的安全版本"""
+		started = False
 		try:
 			self.has_calculated = False
-			# 重置数据结构
-			self.calculation_results = {
-				"activity": {},
-				"activity_coefficient": {},
-				"activity_darken": {},
-				"activity_coefficient_darken": {}
-			}
 			
 			# 获取参数
 			base_matrix_str = self.alloy_compositions.text().strip()
@@ -1150,222 +1148,259 @@ class CompositionVariationWidget(QWidget):
 			new_results_html += f"浓度范围: {min_comp:.3f} - {max_comp:.3f} (步长 {step_comp:.3f})<br>"
 			new_results_html += f"外推模型: {', '.join(self.current_parameters['selected_models'])}<hr>"
 			
-			# 设置进度条
 			total_calcs = len(selected_extra_models_to_run) * len(compositions)
-			if hasattr(self, 'progress_dialog'):
-				self.progress_dialog.setRange(0, total_calcs)
-			calcs_done = 0
 			
-			# 执行计算
-			for model_key_Extra, extra_model_function in selected_extra_models_to_run:
-				print(f"\n--- 开始计算模型: {model_key_Extra} ---")
+			# 在后台线程中逐点计算，计算过程中不访问界面控件
+			def sweep (worker):
+				nonlocal new_results_html
+				# 结果在后台线程中局部整理，结束后随 finished 交给界面线程
+				calculation_results = {
+					"activity": {},
+					"activity_coefficient": {},
+					"activity_darken": {},
+					"activity_coefficient_darken": {}
+				}
+				# 由 calculations.sweep 计算全部 (模型 × 成分点)，这里只整理结果
+				spec = SweepSpec(base_comp_dict, matrix_elem, target_elem, "composition", compositions,
+				                 [mk for mk, _ in selected_extra_models_to_run], ("Elliott", "Darken"),
+				                 temperature, phase, varying_elem, alloy_composition)
+				sweep_result = SweepResult(spec)
+				chunks = iter_sweep(spec)
+				for model_key, indices, values, errors in chunks:
+					sweep_result.add(model_key, indices, values, errors)
+					for i in indices:
+						yield model_key, compositions[i]
+					if worker.is_cancelled():
+						chunks.close()
+						break
 				
-				# ✅ 关键改进：预分配更大的数组 + 使用计数器
-				MAX_ARRAY_SIZE = 10000  # 预分配足够大的数组
-				current_activities = np.full(MAX_ARRAY_SIZE, float('nan'))
-				current_coefficients = np.full(MAX_ARRAY_SIZE, float('nan'))
-				current_activities_darken = np.full(MAX_ARRAY_SIZE, float('nan'))
-				current_coefficients_darken = np.full(MAX_ARRAY_SIZE, float('nan'))
-				composition_values = np.full(MAX_ARRAY_SIZE, float('nan'))
+				# 整理结果
+				for model_key_Extra, extra_model_function in selected_extra_models_to_run:
+					print(f"\n--- 开始计算模型: {model_key_Extra} ---")
 				
-				valid_count = 0  # 有效数据计数器
+					# ✅ 关键改进：预分配更大的数组 + 使用计数器
+					MAX_ARRAY_SIZE = 10000  # 预分配足够大的数组
+					current_activities = np.full(MAX_ARRAY_SIZE, float('nan'))
+					current_coefficients = np.full(MAX_ARRAY_SIZE, float('nan'))
+					current_activities_darken = np.full(MAX_ARRAY_SIZE, float('nan'))
+					current_coefficients_darken = np.full(MAX_ARRAY_SIZE, float('nan'))
+					composition_values = np.full(MAX_ARRAY_SIZE, float('nan'))
 				
-				print(f"预分配数组大小: {MAX_ARRAY_SIZE}, 计划计算点数: {len(compositions)}")
+					valid_count = 0  # 有效数据计数器
 				
-				new_results_html += f"<br><b>⚙️ 外推模型: {model_key_Extra}</b><br>"
-				new_results_html += f"<font face='Courier New' color='#2C3E50'><b>X_{varying_elem}   | Elliott-Act | Elliott-γ   | Darken-Act  | Darken-γ    | Δa(%)  | Δγ(%)</b></font><br>"
-				new_results_html += f"<font face='Courier New'>---------|-------------|-------------|-------------|-------------|--------|------</font><br>"
+					print(f"预分配数组大小: {MAX_ARRAY_SIZE}, 计划计算点数: {len(compositions)}")
 				
-				successful_calcs = 0
-				failed_calcs = 0
+					new_results_html += f"<br><b>⚙️ 外推模型: {model_key_Extra}</b><br>"
+					new_results_html += f"<font face='Courier New' color='#2C3E50'><b>X_{varying_elem}   | Elliott-Act | Elliott-γ   | Darken-Act  | Darken-γ    | Δa(%)  | Δγ(%)</b></font><br>"
+					new_results_html += f"<font face='Courier New'>---------|-------------|-------------|-------------|-------------|--------|------</font><br>"
 				
-				for i, comp_val in enumerate(compositions):
-					if hasattr(self, 'progress_dialog') and self.progress_dialog.wasCanceled():
-						new_results_html += "<font color='red'>❌ 计算已取消</font><br>"
-						break
+					successful_calcs = 0
+					failed_calcs = 0
+				
+					for i, comp_val in enumerate(compositions):
+						if not sweep_result.is_done(model_key_Extra, i):
+							new_results_html += "<font color='red'>❌ 计算已取消</font><br>"
+							break
 					
-					# 构建当前组成
-					current_comp = self.build_composition_at_point(base_comp_dict, varying_elem, matrix_elem, comp_val)
-					if current_comp is None:
-						print(f"组分点{i} (X={comp_val:.3f}): 组成构建失败")
-						new_results_html += f"<font face='Courier New'>{comp_val:<9.3f}|     N/A     |     N/A     |     N/A     |     N/A     |  N/A   |  N/A</font><br>"
-						failed_calcs += 1
-						calcs_done += 1
-						continue
+						# 构建当前组成
+						current_comp = spec.point_composition(i)
+						if current_comp is None:
+							print(f"组分点{i} (X={comp_val:.3f}): 组成构建失败")
+							new_results_html += f"<font face='Courier New'>{comp_val:<9.3f}|     N/A     |     N/A     |     N/A     |     N/A     |  N/A   |  N/A</font><br>"
+							failed_calcs += 1
+							continue
 					
-					try:
-						# 计算Elliott方法
-						ln_gamma_elliott = self.activity_calc_module.get_ln_gamma(current_comp, target_elem,
-						                                                                  matrix_elem, temperature,
-						                                                                  phase, extra_model_function,
-						                                                                  model_key_Extra,
-						                                                                  activity_model='Elliott',
-						                                                                  full_alloy_str=alloy_composition)
-						gamma_elliott = math.exp(ln_gamma_elliott) if not (
-								math.isnan(ln_gamma_elliott) or math.isinf(ln_gamma_elliott)) else float('nan')
+						try:
+							# 计算Elliott方法
+							ln_gamma_elliott = sweep_result.ln_gamma(model_key_Extra, i, 'Elliott')
+							gamma_elliott = math.exp(ln_gamma_elliott) if not (
+									math.isnan(ln_gamma_elliott) or math.isinf(ln_gamma_elliott)) else float('nan')
 						
-						# 计算Darken方法
-						ln_gamma_darken = self.activity_calc_module.get_ln_gamma(current_comp, target_elem,
-						                                                                matrix_elem, temperature, phase,
-						                                                                extra_model_function,
-						                                                                model_key_Extra,
-						                                                                activity_model='Darken',
-						                                                                full_alloy_str=alloy_composition)
-						gamma_darken = math.exp(ln_gamma_darken) if not (
-								math.isnan(ln_gamma_darken) or math.isinf(ln_gamma_darken)) else float('nan')
+							# 计算Darken方法
+							ln_gamma_darken = sweep_result.ln_gamma(model_key_Extra, i, 'Darken')
+							gamma_darken = math.exp(ln_gamma_darken) if not (
+									math.isnan(ln_gamma_darken) or math.isinf(ln_gamma_darken)) else float('nan')
 						
-						# 计算活度
-						xi_target = current_comp.get(target_elem, 0.0)
-						act_elliott = gamma_elliott * xi_target if not math.isnan(gamma_elliott) else float('nan')
-						act_darken = gamma_darken * xi_target if not math.isnan(gamma_darken) else float('nan')
+							# 计算活度
+							xi_target = current_comp.get(target_elem, 0.0)
+							act_elliott = gamma_elliott * xi_target if not math.isnan(gamma_elliott) else float('nan')
+							act_darken = gamma_darken * xi_target if not math.isnan(gamma_darken) else float('nan')
 						
-						# 计算相对差异百分比
-						if not (math.isnan(act_elliott) or math.isnan(act_darken)) and abs(act_elliott) > 1e-10:
-							delta_act_percent = abs((act_darken - act_elliott) / act_elliott) * 100
-						else:
-							delta_act_percent = float('nan')
+							# 计算相对差异百分比
+							if not (math.isnan(act_elliott) or math.isnan(act_darken)) and abs(act_elliott) > 1e-10:
+								delta_act_percent = abs((act_darken - act_elliott) / act_elliott) * 100
+							else:
+								delta_act_percent = float('nan')
 						
-						if not (math.isnan(gamma_elliott) or math.isnan(gamma_darken)) and abs(gamma_elliott) > 1e-10:
-							delta_gamma_percent = abs((gamma_darken - gamma_elliott) / gamma_elliott) * 100
-						else:
-							delta_gamma_percent = float('nan')
+							if not (math.isnan(gamma_elliott) or math.isnan(gamma_darken)) and abs(gamma_elliott) > 1e-10:
+								delta_gamma_percent = abs((gamma_darken - gamma_elliott) / gamma_elliott) * 100
+							else:
+								delta_gamma_percent = float('nan')
 						
-						# ✅ 使用计数器索引存储有效数据
-						current_activities[valid_count] = act_elliott
-						current_coefficients[valid_count] = gamma_elliott
-						current_activities_darken[valid_count] = act_darken
-						current_coefficients_darken[valid_count] = gamma_darken
-						composition_values[valid_count] = comp_val
+							# ✅ 使用计数器索引存储有效数据
+							current_activities[valid_count] = act_elliott
+							current_coefficients[valid_count] = gamma_elliott
+							current_activities_darken[valid_count] = act_darken
+							current_coefficients_darken[valid_count] = gamma_darken
+							composition_values[valid_count] = comp_val
 						
-						valid_count += 1  # 递增有效数据计数
-						successful_calcs += 1
+							valid_count += 1  # 递增有效数据计数
+							successful_calcs += 1
 						
-						# 格式化显示
-						delta_act_str = f"{delta_act_percent:6.2f}" if not math.isnan(delta_act_percent) else "  N/A"
-						delta_gamma_str = f"{delta_gamma_percent:6.2f}" if not math.isnan(
-							delta_gamma_percent) else "  N/A"
+							# 格式化显示
+							delta_act_str = f"{delta_act_percent:6.2f}" if not math.isnan(delta_act_percent) else "  N/A"
+							delta_gamma_str = f"{delta_gamma_percent:6.2f}" if not math.isnan(
+								delta_gamma_percent) else "  N/A"
 						
-						# 根据差异大小设置颜色
-						if not math.isnan(delta_act_percent) and delta_act_percent > 5:
-							delta_act_color = "#E74C3C"
-						elif not math.isnan(delta_act_percent) and delta_act_percent > 1:
-							delta_act_color = "#F39C12"
-						else:
-							delta_act_color = "#27AE60"
+							# 根据差异大小设置颜色
+							if not math.isnan(delta_act_percent) and delta_act_percent > 5:
+								delta_act_color = "#E74C3C"
+							elif not math.isnan(delta_act_percent) and delta_act_percent > 1:
+								delta_act_color = "#F39C12"
+							else:
+								delta_act_color = "#27AE60"
 						
-						if not math.isnan(delta_gamma_percent) and delta_gamma_percent > 5:
-							delta_gamma_color = "#E74C3C"
-						elif not math.isnan(delta_gamma_percent) and delta_gamma_percent > 1:
-							delta_gamma_color = "#F39C12"
-						else:
-							delta_gamma_color = "#27AE60"
+							if not math.isnan(delta_gamma_percent) and delta_gamma_percent > 5:
+								delta_gamma_color = "#E74C3C"
+							elif not math.isnan(delta_gamma_percent) and delta_gamma_percent > 1:
+								delta_gamma_color = "#F39C12"
+							else:
+								delta_gamma_color = "#27AE60"
 						
-						new_results_html += (
-							f"<font face='Courier New'>{comp_val:<9.3f}| {act_elliott:<12.4f}| {gamma_elliott:<12.4f}| "
-							f"{act_darken:<12.4f}| {gamma_darken:<12.4f}| "
-							f"<font color='{delta_act_color}'>{delta_act_str}</font>| "
-							f"<font color='{delta_gamma_color}'>{delta_gamma_str}</font></font><br>"
-						)
+							new_results_html += (
+								f"<font face='Courier New'>{comp_val:<9.3f}| {act_elliott:<12.4f}| {gamma_elliott:<12.4f}| "
+								f"{act_darken:<12.4f}| {gamma_darken:<12.4f}| "
+								f"<font color='{delta_act_color}'>{delta_act_str}</font>| "
+								f"<font color='{delta_gamma_color}'>{delta_gamma_str}</font></font><br>"
+							)
 						
-						if i < 5:  # 只打印前5个点的详细信息
-							print(f"组分点{i} (X={comp_val:.3f}): 计算成功, 存储索引{valid_count - 1}")
-					
-					except Exception as e_calc:
-						print(f"组分点{i} (X={comp_val:.3f}): 计算异常 - {e_calc}")
-						new_results_html += f"<font face='Courier New'>{comp_val:<9.3f}|     N/A     |     N/A     |     N/A     |     N/A     |  N/A   |  N/A</font><br>"
-						failed_calcs += 1
+							if i < 5:  # 只打印前5个点的详细信息
+								print(f"组分点{i} (X={comp_val:.3f}): 计算成功, 存储索引{valid_count - 1}")
 					
-					calcs_done += 1
-					if hasattr(self, 'progress_dialog'):
-						self.progress_dialog.setValue(calcs_done)
-						QApplication.processEvents()
+						except Exception as e_calc:
+							print(f"组分点{i} (X={comp_val:.3f}): 计算异常 - {e_calc}")
+							new_results_html += f"<font face='Courier New'>{comp_val:<9.3f}|     N/A     |     N/A     |     N/A     |     N/A     |  N/A   |  N/A</font><br>"
+							failed_calcs += 1
 				
-				print(
-					f"模型 {model_key_Extra} 计算完成: 成功 {successful_calcs}/{len(compositions)}, 有效数据点: {valid_count}")
+					print(
+						f"模型 {model_key_Extra} 计算完成: 成功 {successful_calcs}/{len(compositions)}, 有效数据点: {valid_count}")
 				
-				if hasattr(self, 'progress_dialog') and self.progress_dialog.wasCanceled():
-					break
+					if worker.is_cancelled():
+						break
 				
-				# ✅ 截取有效数据部分，确保所有数组长度完全一致
-				if valid_count > 0:
-					final_compositions = composition_values[:valid_count].copy()
-					final_activities = current_activities[:valid_count].copy()
-					final_coefficients = current_coefficients[:valid_count].copy()
-					final_activities_darken = current_activities_darken[:valid_count].copy()
-					final_coefficients_darken = current_coefficients_darken[:valid_count].copy()
+					# ✅ 截取有效数据部分，确保所有数组长度完全一致
+					if valid_count > 0:
+						final_compositions = composition_values[:valid_count].copy()
+						final_activities = current_activities[:valid_count].copy()
+						final_coefficients = current_coefficients[:valid_count].copy()
+						final_activities_darken = current_activities_darken[:valid_count].copy()
+						final_coefficients_darken = current_coefficients_darken[:valid_count].copy()
 					
-					print(f"最终数组长度验证:")
-					print(f"  final_compositions: {len(final_compositions)}")
-					print(f"  final_activities: {len(final_activities)}")
-					print(f"  final_activities_darken: {len(final_activities_darken)}")
-					print(
-						f"  所有数组长度一致: {len(final_compositions) == len(final_activities) == len(final_activities_darken)}")
+						print(f"最终数组长度验证:")
+						print(f"  final_compositions: {len(final_compositions)}")
+						print(f"  final_activities: {len(final_activities)}")
+						print(f"  final_activities_darken: {len(final_activities_darken)}")
+						print(
+							f"  所有数组长度一致: {len(final_compositions) == len(final_activities) == len(final_activities_darken)}")
 				
-				else:
-					print(f"模型 {model_key_Extra}: 无有效数据")
-					# 创建空数组但保持结构一致
-					final_compositions = np.array([])
-					final_activities = np.array([])
-					final_coefficients = np.array([])
-					final_activities_darken = np.array([])
-					final_coefficients_darken = np.array([])
+					else:
+						print(f"模型 {model_key_Extra}: 无有效数据")
+						# 创建空数组但保持结构一致
+						final_compositions = np.array([])
+						final_activities = np.array([])
+						final_coefficients = np.array([])
+						final_activities_darken = np.array([])
+						final_coefficients_darken = np.array([])
 				
-				# 存储结果 - 保证长度一致性
-				self.calculation_results["activity"][model_key_Extra] = {
-					"compositions": final_compositions,
-					"values": final_activities
-				}
-				self.calculation_results["activity_coefficient"][model_key_Extra] = {
-					"compositions": final_compositions,
-					"values": final_coefficients
-				}
-				self.calculation_results["activity_darken"][model_key_Extra] = {
-					"compositions": final_compositions,
-					"values": final_activities_darken
-				}
-				self.calculation_results["activity_coefficient_darken"][model_key_Extra] = {
-					"compositions": final_compositions,
-					"values": final_coefficients_darken
-				}
+					# 存储结果 - 保证长度一致性
+					calculation_results["activity"][model_key_Extra] = {
+						"compositions": final_compositions,
+						"values": final_activities
+					}
+					calculation_results["activity_coefficient"][model_key_Extra] = {
+						"compositions": final_compositions,
+						"values": final_coefficients
+					}
+					calculation_results["activity_darken"][model_key_Extra] = {
+						"compositions": final_compositions,
+						"values": final_activities_darken
+					}
+					calculation_results["activity_coefficient_darken"][model_key_Extra] = {
+						"compositions": final_compositions,
+						"values": final_coefficients_darken
+					}
 				
-				# 添加统计信息
-				if valid_count > 1:
-					valid_elliott_act = final_activities[~np.isnan(final_activities)]
-					valid_darken_act = final_activities_darken[~np.isnan(final_activities_darken)]
+					# 添加统计信息
+					if valid_count > 1:
+						valid_elliott_act = final_activities[~np.isnan(final_activities)]
+						valid_darken_act = final_activities_darken[~np.isnan(final_activities_darken)]
 					
-					if len(valid_elliott_act) > 0 and len(valid_darken_act) > 0:
-						min_len = min(len(valid_elliott_act), len(valid_darken_act))
-						if min_len > 1:
-							valid_pairs_act = [(e, d) for e, d in
-							                   zip(valid_elliott_act[:min_len], valid_darken_act[:min_len]) if
-							                   abs(e) > 1e-10]
-							if valid_pairs_act:
-								avg_diff_act = np.mean([abs((d - e) / e) * 100 for e, d in valid_pairs_act])
-								max_diff_act = np.max([abs((d - e) / e) * 100 for e, d in valid_pairs_act])
+						if len(valid_elliott_act) > 0 and len(valid_darken_act) > 0:
+							min_len = min(len(valid_elliott_act), len(valid_darken_act))
+							if min_len > 1:
+								valid_pairs_act = [(e, d) for e, d in
+								                   zip(valid_elliott_act[:min_len], valid_darken_act[:min_len]) if
+								                   abs(e) > 1e-10]
+								if valid_pairs_act:
+									avg_diff_act = np.mean([abs((d - e) / e) * 100 for e, d in valid_pairs_act])
+									max_diff_act = np.max([abs((d - e) / e) * 100 for e, d in valid_pairs_act])
 								
-								new_results_html += f"<br><b>📊 模型 {model_key_Extra} 统计:</b><br>"
-								new_results_html += f"<font color='#2980B9'>成功计算: {successful_calcs}/{len(compositions)} ({valid_count}个有效数据点)</font><br>"
-								new_results_html += f"<font color='#2980B9'>活度平均差异: {avg_diff_act:.2f}%, 最大差异: {max_diff_act:.2f}%</font><br>"
-			
-			# 更新界面
-			self.historical_results_html = new_results_html + self.historical_results_html
-			if hasattr(self, 'results_text_right'):
-				self.results_text_right.setHtml(self.historical_results_html)
-			self.update_results_stats()
-			self.has_calculated = True
-			self.update_plot_display_only()
-			self.status_bar.set_status("✅ 计算完成")
+									new_results_html += f"<br><b>📊 模型 {model_key_Extra} 统计:</b><br>"
+									new_results_html += f"<font color='#2980B9'>成功计算: {successful_calcs}/{len(compositions)} ({valid_count}个有效数据点)</font><br>"
+									new_results_html += f"<font color='#2980B9'>活度平均差异: {avg_diff_act:.2f}%, 最大差异: {max_diff_act:.2f}%</font><br>"
+				
+				return new_results_html, calculation_results
 			
-			print("=== 计算流程完成 ===")
+			start_sweep(self, sweep, total_calcs, getattr(self, 'progress_dialog', None),
+			            self._finish_calculation, self._calculation_failed,
+			            on_cancelled=self._calculation_cancelled)
+			started = True
 		
 		except Exception as e_outer:
 			print(f"计算主流程异常: {e_outer}")
 			QMessageBox.critical(self, "计算主流程出错", f"发生严重错误: {str(e_outer)}\n{traceback.format_exc()}")
 			self.status_bar.set_status("❌ 计算失败")
 		finally:
-			if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			if not started and hasattr(self, 'progress_dialog') and self.progress_dialog:
 				self.progress_dialog.close()
 	
+	def _finish_calculation (self, result):
+		"""后台计算结束后在界面线程中接收结果 (HTML, 计算结果字典)，更新结果与图表。"""
+		new_results_html, self.calculation_results = result
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		
+		# 更新界面
+		self.historical_results_html = new_results_html + self.historical_results_html
+		if hasattr(self, 'results_text_right'):
+			self.results_text_right.setHtml(self.historical_results_html)
+		self.update_results_stats()
+		self.has_calculated = True
+		self.update_plot_display_only()
+		self.status_bar.set_status("✅ 计算完成")
+		
+		print("=== 计算流程完成 ===")
+	
+	def _calculation_cancelled (self, result):
+		"""计算被取消：只记录已输出的文本，保留上一次的计算结果与图表。"""
+		new_results_html, _ = result
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		
+		self.historical_results_html = new_results_html + self.historical_results_html
+		if hasattr(self, 'results_text_right'):
+			self.results_text_right.setHtml(self.historical_results_html)
+		self.update_results_stats()
+		self.has_calculated = any(self.calculation_results.values())
+		self.update_plot_display_only()
+		self.status_bar.set_status("❌ 计算已取消")
+	
+	def _calculation_failed (self, message):
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		QMessageBox.critical(self, "计算主流程出错", f"发生严重错误: {message}")
+		self.status_bar.set_status("❌ 计算失败")
+	
 	def normalize_dict (self, comp, exclude_key):
 		'''归一化去掉指定组元后的合金组成'''
 		filtered_comp = {k: v for k, v in comp.items() if k != exclude_key}
@@ -1375,24 +1410,7 @@ class CompositionVariationWidget(QWidget):
 	
 	def build_composition_at_point (self, base_comp, varying_elem, matrix_elem, new_varying_value):
 		"""在指定点构建组成"""
-		try:
-			# 复制基础组成
-			comp = base_comp.copy()
-			comp = self.normalize_dict(comp, varying_elem)
-			# 设置变化组分的新值
-			comp[varying_elem] = new_varying_value
-			org_matrix_elem_con = comp[matrix_elem]
-			new_matrix_elem_con = org_matrix_elem_con - new_varying_value
-			if new_matrix_elem_con >= 0:
-				comp[matrix_elem] = new_matrix_elem_con
-			else:
-				return None
-			
-			return comp
-		
-		except Exception as e:
-			print(f"构建组成时出错: {e}")
-			return None
+		return composition_at_point(base_comp, varying_elem, matrix_elem, new_varying_value)
 	
 	def update_plot_display_only (self):
 		"""更新图表显示"""
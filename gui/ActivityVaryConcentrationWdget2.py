@@ -15,7 +15,9 @@ from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navigatio
 from matplotlib.figure import Figure
 
 from calculations.activity_calculator import ActivityCoefficient
+from calculations.sweep import SweepResult, SweepSpec, composition_with_addition, iter_sweep
 from core.utils import *
+from gui.sweep_worker import start_sweep, sweep_running
 from models.extrapolation_models import BinaryModel
 
 # Matplotlib 全局设置
@@ -861,6 +863,11 @@ class AlloyAdditionWidget(QWidget):
 	
 	def run_calculation_thread (self):
 		"""运行计算线程"""
+		# 取消后进度对话框已关闭，但后台计算要到当前计算点结束才停止
+		if sweep_running(self):
+			QMessageBox.information(self, "计算进行中", "上一次计算仍在进行，请等待其结束后再开始新的计算。")
+			return
+		
 		# 验证输入
 		if not self.base_alloy_composition.text().strip():
 			QMessageBox.warning(self, "输入缺失", "请输入基体合金组成。")
@@ -902,21 +909,12 @@ class AlloyAdditionWidget(QWidget):
 		
 		self.status_bar.set_status("正在计算...")
 		self.calculate_addition_effects()
-		
-		if hasattr(self, 'progress_dialog') and self.progress_dialog:
-			self.progress_dialog.close()
 	
 	def calculate_addition_effects (self):
 		"""计算添加元素效应"""
+		started = False
 		try:
 			self.has_calculated = False
-			# 重置数据结构
-			self.calculation_results = {
-				"activity_darken": {},
-				"activity_coefficient_darken": {},
-				"activity_elliott": {},
-				"activity_coefficient_elliott": {}
-			}
 			
 			# 获取参数
 			base_alloy_str = self.base_alloy_composition.text().strip()
@@ -991,180 +989,194 @@ class AlloyAdditionWidget(QWidget):
 			new_results_html += f"计算方法: {', '.join(selected_activity_methods)}<br>"
 			new_results_html += f"外推模型: {', '.join(self.current_parameters['selected_models'])}<hr>"
 			
-			# 设置进度条
-			total_calcs = len(selected_models_to_run) * len(addition_concentrations) * len(selected_activity_methods)
-			if hasattr(self, 'progress_dialog'):
-				self.progress_dialog.setRange(0, total_calcs)
-			calcs_done = 0
+			total_calcs = len(selected_models_to_run) * len(addition_concentrations)
+			
+			# 在后台线程中逐点计算，计算过程中不访问界面控件
+			def sweep (worker):
+				nonlocal new_results_html
+				# 结果在后台线程中局部整理，结束后随 finished 交给界面线程
+				calculation_results = {
+					"activity_darken": {},
+					"activity_coefficient_darken": {},
+					"activity_elliott": {},
+					"activity_coefficient_elliott": {}
+				}
+				# 由 calculations.sweep 计算全部 (模型 × 添加量)，各活度模型一并求值，这里只整理结果
+				spec = SweepSpec(base_comp_dict, solvent_elem, target_elem, "addition", addition_concentrations,
+				                 [mk for mk, _ in selected_models_to_run], selected_activity_methods,
+				                 temperature, phase, addition_elem)
+				sweep_result = SweepResult(spec)
+				chunks = iter_sweep(spec)
+				for model_key, indices, values, errors in chunks:
+					sweep_result.add(model_key, indices, values, errors)
+					for i in indices:
+						yield model_key, addition_concentrations[i]
+					if worker.is_cancelled():
+						chunks.close()
+						break
 			
-			# 执行计算
-			for activity_method in selected_activity_methods:
-				for model_key_Extra, geo_model_function in selected_models_to_run:
-					print(f"\n--- 开始计算: {activity_method} 方法, {model_key_Extra} 模型 ---")
+				# 整理结果
+				for activity_method in selected_activity_methods:
+					for model_key_Extra, geo_model_function in selected_models_to_run:
+						print(f"\n--- 开始计算: {activity_method} 方法, {model_key_Extra} 模型 ---")
 					
-					# 预分配大数组
-					MAX_ARRAY_SIZE = 10000
-					current_activities = np.full(MAX_ARRAY_SIZE, float('nan'))
-					current_coefficients = np.full(MAX_ARRAY_SIZE, float('nan'))
-					addition_values = np.full(MAX_ARRAY_SIZE, float('nan'))
+						# 预分配大数组
+						MAX_ARRAY_SIZE = 10000
+						current_activities = np.full(MAX_ARRAY_SIZE, float('nan'))
+						current_coefficients = np.full(MAX_ARRAY_SIZE, float('nan'))
+						addition_values = np.full(MAX_ARRAY_SIZE, float('nan'))
 					
-					valid_count = 0
+						valid_count = 0
 					
-					new_results_html += f"<br><b>⚙️ {activity_method.upper()} 方法 - {model_key_Extra} 模型</b><br>"
-					new_results_html += f"<font face='Courier New' color='#2C3E50'><b>X_{addition_elem}   | {target_elem}-活度    | {target_elem}-γ        | 基体缩减比</b></font><br>"
-					new_results_html += f"<font face='Courier New'>---------|-------------|-------------|--------</font><br>"
+						new_results_html += f"<br><b>⚙️ {activity_method.upper()} 方法 - {model_key_Extra} 模型</b><br>"
+						new_results_html += f"<font face='Courier New' color='#2C3E50'><b>X_{addition_elem}   | {target_elem}-活度    | {target_elem}-γ        | 基体缩减比</b></font><br>"
+						new_results_html += f"<font face='Courier New'>---------|-------------|-------------|--------</font><br>"
 					
-					successful_calcs = 0
-					failed_calcs = 0
+						successful_calcs = 0
+						failed_calcs = 0
 					
-					for i, add_conc in enumerate(addition_concentrations):
-						if hasattr(self, 'progress_dialog') and self.progress_dialog.wasCanceled():
-							new_results_html += "<font color='red'>❌ 计算已取消</font><br>"
-							break
+						for i, add_conc in enumerate(addition_concentrations):
+							if not sweep_result.is_done(model_key_Extra, i):
+								new_results_html += "<font color='red'>❌ 计算已取消</font><br>"
+								break
 						
-						# 构建当前组成（基体按比例缩减）
-						current_comp = self.build_composition_with_addition(base_comp_dict, addition_elem, add_conc)
-						if current_comp is None:
-							print(f"添加浓度点{i} (X={add_conc:.3f}): 组成构建失败")
-							new_results_html += f"<font face='Courier New'>{add_conc:<9.3f}|     N/A     |     N/A     |   N/A</font><br>"
-							failed_calcs += 1
-							calcs_done += 1
-							continue
+							# 构建当前组成（基体按比例缩减）
+							current_comp = spec.point_composition(i)
+							if current_comp is None:
+								print(f"添加浓度点{i} (X={add_conc:.3f}): 组成构建失败")
+								new_results_html += f"<font face='Courier New'>{add_conc:<9.3f}|     N/A     |     N/A     |   N/A</font><br>"
+								failed_calcs += 1
+								continue
 						
-						try:
-							ln_gamma = self.activity_calc_module.get_ln_gamma(current_comp, target_elem, solvent_elem,
-							                                                  temperature, phase, geo_model_function,
-							                                                  model_key_Extra, activity_method,
-							                                                  full_alloy_str='')
-							
+							try:
+								ln_gamma = sweep_result.ln_gamma(model_key_Extra, i, activity_method)
 							
+								gamma = math.exp(ln_gamma) if not (
+										math.isnan(ln_gamma) or math.isinf(ln_gamma)) else float('nan')
 							
-							gamma = math.exp(ln_gamma) if not (
-									math.isnan(ln_gamma) or math.isinf(ln_gamma)) else float('nan')
+								# 计算活度
+								xi_target = current_comp.get(target_elem, 0.0)
+								activity = gamma * xi_target if not math.isnan(gamma) else float('nan')
 							
-							# 计算活度
-							xi_target = current_comp.get(target_elem, 0.0)
-							activity = gamma * xi_target if not math.isnan(gamma) else float('nan')
+								# 计算基体缩减比例
+								base_scale_factor = 1.0 - add_conc
 							
-							# 计算基体缩减比例
-							base_scale_factor = 1.0 - add_conc
+								# 存储有效数据
+								current_activities[valid_count] = activity
+								current_coefficients[valid_count] = gamma
+								addition_values[valid_count] = add_conc
 							
-							# 存储有效数据
-							current_activities[valid_count] = activity
-							current_coefficients[valid_count] = gamma
-							addition_values[valid_count] = add_conc
+								valid_count += 1
+								successful_calcs += 1
 							
-							valid_count += 1
-							successful_calcs += 1
+								new_results_html += (
+									f"<font face='Courier New'>{add_conc:<9.3f}| {activity:<12.4f}| {gamma:<12.4f}| {base_scale_factor:.4f}</font><br>"
+								)
 							
-							new_results_html += (
-								f"<font face='Courier New'>{add_conc:<9.3f}| {activity:<12.4f}| {gamma:<12.4f}| {base_scale_factor:.4f}</font><br>"
-							)
-							
-							if i < 5:
-								print(f"添加点{i} (X={add_conc:.3f}): 计算成功, 存储索引{valid_count - 1}")
-						
-						except Exception as e_calc:
-							print(f"添加点{i} (X={add_conc:.3f}): 计算异常 - {e_calc}")
-							new_results_html += f"<font face='Courier New'>{add_conc:<9.3f}|     N/A     |     N/A     |   N/A</font><br>"
-							failed_calcs += 1
+								if i < 5:
+									print(f"添加点{i} (X={add_conc:.3f}): 计算成功, 存储索引{valid_count - 1}")
 						
-						calcs_done += 1
-						if hasattr(self, 'progress_dialog'):
-							self.progress_dialog.setValue(calcs_done)
-							QApplication.processEvents()
+							except Exception as e_calc:
+								print(f"添加点{i} (X={add_conc:.3f}): 计算异常 - {e_calc}")
+								new_results_html += f"<font face='Courier New'>{add_conc:<9.3f}|     N/A     |     N/A     |   N/A</font><br>"
+								failed_calcs += 1
 					
-					print(
-							f"{activity_method} 方法 {model_key_Extra} 计算完成: 成功 {successful_calcs}/{len(addition_concentrations)}, 有效数据点: {valid_count}")
+						print(
+								f"{activity_method} 方法 {model_key_Extra} 计算完成: 成功 {successful_calcs}/{len(addition_concentrations)}, 有效数据点: {valid_count}")
 					
-					if hasattr(self, 'progress_dialog') and self.progress_dialog.wasCanceled():
-						break
+						if worker.is_cancelled():
+							break
 					
-					# 截取有效数据
-					if valid_count > 0:
-						final_additions = addition_values[:valid_count].copy()
-						final_activities = current_activities[:valid_count].copy()
-						final_coefficients = current_coefficients[:valid_count].copy()
+						# 截取有效数据
+						if valid_count > 0:
+							final_additions = addition_values[:valid_count].copy()
+							final_activities = current_activities[:valid_count].copy()
+							final_coefficients = current_coefficients[:valid_count].copy()
 						
-						print(f"最终数组长度: {len(final_additions)} (一致性验证通过)")
-					else:
-						final_additions = np.array([])
-						final_activities = np.array([])
-						final_coefficients = np.array([])
+							print(f"最终数组长度: {len(final_additions)} (一致性验证通过)")
+						else:
+							final_additions = np.array([])
+							final_activities = np.array([])
+							final_coefficients = np.array([])
 					
-					# 存储结果
-					activity_key = f"activity_{activity_method}"
-					coefficient_key = f"activity_coefficient_{activity_method}"
+						# 存储结果
+						activity_key = f"activity_{activity_method}"
+						coefficient_key = f"activity_coefficient_{activity_method}"
 					
-					self.calculation_results[activity_key][model_key_Extra] = {
-						"compositions": final_additions,
-						"values": final_activities
-					}
-					self.calculation_results[coefficient_key][model_key_Extra] = {
-						"compositions": final_additions,
-						"values": final_coefficients
-					}
+						calculation_results[activity_key][model_key_Extra] = {
+							"compositions": final_additions,
+							"values": final_activities
+						}
+						calculation_results[coefficient_key][model_key_Extra] = {
+							"compositions": final_additions,
+							"values": final_coefficients
+						}
 					
-					# 添加统计信息
-					if valid_count > 1:
-						valid_activities = final_activities[~np.isnan(final_activities)]
+						# 添加统计信息
+						if valid_count > 1:
+							valid_activities = final_activities[~np.isnan(final_activities)]
 						
-						if len(valid_activities) > 0:
-							avg_activity = np.mean(valid_activities)
-							activity_range = np.max(valid_activities) - np.min(valid_activities)
+							if len(valid_activities) > 0:
+								avg_activity = np.mean(valid_activities)
+								activity_range = np.max(valid_activities) - np.min(valid_activities)
 							
-							new_results_html += f"<br><b>📊 {activity_method} 方法 {model_key_Extra} 统计:</b><br>"
-							new_results_html += f"<font color='#27AE60'>成功计算: {successful_calcs}/{len(addition_concentrations)}</font><br>"
-							new_results_html += f"<font color='#2980B9'>{target_elem}平均活度: {avg_activity:.4f}, 变化范围: {activity_range:.4f}</font><br>"
-			
-			# 更新界面
-			self.historical_results_html = new_results_html + self.historical_results_html
-			if hasattr(self, 'results_text_right'):
-				self.results_text_right.setHtml(self.historical_results_html)
-			self.has_calculated = True
-			self.update_plot_display_only()
-			self.status_bar.set_status("✅ 计算完成")
+								new_results_html += f"<br><b>📊 {activity_method} 方法 {model_key_Extra} 统计:</b><br>"
+								new_results_html += f"<font color='#27AE60'>成功计算: {successful_calcs}/{len(addition_concentrations)}</font><br>"
+								new_results_html += f"<font color='#2980B9'>{target_elem}平均活度: {avg_activity:.4f}, 变化范围: {activity_range:.4f}</font><br>"
+				
+				return new_results_html, calculation_results
 			
-			print("=== 添加元素效应计算完成 ===")
+			start_sweep(self, sweep, total_calcs, getattr(self, 'progress_dialog', None),
+			            self._finish_calculation, self._calculation_failed,
+			            on_cancelled=self._calculation_cancelled)
+			started = True
 		
 		except Exception as e_outer:
 			print(f"计算主流程异常: {e_outer}")
 			QMessageBox.critical(self, "计算主流程出错", f"发生严重错误: {str(e_outer)}\n{traceback.format_exc()}")
 			self.status_bar.set_status("❌ 计算失败")
 		finally:
-			if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			if not started and hasattr(self, 'progress_dialog') and self.progress_dialog:
 				self.progress_dialog.close()
 	
+	def _finish_calculation (self, result):
+		"""后台计算结束后在界面线程中接收结果 (HTML, 计算结果字典)，更新结果与图表。"""
+		new_results_html, self.calculation_results = result
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		
+		# 更新界面
+		self.historical_results_html = new_results_html + self.historical_results_html
+		if hasattr(self, 'results_text_right'):
+			self.results_text_right.setHtml(self.historical_results_html)
+		self.has_calculated = True
+		self.update_plot_display_only()
+		self.status_bar.set_status("✅ 计算完成")
+		
+		print("=== 添加元素效应计算完成 ===")
+	
+	def _calculation_cancelled (self, result):
+		"""计算被取消：只记录已输出的文本，保留上一次的计算结果与图表。"""
+		new_results_html, _ = result
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		
+		self.historical_results_html = new_results_html + self.historical_results_html
+		if hasattr(self, 'results_text_right'):
+			self.results_text_right.setHtml(self.historical_results_html)
+		self.has_calculated = any(self.calculation_results.values())
+		self.update_plot_display_only()
+		self.status_bar.set_status("❌ 计算已取消")
+	
+	def _calculation_failed (self, message):
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		QMessageBox.critical(self, "计算主流程出错", f"发生严重错误: {message}")
+		self.status_bar.set_status("❌ 计算失败")
+	
 	def build_composition_with_addition (self, base_comp_dict, addition_elem, addition_conc):
 		"""构建添加元素后的组成（基体按比例缩减）"""
-		try:
-			if addition_conc >= 1.0:
-				return None
-			
-			# 基体缩减系数
-			base_scale_factor = 1.0 - addition_conc
-			
-			# 构建新组成
-			new_comp = {}
-			
-			# 基体元素按比例缩减
-			for elem, orig_frac in base_comp_dict.items():
-				new_comp[elem] = orig_frac * base_scale_factor
-			
-			# 添加新元素
-			new_comp[addition_elem] = addition_conc
-			
-			# 验证总和
-			total = sum(new_comp.values())
-			if abs(total - 1.0) > 1e-6:
-				print(f"警告：组成总和不为1: {total}")
-				return None
-			
-			return new_comp
-		
-		except Exception as e:
-			print(f"构建添加组成时出错: {e}")
-			return None
+		return composition_with_addition(base_comp_dict, addition_elem, addition_conc)
 	
 	def update_plot_display_only (self):
 		"""更新图表显示"""
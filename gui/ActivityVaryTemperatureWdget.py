@@ -15,7 +15,9 @@ from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as Navigatio
 from matplotlib.figure import Figure
 
 from calculations.activity_calculator import ActivityCoefficient
+from calculations.sweep import SweepResult, SweepSpec, iter_sweep
 from core.utils import *
+from gui.sweep_worker import start_sweep, sweep_running
 from models.extrapolation_models import BinaryModel
 
 # Matplotlib 全局设置
@@ -933,6 +935,11 @@ class ActivityTemperatureVariationWidget(QWidget):
 	
 	def run_calculation_thread (self):
 		"""运行计算线程"""
+		# 取消后进度对话框已关闭，但后台计算要到当前计算点结束才停止
+		if sweep_running(self):
+			QMessageBox.information(self, "计算进行中", "上一次计算仍在进行，请等待其结束后再开始新的计算。")
+			return
+		
 		# 验证输入
 		if not self.matrix_input.text().strip():
 			QMessageBox.warning(self, "输入缺失", "请输入合金组成。")
@@ -960,21 +967,12 @@ class ActivityTemperatureVariationWidget(QWidget):
 		
 		self.status_bar.set_status("正在计算...")
 		self.calculate_all_properties()
-		
-		if hasattr(self, 'progress_dialog') and self.progress_dialog:
-			self.progress_dialog.close()
 	
 	def calculate_all_properties (self):
 		"""计算所有属性 - Elliott原始值和Darken修正值"""
+		started = False
 		try:
 			self.has_calculated = False
-			# 重置所有数据结构
-			self.calculation_results = {
-				"activity": {},
-				"activity_coefficient": {},
-				"activity_darken": {},
-				"activity_coefficient_darken": {}
-			}
 			
 			# 获取参数
 			base_matrix_str = self.matrix_input.text().strip()
@@ -1035,179 +1033,215 @@ class ActivityTemperatureVariationWidget(QWidget):
 			new_results_html += f"相态: {phase}, 温度: {min_t}K - {max_t}K (步长 {step_t}K)<br>"
 			new_results_html += f"外推模型: {', '.join(self.current_parameters['selected_models'])}<br><hr>"
 			
-			# 设置进度条
 			total_calcs = len(selected_extra_models_to_run) * len(temperatures)
-			if hasattr(self, 'progress_dialog'):
-				self.progress_dialog.setRange(0, total_calcs)
-			calcs_done = 0
 			
-			# 执行计算
-			for model_key_extra, extra_model_function in selected_extra_models_to_run:
-				current_activities = []
-				current_coefficients = []
-				current_activities_darken = []
-				current_coefficients_darken = []
+			# 在后台线程中逐点计算，计算过程中不访问界面控件
+			def sweep (worker):
+				nonlocal new_results_html
+				# 结果在后台线程中局部整理，结束后随 finished 交给界面线程
+				calculation_results = {
+					"activity": {},
+					"activity_coefficient": {},
+					"activity_darken": {},
+					"activity_coefficient_darken": {}
+				}
+				# 由 calculations.sweep 计算全部 (模型 × 温度点)，这里只整理结果
+				spec = SweepSpec(comp_dict_main, solvent_elem, solute_elem, "temperature", temperatures,
+				                 [mk for mk, _ in selected_extra_models_to_run], ("Elliott", "Darken"),
+				                 state=phase, full_alloy_str=base_matrix_str)
+				sweep_result = SweepResult(spec)
+				chunks = iter_sweep(spec)
+				for model_key, indices, values, errors in chunks:
+					sweep_result.add(model_key, indices, values, errors)
+					for i in indices:
+						yield model_key, temperatures[i]
+					if worker.is_cancelled():
+						chunks.close()
+						break
 				
-				new_results_html += f"<br><b>⚙️ 外推模型: {model_key_extra}</b><br>"
-				new_results_html += f"<font face='Courier New' color='#2C3E50'><b>Temp(K)  | Darken-Act | Darken-γ  | Elliott-Act | Elliott-γ  | Δa(%)  | Δγ(%)</b></font><br>"
-				new_results_html += f"<font face='Courier New'>---------|------------|-----------|-------------|-----------|--------|------</font><br>"
+				# 整理结果
+				for model_key_extra, extra_model_function in selected_extra_models_to_run:
+					current_activities = []
+					current_coefficients = []
+					current_activities_darken = []
+					current_coefficients_darken = []
 				
-				for temp_k in temperatures:
-					if hasattr(self, 'progress_dialog') and self.progress_dialog.wasCanceled():
-						new_results_html += "❌ 计算已取消<br>"
-						break
-					
-					comp_for_calc = comp_dict_main.copy()
-					xi_solute = comp_for_calc.get(solute_elem, 0.0)
+					new_results_html += f"<br><b>⚙️ 外推模型: {model_key_extra}</b><br>"
+					new_results_html += f"<font face='Courier New' color='#2C3E50'><b>Temp(K)  | Darken-Act | Darken-γ  | Elliott-Act | Elliott-γ  | Δa(%)  | Δγ(%)</b></font><br>"
+					new_results_html += f"<font face='Courier New'>---------|------------|-----------|-------------|-----------|--------|------</font><br>"
+				
+					xi_solute = comp_dict_main.get(solute_elem, 0.0)
+					for i, temp_k in enumerate(temperatures):
+						if not sweep_result.is_done(model_key_extra, i):
+							new_results_html += "❌ 计算已取消<br>"
+							break
 					
-					try:
-						temp_k = float(temp_k)
-						# 计算Elliott原始方法
-						
-						ln_gamma_elliott = self.activity_calc_module.get_ln_gamma(comp_for_calc, solute_elem,
-						                                                          solvent_elem, temp_k, phase,
-						                                                          extra_model_function, model_key_extra,
-						                                                          activity_model='Elliott',
-						                                                          full_alloy_str=base_matrix_str)
-						gamma_elliott = math.exp(ln_gamma_elliott) if not (
-								math.isnan(ln_gamma_elliott) or math.isinf(ln_gamma_elliott)) else float('nan')
-						act_elliott = gamma_elliott * xi_solute if not math.isnan(gamma_elliott) else float('nan')
+						try:
+							temp_k = float(temp_k)
+							ln_gamma_elliott = sweep_result.ln_gamma(model_key_extra, i, 'Elliott')
+							ln_gamma_darken = sweep_result.ln_gamma(model_key_extra, i, 'Darken')
+							# Elliott原始方法
+							gamma_elliott = math.exp(ln_gamma_elliott) if not (
+									math.isnan(ln_gamma_elliott) or math.isinf(ln_gamma_elliott)) else float('nan')
+							act_elliott = gamma_elliott * xi_solute if not math.isnan(gamma_elliott) else float('nan')
 						
-						# 计算Darken修正方法
-						ln_gamma_darken = self.activity_calc_module.get_ln_gamma(comp_for_calc, solute_elem,
-						                                                                solvent_elem, float(temp_k),
-						                                                                phase, extra_model_function,
-						                                                                model_key_extra,
-						                                                                activity_model='Darken',
-						                                                                full_alloy_str=base_matrix_str)
-						gamma_darken = math.exp(ln_gamma_darken) if not (
-								math.isnan(ln_gamma_darken) or math.isinf(ln_gamma_darken)) else float('nan')
-						act_darken = gamma_darken * xi_solute if not math.isnan(gamma_darken) else float('nan')
+							# Darken修正方法
+							gamma_darken = math.exp(ln_gamma_darken) if not (
+									math.isnan(ln_gamma_darken) or math.isinf(ln_gamma_darken)) else float('nan')
+							act_darken = gamma_darken * xi_solute if not math.isnan(gamma_darken) else float('nan')
 						
-						# 计算相对差异百分比
-						if not (math.isnan(act_elliott) or math.isnan(act_darken)) and abs(act_darken) > 1e-10:
-							delta_act_percent = abs((act_elliott - act_darken) / act_darken) * 100
-						else:
-							delta_act_percent = float('nan')
+							# 计算相对差异百分比
+							if not (math.isnan(act_elliott) or math.isnan(act_darken)) and abs(act_darken) > 1e-10:
+								delta_act_percent = abs((act_elliott - act_darken) / act_darken) * 100
+							else:
+								delta_act_percent = float('nan')
 						
-						if not (math.isnan(gamma_elliott) or math.isnan(gamma_darken)) and abs(gamma_darken) > 1e-10:
-							delta_gamma_percent = abs((gamma_elliott - gamma_darken) / gamma_darken) * 100
-						else:
-							delta_gamma_percent = float('nan')
+							if not (math.isnan(gamma_elliott) or math.isnan(gamma_darken)) and abs(gamma_darken) > 1e-10:
+								delta_gamma_percent = abs((gamma_elliott - gamma_darken) / gamma_darken) * 100
+							else:
+								delta_gamma_percent = float('nan')
 						
-						# 存储数据
-						current_activities.append(act_elliott)
-						current_coefficients.append(gamma_elliott)
-						current_activities_darken.append(act_darken)
-						current_coefficients_darken.append(gamma_darken)
+							# 存储数据
+							current_activities.append(act_elliott)
+							current_coefficients.append(gamma_elliott)
+							current_activities_darken.append(act_darken)
+							current_coefficients_darken.append(gamma_darken)
 						
-						# 格式化差异显示 - 带颜色标识 (现在以Darken为基准)
-						delta_act_str = f"{delta_act_percent:6.2f}" if not math.isnan(delta_act_percent) else "  N/A"
-						delta_gamma_str = f"{delta_gamma_percent:6.2f}" if not math.isnan(
-								delta_gamma_percent) else "  N/A"
+							# 格式化差异显示 - 带颜色标识 (现在以Darken为基准)
+							delta_act_str = f"{delta_act_percent:6.2f}" if not math.isnan(delta_act_percent) else "  N/A"
+							delta_gamma_str = f"{delta_gamma_percent:6.2f}" if not math.isnan(
+									delta_gamma_percent) else "  N/A"
 						
-						# 根据差异大小设置颜色
-						if not math.isnan(delta_act_percent) and delta_act_percent > 5:
-							delta_act_color = "#E74C3C"  # 红色：差异大
-						elif not math.isnan(delta_act_percent) and delta_act_percent > 1:
-							delta_act_color = "#F39C12"  # 橙色：差异中等
-						else:
-							delta_act_color = "#27AE60"  # 绿色：差异小
+							# 根据差异大小设置颜色
+							if not math.isnan(delta_act_percent) and delta_act_percent > 5:
+								delta_act_color = "#E74C3C"  # 红色：差异大
+							elif not math.isnan(delta_act_percent) and delta_act_percent > 1:
+								delta_act_color = "#F39C12"  # 橙色：差异中等
+							else:
+								delta_act_color = "#27AE60"  # 绿色：差异小
 						
-						if not math.isnan(delta_gamma_percent) and delta_gamma_percent > 5:
-							delta_gamma_color = "#E74C3C"
-						elif not math.isnan(delta_gamma_percent) and delta_gamma_percent > 1:
-							delta_gamma_color = "#F39C12"
-						else:
-							delta_gamma_color = "#27AE60"
+							if not math.isnan(delta_gamma_percent) and delta_gamma_percent > 5:
+								delta_gamma_color = "#E74C3C"
+							elif not math.isnan(delta_gamma_percent) and delta_gamma_percent > 1:
+								delta_gamma_color = "#F39C12"
+							else:
+								delta_gamma_color = "#27AE60"
 						
-						# 调整显示顺序：Darken在前，Elliott在后
-						new_results_html += (
-							f"<font face='Courier New'>{temp_k:<9.1f}| {act_darken:<11.4f}| {gamma_darken:<10.4f}| "
-							f"{act_elliott:<12.4f}| {gamma_elliott:<10.4f}| "
-							f"<font color='{delta_act_color}'>{delta_act_str}</font>| "
-							f"<font color='{delta_gamma_color}'>{delta_gamma_str}</font></font><br>"
-						)
+							# 调整显示顺序：Darken在前，Elliott在后
+							new_results_html += (
+								f"<font face='Courier New'>{temp_k:<9.1f}| {act_darken:<11.4f}| {gamma_darken:<10.4f}| "
+								f"{act_elliott:<12.4f}| {gamma_elliott:<10.4f}| "
+								f"<font color='{delta_act_color}'>{delta_act_str}</font>| "
+								f"<font color='{delta_gamma_color}'>{delta_gamma_str}</font></font><br>"
+							)
 					
-					except Exception as e_calc:
-						print(f"计算错误 (T={temp_k}K, 模型={model_key_extra}): {e_calc}")
-						current_activities.append(float('nan'))
-						current_coefficients.append(float('nan'))
-						current_activities_darken.append(float('nan'))
-						current_coefficients_darken.append(float('nan'))
+						except Exception as e_calc:
+							print(f"计算错误 (T={temp_k}K, 模型={model_key_extra}): {e_calc}")
+							current_activities.append(float('nan'))
+							current_coefficients.append(float('nan'))
+							current_activities_darken.append(float('nan'))
+							current_coefficients_darken.append(float('nan'))
 						
-						new_results_html += f"<font face='Courier New'>{temp_k:<9.1f}|     N/A    |    N/A    |      N/A    |    N/A    |  N/A   |  N/A</font><br>"
-					
-					calcs_done += 1
-					if hasattr(self, 'progress_dialog'):
-						self.progress_dialog.setValue(calcs_done)
-						QApplication.processEvents()
+							new_results_html += f"<font face='Courier New'>{temp_k:<9.1f}|     N/A    |    N/A    |      N/A    |    N/A    |  N/A   |  N/A</font><br>"
 				
-				if hasattr(self, 'progress_dialog') and self.progress_dialog.wasCanceled():
-					break
+					if worker.is_cancelled():
+						break
 				
-				# 存储所有结果
-				self.calculation_results["activity"][model_key_extra] = {
-					"temperatures": temperatures.copy(),
-					"values": np.array(current_activities)
-				}
-				self.calculation_results["activity_coefficient"][model_key_extra] = {
-					"temperatures": temperatures.copy(),
-					"values": np.array(current_coefficients)
-				}
-				self.calculation_results["activity_darken"][model_key_extra] = {
-					"temperatures": temperatures.copy(),
-					"values": np.array(current_activities_darken)
-				}
-				self.calculation_results["activity_coefficient_darken"][model_key_extra] = {
-					"temperatures": temperatures.copy(),
-					"values": np.array(current_coefficients_darken)
-				}
+					# 存储所有结果
+					calculation_results["activity"][model_key_extra] = {
+						"temperatures": temperatures.copy(),
+						"values": np.array(current_activities)
+					}
+					calculation_results["activity_coefficient"][model_key_extra] = {
+						"temperatures": temperatures.copy(),
+						"values": np.array(current_coefficients)
+					}
+					calculation_results["activity_darken"][model_key_extra] = {
+						"temperatures": temperatures.copy(),
+						"values": np.array(current_activities_darken)
+					}
+					calculation_results["activity_coefficient_darken"][model_key_extra] = {
+						"temperatures": temperatures.copy(),
+						"values": np.array(current_coefficients_darken)
+					}
 				
-				# 添加统计对比信息 (以Darken为基准)
-				if len(current_activities) > 0 and len(current_activities_darken) > 0:
-					valid_elliott_act = [x for x in current_activities if not math.isnan(x)]
-					valid_darken_act = [x for x in current_activities_darken if not math.isnan(x)]
-					valid_elliott_gamma = [x for x in current_coefficients if not math.isnan(x)]
-					valid_darken_gamma = [x for x in current_coefficients_darken if not math.isnan(x)]
+					# 添加统计对比信息 (以Darken为基准)
+					if len(current_activities) > 0 and len(current_activities_darken) > 0:
+						valid_elliott_act = [x for x in current_activities if not math.isnan(x)]
+						valid_darken_act = [x for x in current_activities_darken if not math.isnan(x)]
+						valid_elliott_gamma = [x for x in current_coefficients if not math.isnan(x)]
+						valid_darken_gamma = [x for x in current_coefficients_darken if not math.isnan(x)]
 					
-					if valid_elliott_act and valid_darken_act and len(valid_elliott_act) == len(valid_darken_act):
-						avg_diff_act = np.mean(
-								[abs((e - d) / d) * 100 for d, e in zip(valid_darken_act, valid_elliott_act) if
-								 abs(d) > 1e-10])
-						max_diff_act = np.max(
-								[abs((e - d) / d) * 100 for d, e in zip(valid_darken_act, valid_elliott_act) if
-								 abs(d) > 1e-10])
-						
-						if valid_elliott_gamma and valid_darken_gamma and len(valid_elliott_gamma) == len(
-								valid_darken_gamma):
-							avg_diff_gamma = np.mean(
-									[abs((e - d) / d) * 100 for d, e in zip(valid_darken_gamma, valid_elliott_gamma) if
+						if valid_elliott_act and valid_darken_act and len(valid_elliott_act) == len(valid_darken_act):
+							avg_diff_act = np.mean(
+									[abs((e - d) / d) * 100 for d, e in zip(valid_darken_act, valid_elliott_act) if
 									 abs(d) > 1e-10])
-							max_diff_gamma = np.max(
-									[abs((e - d) / d) * 100 for d, e in zip(valid_darken_gamma, valid_elliott_gamma) if
+							max_diff_act = np.max(
+									[abs((e - d) / d) * 100 for d, e in zip(valid_darken_act, valid_elliott_act) if
 									 abs(d) > 1e-10])
+						
+							if valid_elliott_gamma and valid_darken_gamma and len(valid_elliott_gamma) == len(
+									valid_darken_gamma):
+								avg_diff_gamma = np.mean(
+										[abs((e - d) / d) * 100 for d, e in zip(valid_darken_gamma, valid_elliott_gamma) if
+										 abs(d) > 1e-10])
+								max_diff_gamma = np.max(
+										[abs((e - d) / d) * 100 for d, e in zip(valid_darken_gamma, valid_elliott_gamma) if
+										 abs(d) > 1e-10])
 							
-							new_results_html += f"<br><b>📊 模型 {model_key_extra} 对比统计 (以Darken为基准):</b><br>"
-							new_results_html += f"<font color='#2980B9'>活度 - Elliott与Darken平均差异: {avg_diff_act:.2f}%, 最大差异: {max_diff_act:.2f}%</font><br>"
-							new_results_html += f"<font color='#8E44AD'>活度系数 - Elliott与Darken平均差异: {avg_diff_gamma:.2f}%, 最大差异: {max_diff_gamma:.2f}%</font><br>"
+								new_results_html += f"<br><b>📊 模型 {model_key_extra} 对比统计 (以Darken为基准):</b><br>"
+								new_results_html += f"<font color='#2980B9'>活度 - Elliott与Darken平均差异: {avg_diff_act:.2f}%, 最大差异: {max_diff_act:.2f}%</font><br>"
+								new_results_html += f"<font color='#8E44AD'>活度系数 - Elliott与Darken平均差异: {avg_diff_gamma:.2f}%, 最大差异: {max_diff_gamma:.2f}%</font><br>"
+				
+				return new_results_html, calculation_results
 			
-			# 更新界面
-			self.historical_results_html = new_results_html + self.historical_results_html
-			if hasattr(self, 'results_text_right'):
-				self.results_text_right.setHtml(self.historical_results_html)
-			self.update_results_stats()
-			self.has_calculated = True
-			self.update_plot_display_only()
-			self.status_bar.set_status("✅ 计算完成")
+			start_sweep(self, sweep, total_calcs, getattr(self, 'progress_dialog', None),
+			            self._finish_calculation, self._calculation_failed,
+			            on_cancelled=self._calculation_cancelled)
+			started = True
 		
 		except Exception as e_outer:
 			QMessageBox.critical(self, "计算主流程出错", f"发生严重错误: {str(e_outer)}\n{traceback.format_exc()}")
 			self.status_bar.set_status("❌ 计算失败")
 		finally:
-			if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			if not started and hasattr(self, 'progress_dialog') and self.progress_dialog:
 				self.progress_dialog.close()
 	
+	def _finish_calculation (self, result):
+		"""后台计算结束后在界面线程中接收结果 (HTML, 计算结果字典)，更新结果与图表。"""
+		new_results_html, self.calculation_results = result
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		
+		# 更新界面
+		self.historical_results_html = new_results_html + self.historical_results_html
+		if hasattr(self, 'results_text_right'):
+			self.results_text_right.setHtml(self.historical_results_html)
+		self.update_results_stats()
+		self.has_calculated = True
+		self.update_plot_display_only()
+		self.status_bar.set_status("✅ 计算完成")
+	
+	def _calculation_cancelled (self, result):
+		"""计算被取消：只记录已输出的文本，保留上一次的计算结果与图表。"""
+		new_results_html, _ = result
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		
+		self.historical_results_html = new_results_html + self.historical_results_html
+		if hasattr(self, 'results_text_right'):
+			self.results_text_right.setHtml(self.historical_results_html)
+		self.update_results_stats()
+		self.has_calculated = any(self.calculation_results.values())
+		self.update_plot_display_only()
+		self.status_bar.set_status("❌ 计算已取消")
+	
+	def _calculation_failed (self, message):
+		if hasattr(self, 'progress_dialog') and self.progress_dialog:
+			self.progress_dialog.close()
+		QMessageBox.critical(self, "计算主流程出错", f"发生严重错误: {message}")
+		self.status_bar.set_status("❌ 计算失败")
+	
 	def on_display_mode_changed (self):
 		"""显示模式改变时的处理函数"""
 		if hasattr(self, 'has_calculated') and self.has_calculated:
@@ -19,13 +19,14 @@ matplotlib.rcParams['mathtext.default'] = 'regular'
 # Import PyQt5 modules
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QTabWidget, QMessageBox,
-                             QStatusBar, QAction, QSystemTrayIcon, QMenu)
+                             QStatusBar, QAction, QSystemTrayIcon, QMenu, QFileDialog)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QGuiApplication, QIcon
 
 # 导入计算模块
 from models.extrapolation_models import BinaryModel
 from calculations.activity_calculator import ActivityCoefficient
+from utils.DataLogger import default_contribution_log_path, export_contribution_logs
 
 # 导入新的界面组件
 from gui.ActivityVaryTemperatureWdget import ActivityTemperatureVariationWidget
@@ -137,6 +138,10 @@ class AlloyActProGUI(QMainWindow):
 		
 		tools_menu.addSeparator()
 		
+		export_log_action = QAction('导出贡献系数日志(&L)...', self)
+		export_log_action.triggered.connect(self.export_contribution_logs)
+		tools_menu.addAction(export_log_action)
+		
 		
 		
 		
@@ -286,6 +291,24 @@ class AlloyActProGUI(QMainWindow):
 		
 		self.conversion_window.show()
 		self.conversion_window.activateWindow()
+	
+	def export_contribution_logs (self):
+		"""将贡献系数日志库导出为每个合金体系、外推模型一个的 Log_<体系>_<模型>.txt 文本文件"""
+		default_dir = os.path.dirname(default_contribution_log_path())
+		directory = QFileDialog.getExistingDirectory(self, "选择日志导出目录", default_dir)
+		if not directory:
+			return
+		try:
+			paths = export_contribution_logs(directory)
+		except Exception as e:
+			QMessageBox.critical(self, "导出失败", f"导出贡献系数日志时出错: {e}")
+			self.update_status("贡献系数日志导出失败")
+			return
+		if not paths:
+			QMessageBox.information(self, "导出贡献系数日志", "日志库中还没有贡献系数记录。")
+			return
+		QMessageBox.information(self, "导出贡献系数日志", f"已导出 {len(paths)} 个日志文件至:\n{directory}")
+		self.update_status(f"已导出 {len(paths)} 个贡献系数日志文件")
 	def set_global_styles (self):
 		"""设置全局样式"""
 		self.setStyleSheet("""
@@ -10,6 +10,12 @@ from PyQt5.QtWidgets import (QWidget, QSplitter, QVBoxLayout, QGroupBox, QGridLa
                              QApplication, QMainWindow, QProgressBar, QTextEdit, QDialog,
                              QDialogButtonBox)
 
+from calculations.sweep import clear_sweep_contexts, shutdown_executor
+from core.database_handler import get_interaction_index
+from core.element import ElementRegistry
+from models.integral_cache import get_integral_cache
+from models.model_kernels import clear_parameter_caches
+
 # 尝试导入pycalphad，如果失败则TDB功能不可用
 try:
 	from pycalphad import Database
@@ -128,6 +134,16 @@ class SqlExecutorDialog(QDialog):
 				self.result_output_text.setStyleSheet("color: red;")
 
 
+def _invalidate_parameter_caches ():
+	"""数据库内容被修改后，清空计算模块中缓存的参数，下次计算时重新载入。"""
+	ElementRegistry.clear()
+	get_interaction_index().invalidate()
+	get_integral_cache().clear()
+	clear_parameter_caches()
+	shutdown_executor()
+	clear_sweep_contexts()
+
+
 # === 数据连接与操作核心类 (增加 execute_script 方法) ===
 class DatabaseConnector:
 	"""
@@ -167,6 +183,7 @@ class DatabaseConnector:
 		try:
 			cursor = self.conn.cursor()
 			cursor.executescript(script)
+			_invalidate_parameter_caches()
 		# self.conn.commit() # isolation_level=None时, executescript会自动处理事务
 		except Exception as e:
 			# self.conn.rollback() # 事务失败会自动回滚
@@ -249,6 +266,7 @@ class DatabaseConnector:
 			cursor = self.conn.cursor()
 			cursor.execute(query, tuple(values))
 			self.conn.commit()
+			_invalidate_parameter_caches()
 		except Exception as e:
 			self.conn.rollback()
 			raise e
@@ -265,6 +283,7 @@ class DatabaseConnector:
 			cursor = self.conn.cursor()
 			cursor.execute(query, tuple(data.values()))
 			self.conn.commit()
+			_invalidate_parameter_caches()
 		except Exception as e:
 			self.conn.rollback()
 			raise e
@@ -279,6 +298,7 @@ class DatabaseConnector:
 			cursor = self.conn.cursor()
 			cursor.execute(query, (primary_key_value,))
 			self.conn.commit()
+			_invalidate_parameter_caches()
 		except Exception as e:
 			self.conn.rollback()
 			raise e
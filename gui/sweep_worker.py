@@ -0,0 +1,118 @@
+import threading
+import traceback
+
+from PyQt5.QtCore import QObject, QThread, Qt, pyqtSignal
+
+
+class SweepWorker(QObject):
+	"""在后台线程中执行扫描计算。
+
+	job(worker) 为生成器函数：每完成一个计算点 yield 一次 (yield 的值通过 point_finished 发出)，
+	结束时 return 的结果通过 finished 发出。job 不能访问任何界面控件；
+	每个计算点之间应检查 worker.is_cancelled()，被取消时提前结束，已有结果通过 cancelled 发出。
+	"""
+
+	progress = pyqtSignal(int, int)  # 已完成点数, 总点数
+	point_finished = pyqtSignal(object)
+	finished = pyqtSignal(object)
+	cancelled = pyqtSignal(object)
+	failed = pyqtSignal(str)
+
+	def __init__ (self, job, total: int):
+		super().__init__()
+		self._job = job
+		self._total = total
+		self._cancel_event = threading.Event()
+
+	def cancel (self):
+		"""请求取消，job 在下一个计算点之前结束。可在任意线程中调用。"""
+		self._cancel_event.set()
+
+	def is_cancelled (self) -> bool:
+		return self._cancel_event.is_set()
+
+	def run (self):
+		try:
+			generator = self._job(self)
+			done = 0
+			while True:
+				try:
+					point = next(generator)
+				except StopIteration as stop:
+					result = stop.value
+					break
+				done += 1
+				self.progress.emit(done, self._total)
+				if point is not None:
+					self.point_finished.emit(point)
+		except Exception as e:
+			print(f"后台计算出错: {e}")
+			self.failed.emit(f"{e}\n{traceback.format_exc()}")
+			return
+		if self.is_cancelled():
+			self.cancelled.emit(result)
+		else:
+			self.finished.emit(result)
+
+
+def sweep_running (owner) -> bool:
+	"""owner 上由 start_sweep 启动的扫描是否仍在运行。"""
+	thread = getattr(owner, '_sweep_thread', None)
+	return thread is not None and thread.isRunning()
+
+
+def start_sweep (owner, job, total: int, progress_dialog=None, on_finished=None, on_failed=None,
+                 on_point=None, on_cancelled=None) -> SweepWorker:
+	"""
+	在新的 QThread 中运行扫描，界面线程不被阻塞。
+
+	参数:
+	owner: 发起计算的窗口，线程与 worker 的引用保存在 owner 上，防止被回收；
+	       同一窗口上一次扫描未结束时不能开始新的扫描 (见 sweep_running)。
+	job: 扫描生成器函数，见 SweepWorker。
+	total: 计算点总数，用于进度显示。
+	progress_dialog: 进度对话框 (可选)，显示逐点进度，点击“取消”时请求取消。
+	on_finished(result), on_failed(message), on_point(point): 在界面线程中调用的回调 (可选)。
+	on_cancelled(result): 扫描被取消时代替 on_finished 调用，result 为取消前的部分结果 (可选)。
+
+	返回:
+	SweepWorker: 已启动的 worker。
+	"""
+	if sweep_running(owner):
+		raise RuntimeError("上一次计算仍在进行，请等待其结束后再开始新的计算。")
+	thread = QThread(owner)
+	worker = SweepWorker(job, total)
+	worker.moveToThread(thread)
+
+	thread.started.connect(worker.run)
+	worker.finished.connect(thread.quit)
+	worker.cancelled.connect(thread.quit)
+	worker.failed.connect(thread.quit)
+	thread.finished.connect(worker.deleteLater)
+	thread.finished.connect(thread.deleteLater)
+
+	if progress_dialog is not None:
+		progress_dialog.setRange(0, total)
+		worker.progress.connect(lambda done, _total: progress_dialog.setValue(done))
+		# worker 所在线程正忙于计算，取消请求必须直接调用
+		progress_dialog.canceled.connect(worker.cancel, Qt.DirectConnection)
+	if on_point is not None:
+		worker.point_finished.connect(on_point)
+	if on_finished is not None:
+		worker.finished.connect(on_finished)
+	if on_failed is not None:
+		worker.failed.connect(on_failed)
+	if on_cancelled is not None:
+		worker.cancelled.connect(on_cancelled)
+
+	def release ():
+		# 线程对象随后被 deleteLater 回收，只清除仍指向本次扫描的引用
+		if getattr(owner, '_sweep_thread', None) is thread:
+			owner._sweep_thread = None
+			owner._sweep_worker = None
+
+	thread.finished.connect(release)
+	owner._sweep_thread = thread
+	owner._sweep_worker = worker
+	thread.start()
+	return worker
@@ -1,11 +1,12 @@
 # ternary_model.py
-import os
-from typing import Callable
+from typing import Callable, Sequence
+
+import numpy as np
 
 from core.constants import Constants
 from core.element import Element
-from core.utils import entropy_judge, get_canonical_alloy_name
-from utils.DataLogger import log_contribution_coefficients
+from core.utils import entropy_judge
+from utils.DataLogger import is_logging_enabled, queue_contribution_coefficients
 from .extrapolation_models import BinaryModel
 
 extrap_func = Callable[[str, str, str, float, str], float]
@@ -18,6 +19,8 @@ class TernaryMelts:
         self._entropy = is_se
         self._cp = False
         self._condition = (is_se, self._cp)
+        # (外推模型, T, 相态) -> (元素序号, α 张量, 计算失败的三元组)
+        self._contribution_tables = {}
     
     def set_temperature (self, temp):
         self._temperature = temp
@@ -28,6 +31,60 @@ class TernaryMelts:
     def set_state (self, state):
         self._state = state
     
+    def contribution_tensor (self, elements: Sequence[str], Tem: float, state: str, extra_model: extrap_func):
+        """
+        一次计算合金中所有有序三元组的贡献系数 α(k, i, j) = extra_model(k, i, j, T, state)。
+
+        结果按 (外推模型, T, 相态) 保存在本实例中，之后 ε、ρ 的计算直接查表，
+        不再重复调用外推模型。
+
+        参数:
+        elements: 合金中的元素符号 (含溶剂)。
+        Tem, state: 温度 (K) 与相态。
+        extra_model: 外推模型函数；带有 contribution_tensor(elements, T, state) 属性时直接由它整体计算。
+
+        返回:
+        np.ndarray: 形状为 (N, N, N) 的张量，下标顺序与 elements 一致。
+        """
+        names = list(dict.fromkeys(elements))
+        key = (extra_model, Tem, state)
+        table = self._contribution_tables.get(key)
+        if table is not None and all(name in table[0] for name in names):
+            index, tensor, _ = table
+            order = [index[name] for name in names]
+            return tensor[np.ix_(order, order, order)]
+        
+        n = len(names)
+        failed = set()
+        vectorized = getattr(extra_model, "contribution_tensor", None)
+        if vectorized is not None:
+            # 外推模型提供整体计算全部三元组的形式 (如 model_kernels.UEM1)
+            tensor = np.array(vectorized(names, Tem, state), dtype=float)
+            self._contribution_tables[key] = ({name: a for a, name in enumerate(names)}, tensor, failed)
+            return tensor
+
+        tensor = np.empty((n, n, n))
+        for a, k in enumerate(names):
+            for b, i in enumerate(names):
+                for c, j in enumerate(names):
+                    try:
+                        tensor[a, b, c] = self.contribution_coefficient(k, i, j, Tem, state, extra_model)
+                    except Exception:
+                        # 查表时重新调用外推模型，原样抛出异常
+                        tensor[a, b, c] = np.nan
+                        failed.add((k, i, j))
+        self._contribution_tables[key] = ({name: a for a, name in enumerate(names)}, tensor, failed)
+        return tensor
+    
+    def contribution_coefficient (self, k: str, i: str, j: str, Tem: float, state: str, extra_model: extrap_func):
+        """返回贡献系数 α(k, i, j)；已由 contribution_tensor 计算过的直接查表。"""
+        table = self._contribution_tables.get((extra_model, Tem, state))
+        if table is not None:
+            index, tensor, failed = table
+            if k in index and i in index and j in index and (k, i, j) not in failed:
+                return float(tensor[index[k], index[i], index[j]])
+        return extra_model(k, i, j, Tem, state)
+    
     def fab_pure (self, ei, ej, s=False):
         """Calculate pure Fab without entropy term"""
         alpha = 0.73 if self._state == "liquid" else 1.0
@@ -105,6 +162,31 @@ class TernaryMelts:
         
         return dfx*fij
     
+    def _first_derivative_qx_array (self, pi, pj, xi, temperature=None):
+        """first_derivative_qx 的数组形式，pi、pj 为可相互广播的元素属性数组，temperature 可为温度数组。"""
+        fij = self._fab_matrix(pi, pj, self._entropy_mask(pi, pj), temperature)
+        
+        vi = pi["v"]
+        vj = pj["v"]
+        ui = pi["u"]
+        uj = pj["u"]
+        delta_phi = pi["phi"] - pj["phi"]
+        
+        ax = vi * (1 + ui * delta_phi * (1 - xi)*vj/(xi*vi+(1-xi)*vj))
+        bx = vj * (1 - uj * delta_phi * xi*vi/(xi*vi+(1-xi)*vj))
+        dx = xi * ax + (1 - xi) * bx
+        nx = ax * bx
+        
+        dax = ui * delta_phi * vi*(-vj*(xi*vi+(1-xi)*vj)-(1-xi)*vj*(vi-vj))/((xi*vi+(1-xi)*vj)**2)
+        dbx = -uj * delta_phi * vj*(vi*(xi*vi+(1-xi)*vj)-xi*vi*(vi-vj))/((xi*vi+(1-xi)*vj)**2)
+        
+        ddx = ax + xi * dax - bx + (1 - xi) * dbx
+        dnx = dax * bx + ax * dbx
+        
+        dfx = (dnx * dx - ddx * nx) / (dx * dx)
+        
+        return dfx*fij, (xi*vi+(1-xi)*vj == 0) | (dx == 0)
+    
     def second_derivative_q0 (self, i_element: Element, j_element: Element, xi=0):
         """Calculate second derivative of Q(x) at x=0"""
         fij = self.fab_func_contain_s(i_element, j_element, entropy_judge(i_element.name, j_element.name))
@@ -122,6 +204,21 @@ class TernaryMelts:
         
         return dd_f
     
+    def _second_derivative_q0_array (self, pi, pj, temperature=None):
+        """second_derivative_q0 的数组形式。"""
+        fij = self._fab_matrix(pi, pj, self._entropy_mask(pi, pj), temperature)
+        
+        vi = pi["v"]
+        vj = pj["v"]
+        ui = pi["u"]
+        uj = pj["u"]
+        delta_phi = pi["phi"] - pj["phi"]
+        
+        dd_f = 2 * fij * vi ** 3 * (1 + 3 * ui * delta_phi + ui * ui * delta_phi ** 2 +
+                                    2 * uj * delta_phi + ui * uj * delta_phi * delta_phi) / (vj * vj)
+        
+        return dd_f
+    
     def ln_y0 (self, solvent:Element, solutei:Element):
         """Calculate ln(γ°i) = G^E_i/(RT)"""
         fik = self.fab_func_contain_s(solvent, solutei, entropy_judge(solvent.name, solutei.name))
@@ -171,12 +268,12 @@ class TernaryMelts:
         fjk = self.fab_func_contain_s(solv, soluj, entropy_yesornot)
         
         
-        aji_ik = extra_model(soluj.name, solui.name, solv.name, Tem, state)
-        ajk_ik = extra_model(soluj.name, solv.name, solui.name, Tem, state)
-        aij_jk = extra_model(solui.name, soluj.name, solv.name, Tem, state)
-        aki_ij = extra_model(solv.name, solui.name, soluj.name, Tem, state)
-        akj_ij = extra_model(solv.name, soluj.name, solui.name, Tem, state)
-        aik_jk = extra_model(solui.name, solv.name, soluj.name, Tem, state)
+        aji_ik = self.contribution_coefficient(soluj.name, solui.name, solv.name, Tem, state, extra_model)
+        ajk_ik = self.contribution_coefficient(soluj.name, solv.name, solui.name, Tem, state, extra_model)
+        aij_jk = self.contribution_coefficient(solui.name, soluj.name, solv.name, Tem, state, extra_model)
+        aki_ij = self.contribution_coefficient(solv.name, solui.name, soluj.name, Tem, state, extra_model)
+        akj_ij = self.contribution_coefficient(solv.name, soluj.name, solui.name, Tem, state, extra_model)
+        aik_jk = self.contribution_coefficient(solui.name, solv.name, soluj.name, Tem, state, extra_model)
         
         if aki_ij == 0 and akj_ij == 0:
             aki_ij = akj_ij = 0.5
@@ -200,6 +297,243 @@ class TernaryMelts:
         
         return 1000 * chemical_term / (Constants.R * Tem)
     
+    @staticmethod
+    def _element_arrays (elements: Sequence[Element]):
+        """将元素属性整理为 NumPy 数组，供矩阵形式的计算使用。"""
+        names = [e.name for e in elements]
+        return {
+            "n_ws": np.array([e.n_ws for e in elements], dtype=float),
+            "phi": np.array([e.phi for e in elements], dtype=float),
+            "v": np.array([e.v for e in elements], dtype=float),
+            "u": np.array([e.u for e in elements], dtype=float),
+            "tm": np.array([e.tm for e in elements], dtype=float),
+            "hybrid_factor": np.array([e.hybrid_factor for e in elements], dtype=object),
+            "hybrid_value": np.array([e.hybrid_value for e in elements], dtype=float),
+            "is_trans_group": np.array([e.is_trans_group for e in elements], dtype=bool),
+            "is_o": np.array([name == "O" for name in names]),
+            "is_hn": np.array([name in ("H", "N") for name in names]),
+            "is_non_metal": np.array([name in Constants.non_metal_list for name in names]),
+        }
+    
+    @staticmethod
+    def _entropy_mask (*props):
+        """entropy_judge 的数组形式：对可相互广播的属性数组逐元素判断是否计入过剩熵。"""
+        contains_o = False
+        non_metal = False
+        contains_hn = False
+        for p in props:
+            contains_o = contains_o | p["is_o"]
+            non_metal = non_metal | (p["is_non_metal"] & ~p["is_o"])
+            contains_hn = contains_hn | p["is_hn"]
+        return np.where(contains_o, non_metal, ~contains_hn)
+    
+    def _fab_matrix (self, pa, pb, s, temperature=None):
+        """
+        fab_func_contain_s 的数组形式：pa、pb 为可相互广播的属性数组，s 为是否计入过剩熵。
+        temperature 缺省为 self._temperature，也可以是能与属性数组广播的温度数组。
+        """
+        if temperature is None:
+            temperature = self._temperature
+        alpha = 0.73 if self._state == "liquid" else 1.0
+        avg_tm = 1.0 / pa["tm"] + 1.0 / pb["tm"]
+        factor = 14 if self._state == "liquid" else 15.1
+        entropy_term = np.where(s, 1.0 / factor * temperature * avg_tm, 0.0)
+        
+        # 两者杂化类型相同 (包括均为 "other") 时 rp 为 0
+        rp = np.where(pa["hybrid_factor"] == pb["hybrid_factor"], 0.0, pa["hybrid_value"] * pb["hybrid_value"])
+        both_trans = pa["is_trans_group"] & pb["is_trans_group"]
+        any_trans = pa["is_trans_group"] | pb["is_trans_group"]
+        pij = np.where(both_trans, Constants.P_TT, np.where(any_trans, Constants.P_TN, Constants.P_NN))
+        
+        fij = 2.0 * pij * (Constants.QtoP * (pa["n_ws"] - pb["n_ws"]) ** 2 - (pa["phi"] - pb["phi"]) ** 2 - alpha * rp) / \
+              (1.0 / pa["n_ws"] + 1.0 / pb["n_ws"])
+        return fij * (1 - entropy_term)
+    
+    @staticmethod
+    def _alpha_views (tensor, sol, idx):
+        """
+        从贡献系数张量中取出 ε、ρ 计算所需的各个切片 (m 为溶剂，a、b、c 为溶质)。
+        tensor 可带有前导的温度维，形状为 (..., K, K, K)。
+        """
+        order = np.concatenate(([sol], idx))
+        t = tensor[..., order, :, :][..., :, order, :][..., :, :, order]
+        return {
+            "alpha": t[..., 1:, 1:, 1:],  # α(a, b, c)
+            "am": t[..., 0, 1:, 1:],  # α(m, a, b)
+            "a_m": t[..., 1:, 1:, 0],  # α(a, b, m)
+            "a_m_": t[..., 1:, 0, 1:],  # α(a, m, b)
+        }
+    
+    def _first_order_core (self, ps, pe, views, Tem, temperature=None):
+        """
+        ε 矩阵的数组计算，views 来自 _alpha_views，Tem、temperature 可为 (M, 1, 1) 的温度数组。
+
+        返回:
+        (matrix, coefficients, invalid): ε 矩阵、用于日志的贡献系数、出现零除的位置。
+        """
+        pi = {key: value[:, None] for key, value in pe.items()}
+        pj = {key: value[None, :] for key, value in pe.items()}
+        swap = lambda a: np.swapaxes(a, -1, -2)
+        
+        aki_ij = views["am"]
+        akj_ij = swap(aki_ij)
+        aij_jk = views["a_m"]
+        aji_ik = swap(aij_jk)
+        aik_jk = views["a_m_"]
+        ajk_ik = swap(aik_jk)
+        
+        entropy_yesornot = self._entropy_mask(ps, pi, pj)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fij = self._fab_matrix(pi, pj, entropy_yesornot, temperature)
+            fik = self._fab_matrix(ps, pi, entropy_yesornot, temperature)
+            fjk = self._fab_matrix(ps, pj, entropy_yesornot, temperature)
+            
+            both_zero = (aki_ij == 0) & (akj_ij == 0)
+            aki_ij = np.where(both_zero, 0.5, aki_ij)
+            akj_ij = np.where(both_zero, 0.5, akj_ij)
+            
+            denominator = aki_ij * pi["v"] + akj_ij * pj["v"]
+            via = (1 + pi["u"] * (pi["phi"] - pj["phi"]) * akj_ij * pj["v"] / denominator) * pi["v"]
+            vja = (1 + pj["u"] * (pj["phi"] - pi["phi"]) * aki_ij * pi["v"] / denominator) * pj["v"]
+            
+            denominator_a = aki_ij * via + akj_ij * vja
+            A_ij = fij * via * vja * (aki_ij + akj_ij) / denominator_a
+            B_ik = fik * pi["v"] * (1 + pi["u"] * (pi["phi"] - ps["phi"]))
+            C_jk = fjk * pj["v"] * (1 + pj["u"] * (pj["phi"] - ps["phi"]))
+            
+            D_ik = aji_ik * B_ik * (1 - pi["v"] / ps["v"] * (1 + 2 * pi["u"] * (pi["phi"] - ps["phi"])))
+            E_jk = aij_jk * C_jk * (1 - pj["v"] / ps["v"] * (1 + 2 * pj["u"] * (pj["phi"] - ps["phi"])))
+            
+            chemical_term = A_ij - C_jk - B_ik + D_ik + E_jk
+            matrix = 1000 * chemical_term / (Constants.R * Tem)
+        
+        alpha_nan = np.isnan(views["am"]) | np.isnan(views["a_m"]) | np.isnan(views["a_m_"])
+        invalid = (denominator == 0) | (denominator_a == 0) | alpha_nan | swap(alpha_nan) | (np.asarray(Tem) == 0)
+        coefficients = (aki_ij, akj_ij, aik_jk, aij_jk, aji_ik, ajk_ik)
+        return matrix, coefficients, invalid
+    
+    @staticmethod
+    def _properties_invalid (ps, pe):
+        """元素参数中存在会导致零除的数值 (如数据库中不存在的元素)。"""
+        return bool(ps["tm"] == 0 or ps["n_ws"] == 0 or ps["v"] == 0 or
+                    np.any(pe["tm"] == 0) or np.any(pe["n_ws"] == 0))
+    
+    @staticmethod
+    def _properties_invalid_pairs (ps, pe):
+        """_properties_invalid 的逐对形式：返回 (N, N) 布尔矩阵，标出涉及无效元素参数的溶质对。"""
+        bad = (pe["tm"] == 0) | (pe["n_ws"] == 0)
+        solvent_bad = bool(ps["tm"] == 0 or ps["n_ws"] == 0 or ps["v"] == 0)
+        return bad[:, None] | bad[None, :] | solvent_bad
+    
+    def _solvent_arrays (self, solv: Element):
+        return {key: value[0] for key, value in self._element_arrays([solv]).items()}
+    
+    def first_order_matrix (self, solv: Element, solutes: Sequence[Element], Tem: float, state: str,
+                            extra_model: extrap_func, extra_model_name="UEM1", full_alloy_str: str = ""):
+        """
+        一次计算溶剂 solv 中全部溶质两两之间的一阶活度相互作用系数。
+
+        结果与逐对调用 activity_interact_coefficient_1st 相同：matrix[a, b] 即 ε_{solutes[a]}^{solutes[b]}。
+        Fab、偏摩尔体积等按元素属性数组整体计算，贡献系数取自 contribution_tensor。
+
+        参数:
+        solv: 溶剂元素。
+        solutes: 溶质元素列表。
+        Tem, state: 温度 (K) 与相态。
+        extra_model, extra_model_name: 外推模型函数及其名称。
+        full_alloy_str: 完整的合金成分字符串，用于贡献系数日志。
+
+        返回:
+        np.ndarray: 形状为 (N, N) 的 ε 矩阵。
+        """
+        solutes = list(solutes)
+        n = len(solutes)
+        names = [solv.name] + [e.name for e in solutes]
+        self.contribution_tensor(names, Tem, state, extra_model)
+        index, tensor, _ = self._contribution_tables[(extra_model, Tem, state)]
+        
+        ps = self._solvent_arrays(solv)
+        pe = self._element_arrays(solutes)
+        views = self._alpha_views(tensor, index[solv.name], np.array([index[e.name] for e in solutes], dtype=int))
+        matrix, coefficients, invalid = self._first_order_core(ps, pe, views, Tem)
+        
+        # 出现零除或外推模型出错 (贡献系数为 NaN) 的溶质对逐对计算，保持与 activity_interact_coefficient_1st
+        # 相同的异常；其余溶质对保留数组计算的结果
+        invalid = invalid | self._properties_invalid_pairs(ps, pe)
+        
+        for a in range(n):
+            for b in range(n):
+                if invalid[a, b]:
+                    matrix[a, b] = self.activity_interact_coefficient_1st(solv, solutes[a], solutes[b], Tem, state,
+                                                                          extra_model, extra_model_name, full_alloy_str)
+                else:
+                    self.log_and_write_contribution_coeffs(*(float(c[a, b]) for c in coefficients),
+                                                           solv, solutes[a], solutes[b], extra_model_name, Tem,
+                                                           full_alloy_str)
+        return matrix
+    
+    def contribution_tensors (self, elements: Sequence[str], temperatures, state: str, extra_model: extrap_func):
+        """
+        对一组温度分别计算贡献系数张量，返回形状为 (M, N, N, N) 的数组。
+        外推模型出错的位置为 NaN。
+        """
+        names = list(dict.fromkeys(elements))
+        tensors = np.empty((len(temperatures), len(names), len(names), len(names)))
+        for m, t in enumerate(temperatures):
+            tensors[m] = self.contribution_tensor(names, float(t), state, extra_model)
+        return tensors
+    
+    def first_order_matrices (self, solv: Element, solutes: Sequence[Element], temperatures, state: str,
+                              extra_model: extrap_func, extra_model_name="UEM1", full_alloy_str: str = "",
+                              tensors=None):
+        """
+        一次计算一组温度下的 ε 矩阵，返回形状为 (M, N, N) 的数组。
+
+        元素属性、Fab 与体积项只整理一次，全部温度一起按数组计算；温度只通过贡献系数、
+        过剩熵因子与 1/RT 进入结果。某一温度下逐点计算会出现零除时，该温度的结果为 NaN。
+
+        参数:
+        temperatures: 温度数组 (K)，同时作为 Fab 过剩熵项中的温度。
+        tensors: 已由 contribution_tensors 算出的贡献系数张量 (可选)。
+        其余参数与 first_order_matrix 相同。
+        """
+        solutes = list(solutes)
+        temperatures = np.asarray(temperatures, dtype=float)
+        names = [solv.name] + [e.name for e in solutes]
+        if tensors is None:
+            tensors = self.contribution_tensors(names, temperatures, state, extra_model)
+        
+        ps = self._solvent_arrays(solv)
+        pe = self._element_arrays(solutes)
+        index = {name: a for a, name in enumerate(dict.fromkeys(names))}
+        views = self._alpha_views(tensors, index[solv.name], np.array([index[e.name] for e in solutes], dtype=int))
+        t = temperatures[:, None, None]
+        matrices, coefficients, invalid = self._first_order_core(ps, pe, views, t, t)
+        
+        invalid = np.any(invalid, axis=(-1, -2)) | self._properties_invalid(ps, pe)
+        matrices[invalid] = np.nan
+        for m, temp in enumerate(temperatures):
+            if invalid[m]:
+                continue
+            for a in range(len(solutes)):
+                for b in range(len(solutes)):
+                    self.log_and_write_contribution_coeffs(*(float(c[m, a, b]) for c in coefficients),
+                                                           solv, solutes[a], solutes[b], extra_model_name,
+                                                           float(temp), full_alloy_str)
+        return matrices
+    
+    def ln_y0_array (self, solv: Element, solutes: Sequence[Element], temperatures):
+        """ln_y0 的数组形式：返回形状为 (M, N) 的 ln γ°，M 为温度个数。"""
+        ps = self._solvent_arrays(solv)
+        pe = self._element_arrays(list(solutes))
+        t = np.asarray(temperatures, dtype=float)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fik = self._fab_matrix(ps, pe, self._entropy_mask(ps, pe), t)
+            dhtrans = np.array([e.dh_trans for e in solutes], dtype=float)
+            lny0 = 1000 * fik * pe["v"] * (1 + pe["u"] * (pe["phi"] - ps["phi"])) + 1000 * dhtrans
+            return lny0 / (Constants.R * t)
+    
     def roui_ii (self, solv:Element, solui:Element, Tem: float, state: str, extra_model, extra_model_name="UEM1"):
         """Calculate second-order self-interaction coefficient ρi^ii"""
         sii = self.activity_interact_coefficient_1st(solv, solui, solui, Tem, state, extra_model, extra_model_name)
@@ -214,12 +548,12 @@ class TernaryMelts:
         """Calculate second-order interaction coefficient ρi^jj"""
         sjj = self.activity_interact_coefficient_1st(solv, soluj, soluj, Tem, state, extra_model, extra_model_name)
         
-        aji_ik = extra_model(soluj.name, solui.name, solv.name, Tem, state)
-        ajk_ik = extra_model(soluj.name, solv.name, solui.name, Tem, state)
-        aij_jk = extra_model(solui.name, soluj.name, solv.name, Tem, state)
-        aki_ij = extra_model(solv.name, solui.name, soluj.name, Tem, state)
-        akj_ij = extra_model(solv.name, soluj.name, solui.name, Tem, state)
-        aik_jk = extra_model(solui.name, solv.name, soluj.name, Tem, state)
+        aji_ik = self.contribution_coefficient(soluj.name, solui.name, solv.name, Tem, state, extra_model)
+        ajk_ik = self.contribution_coefficient(soluj.name, solv.name, solui.name, Tem, state, extra_model)
+        aij_jk = self.contribution_coefficient(solui.name, soluj.name, solv.name, Tem, state, extra_model)
+        aki_ij = self.contribution_coefficient(solv.name, solui.name, soluj.name, Tem, state, extra_model)
+        akj_ij = self.contribution_coefficient(solv.name, soluj.name, solui.name, Tem, state, extra_model)
+        aik_jk = self.contribution_coefficient(solui.name, solv.name, soluj.name, Tem, state, extra_model)
         
         qij = -2 * aki_ij / (aki_ij + akj_ij) ** 2 * self.first_derivative_qx(solui, soluj, aki_ij / (aki_ij + akj_ij))
         qik = aji_ik * aji_ik * self.second_derivative_q0(solui, solv, 0) - 2 * aji_ik * (
@@ -235,12 +569,12 @@ class TernaryMelts:
         """Calculate second-order cross-interaction coefficient ρi^ij"""
         sji = self.activity_interact_coefficient_1st(solv, solui, soluj, Tem, state, extra_model, extra_model_name)
         
-        aji_ik = extra_model(soluj.name, solui.name, solv.name, Tem, state)
-        ajk_ik = extra_model(soluj.name, solv.name, solui.name, Tem, state)
-        aij_jk = extra_model(solui.name, soluj.name, solv.name, Tem, state)
-        aki_ij = extra_model(solv.name, solui.name, soluj.name, Tem, state)
-        akj_ij = extra_model(solv.name, soluj.name, solui.name, Tem, state)
-        aik_jk = extra_model(solui.name, solv.name, soluj.name, Tem, state)
+        aji_ik = self.contribution_coefficient(soluj.name, solui.name, solv.name, Tem, state, extra_model)
+        ajk_ik = self.contribution_coefficient(soluj.name, solv.name, solui.name, Tem, state, extra_model)
+        aij_jk = self.contribution_coefficient(solui.name, soluj.name, solv.name, Tem, state, extra_model)
+        aki_ij = self.contribution_coefficient(solv.name, solui.name, soluj.name, Tem, state, extra_model)
+        akj_ij = self.contribution_coefficient(solv.name, soluj.name, solui.name, Tem, state, extra_model)
+        aik_jk = self.contribution_coefficient(solui.name, solv.name, soluj.name, Tem, state, extra_model)
         
         qij = 2 * akj_ij / (akj_ij + aki_ij) ** 2 * self.first_derivative_qx(solui, soluj, aki_ij / (akj_ij + aki_ij))
         qik = 2 * aji_ik * self.second_derivative_q0(solui, solv, 0) - 2 * (
@@ -254,35 +588,35 @@ class TernaryMelts:
         """Calculate cross-interaction parameter, the influence of components j,k on i"""
         skj = self.activity_interact_coefficient_1st(matrix, j, k, Tem, state, extra_model, extra_model_name)
         
-        amj_ij = extra_model(matrix.name, j.name, i.name, Tem, state)
-        ami_ij = extra_model(matrix.name, i.name, j.name, Tem, state)
-        aki_ij = extra_model(k.name, i.name, j.name, Tem, state)
-        akj_ij = extra_model(k.name, j.name, i.name, Tem, state)
+        amj_ij = self.contribution_coefficient(matrix.name, j.name, i.name, Tem, state, extra_model)
+        ami_ij = self.contribution_coefficient(matrix.name, i.name, j.name, Tem, state, extra_model)
+        aki_ij = self.contribution_coefficient(k.name, i.name, j.name, Tem, state, extra_model)
+        akj_ij = self.contribution_coefficient(k.name, j.name, i.name, Tem, state, extra_model)
         
-        amk_ik = extra_model(matrix.name, k.name, i.name, Tem, state)
-        ami_ik = extra_model(matrix.name, i.name, k.name, Tem, state)
-        aji_ik = extra_model(j.name, i.name, k.name, Tem, state)
-        ajk_ik = extra_model(j.name, k.name, i.name, Tem, state)
+        amk_ik = self.contribution_coefficient(matrix.name, k.name, i.name, Tem, state, extra_model)
+        ami_ik = self.contribution_coefficient(matrix.name, i.name, k.name, Tem, state, extra_model)
+        aji_ik = self.contribution_coefficient(j.name, i.name, k.name, Tem, state, extra_model)
+        ajk_ik = self.contribution_coefficient(j.name, k.name, i.name, Tem, state, extra_model)
         
-        aji_im = extra_model(j.name, i.name, matrix.name, Tem, state)
-        ajm_im = extra_model(j.name, matrix.name, i.name, Tem, state)
-        aki_im = extra_model(k.name, i.name, matrix.name, Tem, state)
-        akm_im = extra_model(k.name, matrix.name, i.name, Tem, state)
+        aji_im = self.contribution_coefficient(j.name, i.name, matrix.name, Tem, state, extra_model)
+        ajm_im = self.contribution_coefficient(j.name, matrix.name, i.name, Tem, state, extra_model)
+        aki_im = self.contribution_coefficient(k.name, i.name, matrix.name, Tem, state, extra_model)
+        akm_im = self.contribution_coefficient(k.name, matrix.name, i.name, Tem, state, extra_model)
         
-        amk_jk = extra_model(matrix.name, k.name, j.name, Tem, state)
-        amj_jk = extra_model(matrix.name, j.name, k.name, Tem, state)
-        aik_jk = extra_model(i.name, k.name, j.name, Tem, state)
-        aij_jk = extra_model(i.name, j.name, k.name, Tem, state)
+        amk_jk = self.contribution_coefficient(matrix.name, k.name, j.name, Tem, state, extra_model)
+        amj_jk = self.contribution_coefficient(matrix.name, j.name, k.name, Tem, state, extra_model)
+        aik_jk = self.contribution_coefficient(i.name, k.name, j.name, Tem, state, extra_model)
+        aij_jk = self.contribution_coefficient(i.name, j.name, k.name, Tem, state, extra_model)
         
-        aij_jm = extra_model(i.name, j.name, matrix.name, Tem, state)
-        aim_jm = extra_model(i.name, matrix.name, j.name, Tem, state)
-        akj_jm = extra_model(k.name, j.name, matrix.name, Tem, state)
-        akm_jm = extra_model(k.name, matrix.name, j.name, Tem, state)
+        aij_jm = self.contribution_coefficient(i.name, j.name, matrix.name, Tem, state, extra_model)
+        aim_jm = self.contribution_coefficient(i.name, matrix.name, j.name, Tem, state, extra_model)
+        akj_jm = self.contribution_coefficient(k.name, j.name, matrix.name, Tem, state, extra_model)
+        akm_jm = self.contribution_coefficient(k.name, matrix.name, j.name, Tem, state, extra_model)
         
-        aik_km = extra_model(i.name, k.name, matrix.name, Tem, state)
-        aim_km = extra_model(i.name, matrix.name, k.name, Tem, state)
-        ajk_km = extra_model(j.name, k.name, matrix.name, Tem, state)
-        ajm_km = extra_model(j.name, matrix.name, k.name, Tem, state)
+        aik_km = self.contribution_coefficient(i.name, k.name, matrix.name, Tem, state, extra_model)
+        aim_km = self.contribution_coefficient(i.name, matrix.name, k.name, Tem, state, extra_model)
+        ajk_km = self.contribution_coefficient(j.name, k.name, matrix.name, Tem, state, extra_model)
+        ajm_km = self.contribution_coefficient(j.name, matrix.name, k.name, Tem, state, extra_model)
         
         dfij = self.first_derivative_qx(i, j, ami_ij / (ami_ij + amj_ij))
         dfik = self.first_derivative_qx(i, k, ami_ik / (ami_ik + amk_ik))
@@ -310,19 +644,161 @@ class TernaryMelts:
         return 1000 * (qij + qik + qim + qjk + qjm + qkm) / (Constants.R * Tem) - skj
     
     
+    def second_order_tensor (self, solv: Element, solutes: Sequence[Element], Tem: float, state: str,
+                             extra_model: extrap_func, extra_model_name="UEM1", full_alloy_str: str = "",
+                             epsilon=None, targets: Sequence[Element] = None):
+        """
+        一次计算溶剂 solv 中全部二阶交叉相互作用系数 ρ_i^{jk}。
+
+        结果与逐个调用 roui_jk(solv, i, j, k) 相同：tensor[a, b, c] 即 ρ_{solutes[a]}^{solutes[b] solutes[c]}。
+        每对组元的 Q(x) 导数只计算一次；ρ_i^{jk} 对 j、k 对称，只计算 j <= k 的部分。
+
+        参数:
+        solv: 溶剂元素。
+        solutes: 溶质元素列表。
+        Tem, state: 温度 (K) 与相态。
+        extra_model, extra_model_name: 外推模型函数及其名称。
+        full_alloy_str: 完整的合金成分字符串，用于贡献系数日志。
+        epsilon: 已由 first_order_matrix 算出的 ε 矩阵 (可选)。
+        targets: 只计算这些溶质 i 的 ρ_i^{jk} (可选，缺省为全部溶质)。
+
+        返回:
+        np.ndarray: 形状为 (len(targets), N, N) 的 ρ 张量，缺省时为 (N, N, N)。
+        """
+        solutes = list(solutes)
+        targets = solutes if targets is None else list(targets)
+        n = len(solutes)
+        if epsilon is None:
+            epsilon = self.first_order_matrix(solv, solutes, Tem, state, extra_model, extra_model_name, full_alloy_str)
+        index, tensor, _ = self._contribution_tables[(extra_model, Tem, state)]
+        
+        views = self._alpha_views(tensor, index[solv.name], np.array([index[e.name] for e in solutes], dtype=int))
+        pe = self._element_arrays(solutes)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # 每对组元 (a, b) 在 x = α(m,a,b) / (α(m,a,b) + α(m,b,a)) 处的一阶导数
+            am = views["am"]
+            pair_sum = am + am.T
+            df_pair, df_invalid = self._first_derivative_qx_array({key: value[:, None] for key, value in pe.items()},
+                                                                  {key: value[None, :] for key, value in pe.items()},
+                                                                  am / pair_sum)
+        df_m = np.array([self.first_derivative_qx(e, solv, 0) for e in solutes])
+        ddf_m = np.array([self.second_derivative_q0(e, solv, 0) for e in solutes])
+        
+        if Tem == 0:
+            # 出现零除时逐项计算，保持与 roui_jk 相同的异常
+            return np.array([[[self.roui_jk(solv, i, j, k, Tem, state, extra_model, extra_model_name)
+                               for k in solutes] for j in solutes] for i in targets]).reshape(len(targets), n, n)
+        
+        position = {e.name: a for a, e in enumerate(solutes)}
+        rows = [position[e.name] for e in targets]
+        rho = self._second_order_core(views, df_pair, df_m, ddf_m, epsilon, rows, Tem)
+        
+        # 涉及零除的组元对或外推模型出错 (贡献系数为 NaN，结果不再有限) 的项逐项计算，其余项保留数组计算的结果
+        pair_invalid = (pair_sum == 0) | df_invalid
+        i = np.asarray(rows, dtype=int)[:, None, None]
+        j = np.arange(n)[None, :, None]
+        k = np.arange(n)[None, None, :]
+        invalid = pair_invalid[i, j] | pair_invalid[i, k] | pair_invalid[j, k] | ~np.isfinite(rho)
+        for a, b, c in zip(*np.nonzero(invalid)):
+            rho[a, b, c] = self.roui_jk(solv, targets[a], solutes[b], solutes[c], Tem, state, extra_model,
+                                        extra_model_name)
+        return rho
+    
+    @staticmethod
+    def _second_order_core (views, df_pair, df_m, ddf_m, epsilon, targets, Tem):
+        """
+        ρ 张量的数组计算：只计算 j <= k 的部分再对称填充。
+        各输入可带有前导的温度维，此时 Tem 为形状 (M, 1, 1) 的温度数组。
+        """
+        am, alpha, a_m, a_m_ = views["am"], views["alpha"], views["a_m"], views["a_m_"]
+        n = am.shape[-1]
+        jj, kk = np.triu_indices(n)
+        i = np.asarray(targets, dtype=int)[:, None]
+        j = jj[None, :]
+        k = kk[None, :]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            qij = (am[..., j, i] * alpha[..., k, i, j] - am[..., i, j] * alpha[..., k, j, i]) / \
+                  (am[..., i, j] + am[..., j, i]) ** 2 * df_pair[..., i, j]
+            qik = (am[..., k, i] * alpha[..., j, i, k] - am[..., i, k] * alpha[..., j, k, i]) / \
+                  (am[..., i, k] + am[..., k, i]) ** 2 * df_pair[..., i, k]
+            
+            aji_im, aki_im, ajm_im, akm_im = a_m[..., j, i], a_m[..., k, i], a_m_[..., j, i], a_m_[..., k, i]
+            qim = aji_im * aki_im * ddf_m[..., i] - \
+                  (aji_im * akm_im + aki_im * ajm_im + 2 * aji_im * aki_im) * df_m[..., i]
+            
+            qjk = (am[..., k, j] * alpha[..., i, j, k] - am[..., j, k] * alpha[..., i, k, j]) / \
+                  (am[..., j, k] + am[..., k, j]) ** 2 * df_pair[..., j, k]
+            
+            aij_jm, akj_jm, aim_jm, akm_jm = a_m[..., i, j], a_m[..., k, j], a_m_[..., i, j], a_m_[..., k, j]
+            qjm = aij_jm * akj_jm * ddf_m[..., j] - \
+                  (aij_jm * akm_jm + akj_jm * aim_jm + 2 * aij_jm * akj_jm) * df_m[..., j]
+            
+            aik_km, ajk_km, aim_km, ajm_km = a_m[..., i, k], a_m[..., j, k], a_m_[..., i, k], a_m_[..., j, k]
+            qkm = aik_km * ajk_km * ddf_m[..., k] - \
+                  (aik_km * ajm_km + ajk_km * aim_km + 2 * aik_km * ajk_km) * df_m[..., k]
+            
+            upper = 1000 * (qij + qik + qim + qjk + qjm + qkm) / (Constants.R * Tem) - epsilon[..., j, k]
+        
+        rho = np.empty(upper.shape[:-2] + (len(targets), n, n))
+        rho[..., jj, kk] = upper
+        rho[..., kk, jj] = upper
+        return rho
+    
+    def second_order_tensors (self, solv: Element, solutes: Sequence[Element], temperatures, state: str,
+                              extra_model: extrap_func, extra_model_name="UEM1", full_alloy_str: str = "",
+                              epsilon=None, targets: Sequence[Element] = None, tensors=None):
+        """
+        一次计算一组温度下的 ρ 张量，返回形状为 (M, len(targets), N, N) 的数组。
+
+        Q(x) 导数与 Fab 按 (温度, 组元, 组元) 数组一次算出；某一温度下逐项计算会出现零除时，
+        该温度的结果为 NaN。参数含义同 second_order_tensor 与 first_order_matrices。
+        """
+        solutes = list(solutes)
+        targets = solutes if targets is None else list(targets)
+        temperatures = np.asarray(temperatures, dtype=float)
+        names = [solv.name] + [e.name for e in solutes]
+        if tensors is None:
+            tensors = self.contribution_tensors(names, temperatures, state, extra_model)
+        if epsilon is None:
+            epsilon = self.first_order_matrices(solv, solutes, temperatures, state, extra_model, extra_model_name,
+                                                full_alloy_str, tensors=tensors)
+        
+        index = {name: a for a, name in enumerate(dict.fromkeys(names))}
+        views = self._alpha_views(tensors, index[solv.name], np.array([index[e.name] for e in solutes], dtype=int))
+        ps = self._solvent_arrays(solv)
+        pe = self._element_arrays(solutes)
+        t = temperatures[:, None, None]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            am = views["am"]
+            pair_sum = am + np.swapaxes(am, -1, -2)
+            df_pair, df_invalid = self._first_derivative_qx_array({key: value[:, None] for key, value in pe.items()},
+                                                                  {key: value[None, :] for key, value in pe.items()},
+                                                                  am / pair_sum, t)
+            df_m, _ = self._first_derivative_qx_array(pe, ps, 0, temperatures[:, None])
+            ddf_m = self._second_derivative_q0_array(pe, ps, temperatures[:, None])
+        
+        position = {e.name: a for a, e in enumerate(solutes)}
+        rho = self._second_order_core(views, df_pair, df_m, ddf_m, epsilon,
+                                      [position[e.name] for e in targets], t)
+        invalid = np.any((pair_sum == 0) | df_invalid | np.isnan(views["alpha"]).any(axis=-1), axis=(-1, -2))
+        invalid |= (temperatures == 0) | np.isnan(epsilon).any(axis=(-1, -2))
+        rho[invalid] = np.nan
+        return rho
+    
     #打印贡献系数和日志记录
     def log_and_write_contribution_coeffs (self,
             aki_ij: float, akj_ij: float, aik_jk: float, aij_jk: float,
             aji_ik: float, ajk_ik: float, solv: Element, solui: Element, soluj: Element,
             extra_model_name: str, Tem: float, full_alloy_str: str = "" ):
         """
-        处理、过滤并记录贡献系数。
+        将贡献系数交给后台日志线程记录。
 
-        这个函数会执行以下操作:
-        1. 确保日志文件目录存在。
-        2. 对 aki_ij 和 akj_ij 进行默认值处理。
-        3. 只在体系组元数大于等于3时才记录日志。
-        4. 构造数据并调用日志函数。
+        这个函数位于 ε 计算的热路径上，只构造记录并放入队列；合金名称规范化、
+        组元数 (>= 3) 过滤和文件写入都由 utils.DataLogger 的写入线程完成。
+        日志被 set_logging_enabled(False) 关闭时直接返回。
 
         参数:
         aki_ij, akj_ij, ...: 贡献系数值。
@@ -331,45 +807,30 @@ class TernaryMelts:
         Tem: 温度 (K)。
         full_alloy_str: 完整的合金成分字符串 (可选)。
         """
-        # 1. 确保日志文件目录存在
-        # (这部分可以放在函数外部的初始化代码中，以避免重复执行)
-        current_script_path = os.path.abspath(__file__)
-        models_dir = os.path.dirname(current_script_path)
-        project_root = os.path.dirname(models_dir)
-        file_path = os.path.join(project_root, "results", "Contribution Coefficient")
-        os.makedirs(file_path, exist_ok=True)
-        
-       
-        # 2. 过滤条件：只在体系组元数大于等于3时才记录日志
-        system_context_for_check = full_alloy_str if full_alloy_str else f"{solv.name}-{solui.name}-{soluj.name}"
-        canonical_name = get_canonical_alloy_name(system_context_for_check)
-        element_count = len(canonical_name.split('-'))
-        
-        if element_count >= 3:
-            # 准备日志所需的数据
-            ternary_system_str = f"{solv.name}-{solui.name}-{soluj.name}"
-            
-            contribution_data_for_log = {
-                f"{solui.name}-{soluj.name}": {
-                    f"k={solv.name}, i={solui.name}": aki_ij,
-                    f"k={solv.name}, j={soluj.name}": akj_ij
-                },
-                f"{solv.name}-{soluj.name}": {
-                    f"i={solui.name}, k={solv.name}": aik_jk,
-                    f"i={solui.name}, j={soluj.name}": aij_jk
-                },
-                f"{solv.name}-{solui.name}": {
-                    f"j={soluj.name}, i={solui.name}": aji_ik,
-                    f"j={soluj.name}, k={solv.name}": ajk_ik
-                }
+        if not is_logging_enabled():
+            return
+        
+        ternary_system_str = f"{solv.name}-{solui.name}-{soluj.name}"
+        contribution_data_for_log = {
+            f"{solui.name}-{soluj.name}": {
+                f"k={solv.name}, i={solui.name}": aki_ij,
+                f"k={solv.name}, j={soluj.name}": akj_ij
+            },
+            f"{solv.name}-{soluj.name}": {
+                f"i={solui.name}, k={solv.name}": aik_jk,
+                f"i={solui.name}, j={soluj.name}": aij_jk
+            },
+            f"{solv.name}-{solui.name}": {
+                f"j={soluj.name}, i={solui.name}": aji_ik,
+                f"j={soluj.name}, k={solv.name}": ajk_ik
             }
-            
-            # 调用日志函数 (假设 log_contribution_coefficients 已在作用域内)
-            log_contribution_coefficients(
-                    ternary_system=ternary_system_str,
-                    model_name=extra_model_name,
-                    temperature=Tem,
-                    contribution_data=contribution_data_for_log,
-                    full_alloy_context=full_alloy_str
-            )
+        }
+        
+        queue_contribution_coefficients(
+                ternary_system=ternary_system_str,
+                model_name=extra_model_name,
+                temperature=Tem,
+                contribution_data=contribution_data_for_log,
+                full_alloy_context=full_alloy_str
+        )
 
@@ -3,14 +3,21 @@
 import math
 from typing import Callable
 
-from scipy import integrate
+import numpy as np
 from core.constants import Constants
 from core.element import Element
+from models.integral_cache import get_integral_cache
+from models.model_kernels import (DEFAULT_QUADRATURE_NODES, MPMATH_DPS, QUADRATURE_GAUSS_LEGENDRE,
+                                  QUADRATURE_MPMATH, alloy_volumes, alloy_volumes_array, asym_component,
+                                  binary_enthalpy, binary_enthalpy_terms, entropy_slope, gauss_legendre_nodes,
+                                  graphic_center, integrate_moments, miedema_fab, miedema_rp, uem1_coefficient)
 import mpmath
 
 # 导入 TernaryMelts 会导致循环导入，需要重构或延迟导入
 # from ternary_model import TernaryMelts
 
+# 无状态的外推模型计算核见 models/model_kernels.py；BinaryModel 保留原有的有状态接口。
+
 
 class BinaryModel:
 	"""处理二元体系的热力学计算。"""
@@ -25,11 +32,12 @@ class BinaryModel:
 		
 		self._is_entropy = False
 		
-		self.yeta_dict = {}
-		self.df_uem2 = {}
-		self.df_uem2adv_x = {}
-		self.df_uem2adv_y = {}
-		self.df_uem2adv_a = {}
+		self._quadrature = QUADRATURE_GAUSS_LEGENDRE
+		self._quadrature_nodes = DEFAULT_QUADRATURE_NODES
+		self.last_quadrature_error = 0.0
+		
+		# GSM、UEM2、UEM2-Adv 的积分结果保存在进程共享的 LRU 缓存中
+		self._integral_cache = get_integral_cache()
 	
 	def set_temperature (self, temp):
 		self._temperature = temp
@@ -47,77 +55,71 @@ class BinaryModel:
 	def set_entropy (self, is_se):
 		self._is_entropy = is_se
 	
+	def set_quadrature (self, backend: str, nodes: int = DEFAULT_QUADRATURE_NODES):
+		"""选择 GSM、UEM2 积分的求积方式。
+
+		参数:
+		backend: QUADRATURE_GAUSS_LEGENDRE（默认，快速）或 QUADRATURE_MPMATH（参考精度）。
+		nodes: Gauss-Legendre 求积的节点数。
+		"""
+		if backend not in (QUADRATURE_GAUSS_LEGENDRE, QUADRATURE_MPMATH):
+			raise ValueError(f"未知的求积方式: {backend}")
+		if nodes < 2:
+			raise ValueError(f"Gauss-Legendre 节点数至少为 2: {nodes}")
+		self._quadrature = backend
+		self._quadrature_nodes = nodes
+	
 	def fab (self, ea, eb, state):
 		"""计算 Miedema 模型中的 Fab 值。"""
-		if not (ea.is_exist and eb.is_exist): return float('nan')
-		
-		p_ab = Constants.P_TT if (ea.is_trans_group and eb.is_trans_group) else \
-			(Constants.P_TN if (ea.is_trans_group or eb.is_trans_group) else Constants.P_NN)
-		rp_value = self.rp(ea, eb, state)
-		diff = 2 * p_ab * (-(ea.phi - eb.phi) ** 2 + Constants.QtoP * (ea.n_ws - eb.n_ws) ** 2 - rp_value) / \
-		       (1.0 / ea.n_ws + 1.0 / eb.n_ws)
-		return diff
+		return miedema_fab(ea, eb, state)
 	
 	def rp (self, ea, eb, state):
 		"""计算 Miedema 模型中的 RP 项。"""
-		alpha = 1.0 if state == "solid" else 0.73
-		if ea.hybrid_factor == "other" or eb.hybrid_factor == "other": return 0.0
-		return 0.0 if ea.hybrid_factor == eb.hybrid_factor else alpha * ea.hybrid_value * eb.hybrid_value
+		return miedema_rp(ea, eb, state)
 	
 	def v_in_alloy (self, ea, eb, xa, xb):
 		"""计算合金中的体积。xa+xb=1"""
-		ya = xa / (xa + xb)
-		yb = xb / (xa + xb)
-		
-		vaa = ea.v
-		vba = eb.v
-		
-		if ea.name == "H" or eb.name == "H":
-			max_iterations = 1000
-			for _ in range(max_iterations):
-				new_vaa, new_vba = vaa, vba
-				pax = ya * vaa / (ya * vaa + yb * vba)
-				pbx = yb * vba / (ya * vaa + yb * vba)
-				vaa = ea.v * (1 + ea.u * pbx * (1 + self._lambda * (pax * pbx) ** 2) * (ea.phi - eb.phi))
-				vba = eb.v * (1 + eb.u * pax * (1 + self._lambda * (pax * pbx) ** 2) * (eb.phi - ea.phi))
-				if abs(vaa - new_vaa) < 1e-6 and abs(vba - new_vba) < 1e-6: break
-		else:
-			vaa = ea.v * (1 + ea.u * ya * (ea.phi - eb.phi))
-			vba = eb.v * (1 + eb.u * yb * (eb.phi - ea.phi))
-		return vaa, vba
+		return alloy_volumes(ea, eb, xa, xb, self._lambda)
 	
 	def binary_model (self, a, b, xa, xb):
-		"""二元模型计算。"""
-		self.set_pair_element(a, b)
-		f_ab = self.fab(self._ea, self._eb, self._state)
-		entropy_term = 0
-		
-		if self._is_entropy:
-			if self._ea.tm and self._eb.tm:  # Avoid division by zero
-				avg_tm = 1.0 / self._ea.tm + 1.0 / self._eb.tm
-				factor = 15.1 if self._state == "solid" else 14.0
-				entropy_term = 1.0 / factor * avg_tm * self._temperature
-			else:
-				entropy_term = 0.0
-		
-		f_ab *= (1 - entropy_term)
-		vaa, vba = self.v_in_alloy(self._ea, self._eb, xa, xb)
-		ca = xa / (xa + xb)
-		cb = xb / (xa + xb)
-		if (ca * vaa + cb * vba) == 0: return 0.0  # Avoid division by zero
-		cas = ca * vaa / (ca * vaa + cb * vba)
-		cbs = cb * vba / (ca * vaa + cb * vba)
-		fb = cbs * (1 + self._lambda * (cas * cbs) ** 2)
-		dh_trans_a = 0
-		dh_trans_b = 0
-		if self._state == "liquid":
-			if self._ea.name not in ["Si", "Ge"]:
-				dh_trans_a = self._ea.dh_trans
-			if self._eb.name not in ["Si", "Ge"]:
-				dh_trans_b = self._eb.dh_trans
-		dh_trans = dh_trans_a * ca + dh_trans_b * cb
-		
-		return fb * f_ab * ca * vaa + dh_trans
+		"""二元模型计算，见 binary_enthalpy。"""
+		return binary_enthalpy(a, b, xa, xb, self._temperature, self._state, self._is_entropy, self._lambda)
+	
+	def v_in_alloy_array (self, ea, eb, xa, xb):
+		"""v_in_alloy 的数组版本，xa、xb 为同形状的 NumPy 数组，见 alloy_volumes_array。"""
+		return alloy_volumes_array(ea, eb, xa, xb, self._lambda)
+	
+	def binary_model_array (self, a, b, xa, xb=None):
+		"""binary_model 的数组版本：对同一组元对，一次计算整个成分向量上的 ΔH。
+
+		参数:
+		a, b: 组元 a、b 的元素符号。
+		xa: 组元 a 的摩尔分数 (标量或 NumPy 数组)。
+		xb: 组元 b 的摩尔分数，缺省为 1 - xa。
+
+		返回:
+		np.ndarray: 与 xa 同形状的混合焓数组。
+		"""
+		xa = np.asarray(xa, dtype=float)
+		xb = None if xb is None else np.asarray(xb, dtype=float)
+		h0, h1 = self.binary_model_terms(a, b, xa, xb)
+		return h0 - self._temperature * h1
+	
+	def entropy_slope (self, ea, eb):
+		"""过剩熵修正 (1 - s·T) 中的系数 s；不计过剩熵时为 0。"""
+		return entropy_slope(ea, eb, self._state, self._is_entropy)
+	
+	def binary_model_terms (self, a, b, xa, xb=None):
+		"""
+		将二元混合焓按温度分解：ΔH(x, T) = h0(x) - T·h1(x)。
+
+		binary_model 中温度只出现在过剩熵因子 (1 - s·T) 上，因此 h0、h1 与温度无关，
+		可以一次积分后对任意温度求值。xa 可以是标量 (含 mpmath 数) 或 NumPy 数组。
+
+		返回:
+		(h0, h1): 与 xa 同形状的两项。
+		"""
+		return binary_enthalpy_terms(a, b, xa, self._state, self._is_entropy, self._lambda, xb)
 	
 	def elastic_a_in_b (self, a, b):
 		"""计算固溶体相的弹性项。"""
@@ -150,18 +152,82 @@ class BinaryModel:
 		返回:
 		float: 积分结果，以标准浮点数形式返回。
 		"""
-		# 设置 mpmath 的计算精度
-		mpmath.mp.dps = decimal_places
-	
-		
-		# 使用 mpmath.quad 进行高精度积分
+		# 在局部精度上下文中使用 mpmath.quad 进行高精度积分，不修改全局的 mpmath.mp.dps
 		# 注意：mpmath.quad 的返回值是 mpmath 的浮点数类型
-		integral_value_mp = mpmath.quad(model, [0, 1])
+		with mpmath.workdps(decimal_places):
+			integral_value_mp = mpmath.quad(model, [0, 1])
 		
 		# 将结果转换为标准的 Python 浮点数后返回
 		return float(integral_value_mp)
 	
 	
+	def integrate_gauss_legendre (self, func_array: Callable[[np.ndarray], np.ndarray], nodes: int = None):
+		"""
+		使用定阶 Gauss-Legendre 求积在 [0, 1] 上积分。
+
+		参数:
+		func_array: 接受 NumPy 数组并返回同形状数组的被积函数。
+		nodes (int): 节点数，缺省使用 set_quadrature 设置的值。
+
+		返回:
+		(float, float): 积分值和误差估计。误差估计取 n 点与 n/2 点求积结果之差的绝对值。
+		"""
+		n = nodes or self._quadrature_nodes
+		x, w = gauss_legendre_nodes(n)
+		x_half, w_half = gauss_legendre_nodes(max(n // 2, 1))
+		value = float(np.dot(w, func_array(x)))
+		coarse = float(np.dot(w_half, func_array(x_half)))
+		return value, abs(value - coarse)
+	
+	def integrate_unit_interval (self, func_array: Callable[[np.ndarray], np.ndarray],
+	                             func_scalar: Callable[[float], float]):
+		"""
+		按当前求积方式在 [0, 1] 上积分。
+
+		参数:
+		func_array: 被积函数的数组版本，用于 Gauss-Legendre 求积。
+		func_scalar: 被积函数的标量版本，用于 mpmath 参考精度求积。
+
+		返回:
+		(float, float): 积分值和误差估计，误差估计同时记录在 last_quadrature_error 中。
+		"""
+		if self._quadrature == QUADRATURE_MPMATH:
+			with mpmath.workdps(MPMATH_DPS):
+				value, error = mpmath.quad(func_scalar, [0, 1], error=True)
+			value, error = float(value), float(error)
+		else:
+			value, error = self.integrate_gauss_legendre(func_array)
+		self.last_quadrature_error = error
+		return value, error
+	
+	def check_quadrature (self, func_array: Callable[[np.ndarray], np.ndarray],
+	                      func_scalar: Callable[[float], float], rtol: float = 1e-8):
+		"""
+		比较 Gauss-Legendre 求积与 mpmath 参考精度求积的结果。
+
+		返回:
+		(float, float, bool): 快速求积值、参考值，以及二者相对偏差是否在 rtol 以内。
+		"""
+		fast, _ = self.integrate_gauss_legendre(func_array)
+		reference = self.integrate_miedema_mpmath_arbitrary_precision(func_scalar, 30)
+		return fast, reference, abs(fast - reference) <= rtol * max(abs(reference), 1e-300)
+	
+	def integrate_moments (self, func_array, func_scalar):
+		"""
+		按当前求积方式在 [0, 1] 上同时积分多个被积函数。
+
+		参数:
+		func_array: 接受节点数组、返回多个同形状数组 (元组) 的函数，用于 Gauss-Legendre 求积，
+		            所有被积函数共用同一组节点上的一次求值。
+		func_scalar: 同一组被积函数的标量版本，返回元组，用于 mpmath 参考精度求积。
+
+		返回:
+		(tuple, float): 各积分值，以及其中最大的误差估计。
+		"""
+		values, self.last_quadrature_error = integrate_moments(func_array, func_scalar, self._quadrature,
+		                                                       self._quadrature_nodes)
+		return values, self.last_quadrature_error
+	
 	def yeta (self, k, a, b, temp: float, state: str):
 		"""计算 GSM 的相似系数。"""
 		m1 = BinaryModel()
@@ -173,14 +239,21 @@ class BinaryModel:
 		m1.set_entropy(True)
 		m2.set_entropy(True)
 		
-		key = k + a + b + str(temp) + state
-		if key in self.yeta_dict: return self.yeta_dict[key]
+		# 被积函数 (ΔH_ab - ΔH_ak)² = (d0 - T·d1)²，缓存与温度无关的 ∫d0²、∫d0·d1、∫d1²
+		key = ("yeta", (a, b, k), state, m1._lambda, True, self._quadrature, self._quadrature_nodes)
 		
-		func = lambda x: m1.binary_model(a, b, x, 1 - x) - m2.binary_model(a, k, x, 1 - x)
-		func2 = lambda x: func(x) ** 2
-		result = self.integrate_miedema_mpmath_arbitrary_precision(func2,30)
-		self.yeta_dict[key] = result
-		return result
+		def moments (x):
+			ab0, ab1 = m1.binary_model_terms(a, b, x)
+			ak0, ak1 = m2.binary_model_terms(a, k, x)
+			d0 = ab0 - ak0
+			d1 = ab1 - ak1
+			return d0 * d0, d0 * d1, d1 * d1
+		
+		def compute ():
+			return self.integrate_moments(moments, moments)[0]
+		
+		c00, c01, c11 = self._integral_cache.get_or_compute(key, compute)
+		return max(c00 - 2 * temp * c01 + temp * temp * c11, 0.0)
 	
 	def _get_dki_uem2 (self, k: str, i: str, j: str, t: float):
 		
@@ -201,15 +274,16 @@ class BinaryModel:
 		mkj.set_temperature(t)
 		
 		def get_integral (model_instance, e1_name, e2_name):
-			# Cache key includes all relevant parameters
-			key = f"{e1_name}-{e2_name}-{model_instance._lambda}-{model_instance._state}-{t}"
-			if key in self.df_uem2:
-				return self.df_uem2[key]
+			# ∫ΔH dx = ∫h0 dx - T·∫h1 dx，缓存与温度无关的两项积分
+			key = ("uem2", (e1_name, e2_name), model_instance._state, model_instance._lambda,
+			       model_instance._is_entropy, self._quadrature, self._quadrature_nodes)
 			
-			func = lambda x: model_instance.binary_model(e1_name, e2_name, x, 1 - x) * 1000 / (Constants.R * t)
-			f_val = self.integrate_miedema_mpmath_arbitrary_precision(func, 30)
-			self.df_uem2[key] = f_val
-			return f_val
+			def compute ():
+				terms = lambda x: model_instance.binary_model_terms(e1_name, e2_name, x)
+				return self.integrate_moments(terms, terms)[0]
+			
+			h0, h1 = self._integral_cache.get_or_compute(key, compute)
+			return (h0 - t * h1) * 1000 / (Constants.R * t)
 		
 		f_ij = get_integral(mij, i, j)
 		f_kj = get_integral(mkj, k, j)
@@ -221,33 +295,8 @@ class BinaryModel:
 		return abs((f_ij - f_kj) / denominator)
 	
 	def get_graphic_center (self, k, i, T: float, phase_state="liquid"):
-		"""计算函数图像的中心坐标 (x, y)。"""
-		mki = BinaryModel()
-		mki.set_entropy(True)
-		mki.set_pair_element(i, k)
-		mki.set_state(phase_state)  # Use passed phase_state
-		mki.set_temperature(self._temperature)
-		
-		key = i + k + str(self._lambda) + phase_state + str(self._temperature)
-		
-		if key in self.df_uem2adv_x:
-			x_bar = self.df_uem2adv_x[key]
-			a = self.df_uem2adv_a[key]
-			y = self.df_uem2adv_y[key]
-		else:
-			func_x = lambda x: mki.binary_model(k, i, x, 1 - x) * 1000
-			xfunc_x = lambda x: x * func_x(x)
-			func_x2 = lambda x: func_x(x) * func_x(x)
-			x_bar = integrate.quad(xfunc_x, 0, 1)[0]
-			a = integrate.quad(func_x, 0, 1)[0]
-			y = integrate.quad(func_x2, 0, 1)[0]
-			self.df_uem2adv_x[key] = x_bar
-			self.df_uem2adv_a[key] = a
-			self.df_uem2adv_y[key] = y
-		
-		x_ = x_bar / a if a != 0 else 0
-		y_ = y / (2.0 * a) if a != 0 else 0
-		return (x_ - 0.5, y_)
+		"""计算函数图像的中心坐标 (x, y)，温度取参数 T，积分系数与温度无关 (见 graphic_center_moments)。"""
+		return graphic_center(k, i, T, phase_state, self._lambda, self._quadrature, self._quadrature_nodes)
 	
 	def delta_x (self, x, y):
 		"""get_d_ki 的辅助函数。"""
@@ -309,38 +358,15 @@ class BinaryModel:
 		
 		return lny0
 	def _asym_component_choice (self, k: str, i: str, j: str, Tem: float, phase_state: str):
-		"""Qiao's 不对称组元选择规则。"""
+		"""Qiao's 不对称组元选择规则，判定结果由 asym_component 按三元组、T 与相态缓存。"""
 		self.set_state(phase_state)
 		self.set_temperature(Tem)
 		self.set_entropy(True)
-		bij = self.binary_model(i, j, 0.5, 0.5)
-		bik = self.binary_model(i, k, 0.5, 0.5)
-		bjk = self.binary_model(k, j, 0.5, 0.5)
-		
-		if (bij > 0 and bik > 0 and bjk > 0) or (bij < 0 and bik < 0 and bjk < 0):
-			enthalpies = {k: abs(bij), j: abs(bik), i: abs(bjk)}
-			return min(enthalpies, key=enthalpies.get)
-		else:
-			if bij * bik > 0:
-				return i
-			elif bij * bjk > 0:
-				return j
-			else:
-				return k
+		return asym_component(k, i, j, Tem, phase_state, self._lambda)
 	
 	def UEM1 (self, k, i, j, Tem: float, phase_state: str):
-		"""UEM1 模型实现。"""
-		
-		inter_ik = self.kexi(Element(k), Element(i))
-		inter_ki = self.kexi(Element(i), Element(k))
-		inter_jk = self.kexi(Element(k), Element(j))
-		inter_kj = self.kexi(Element(j), Element(k))
-		df_ki = abs(inter_ik - inter_ki)
-		df_kj = abs(inter_jk - inter_kj)
-		if df_ki + df_kj == 0: return 0.5  # Avoid division by zero
-		alpha = math.exp(-df_ki)
-		beta3 = df_kj / (df_ki + df_kj)
-		return alpha * beta3
+		"""UEM1 模型实现，ξ 按本实例的温度与相态计算 (默认 1873 K、液态)，不随 Tem、phase_state 变化。"""
+		return uem1_coefficient(k, i, j, self._temperature, self._state)
 	
 	# 📍 MODIFIED UEM2: Uses the new calculation logic
 	def UEM2 (self, k, i, j, Tem: float, phase_state: str):
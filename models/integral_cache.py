@@ -0,0 +1,297 @@
+# integral_cache.py
+import atexit
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from core.element import ElementRegistry
+
+DEFAULT_CACHE_SIZE = 4096
+PERSISTENT_CACHE_FILENAME = "integral_cache.db"
+# 磁盘缓存格式版本 (保存在 SQLite 的 user_version 中)，键的构成改变时加一，旧文件中的条目随之失效
+# 2: 键中增加 Gauss-Legendre 节点数
+PERSISTENT_CACHE_VERSION = 2
+
+
+class IntegralCache:
+	"""进程共享的二元积分缓存，容量有限，按最近最少使用 (LRU) 淘汰。
+
+	键为规范化的元组 (积分类型, 组元, [T,] 相态, λ, 是否计入过剩熵, 求积方式, 节点数)，第二项固定为组元元组；
+	按温度分解后缓存的积分系数不含 T。所有 BinaryModel 实例共用同一份缓存，
+	因此不同窗口、不同计算之间可以复用相同的积分结果。
+	"""
+
+	def __init__ (self, maxsize: int = DEFAULT_CACHE_SIZE):
+		self._data = OrderedDict()
+		self._lock = threading.Lock()
+		self._maxsize = maxsize
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.persistent_hits = 0
+		self._store = None
+
+	@property
+	def maxsize (self):
+		return self._maxsize
+
+	def set_maxsize (self, maxsize: int):
+		"""调整缓存容量，超出部分立即淘汰。"""
+		if maxsize < 1:
+			raise ValueError(f"缓存容量必须为正整数: {maxsize}")
+		with self._lock:
+			self._maxsize = maxsize
+			self._evict()
+
+	def _evict (self):
+		while len(self._data) > self._maxsize:
+			self._data.popitem(last=False)
+			self.evictions += 1
+
+	def get (self, key: Hashable, default=None):
+		with self._lock:
+			if key in self._data:
+				self._data.move_to_end(key)
+				self.hits += 1
+				return self._data[key]
+			self.misses += 1
+			return default
+
+	def put (self, key: Hashable, value):
+		with self._lock:
+			self._data[key] = value
+			self._data.move_to_end(key)
+			self._evict()
+
+	def get_or_compute (self, key: Hashable, compute: Callable[[], object]):
+		"""命中时返回缓存值，否则调用 compute() 计算并写入缓存。
+
+		计算在锁外进行，多个线程同时未命中同一个键时可能重复计算，但结果相同。
+		"""
+		with self._lock:
+			if key in self._data:
+				self._data.move_to_end(key)
+				self.hits += 1
+				return self._data[key]
+			self.misses += 1
+
+		if self._store is not None:
+			value = self._store.get(key)
+			if value is not None:
+				self.persistent_hits += 1
+				self.put(key, value)
+				return value
+
+		value = compute()
+		self.put(key, value)
+		if self._store is not None:
+			self._store.add(key, value)
+		return value
+
+	def attach_store (self, store):
+		"""挂接磁盘缓存：内存未命中时先查磁盘，新计算的结果同时写入磁盘缓存。传入 None 取消挂接。"""
+		self._store = store
+
+	@property
+	def store (self):
+		return self._store
+
+	def clear (self):
+		with self._lock:
+			self._data.clear()
+			self.hits = 0
+			self.misses = 0
+			self.evictions = 0
+			self.persistent_hits = 0
+
+	def __len__ (self):
+		return len(self._data)
+
+	def __contains__ (self, key):
+		return key in self._data
+
+	def stats (self) -> dict:
+		"""返回命中、未命中、淘汰次数以及当前容量等统计信息。"""
+		with self._lock:
+			lookups = self.hits + self.misses
+			return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"evictions": self.evictions,
+				"persistent_hits": self.persistent_hits,
+				"size": len(self._data),
+				"maxsize": self._maxsize,
+				"hit_rate": self.hits / lookups if lookups else 0.0,
+			}
+
+
+def parameter_fingerprint (elements) -> str:
+	"""根据组元在 MiedemaParameter 表中的原始记录计算哈希，参数被修改后哈希随之改变。"""
+	digest = hashlib.sha1()
+	for name in elements:
+		digest.update(repr((name, ElementRegistry.get_row(name))).encode("utf-8"))
+	return digest.hexdigest()
+
+
+class PersistentIntegralStore:
+	"""积分结果的磁盘缓存 (SQLite 文件)，使程序重新启动后无需再次求积。
+
+	每条记录以共享缓存中的键 (积分类型, 组元, ...) 为键，并保存组元参数的哈希；
+	载入时哈希与当前 MiedemaParameter 记录不一致的条目视为失效并删除；文件版本与
+	PERSISTENT_CACHE_VERSION 不同时全部条目视为失效。
+	新结果先暂存在内存中，由 flush() 批量写入（程序退出时自动调用）。
+	"""
+
+	def __init__ (self, path: str, seed_paths=()):
+		self.path = path
+		self._lock = threading.Lock()
+		self._entries = {}
+		self._pending = {}
+		for seed_path in seed_paths:
+			if os.path.exists(seed_path):
+				self._load(seed_path, purge_stale=False)
+		if os.path.exists(path):
+			self._load(path, purge_stale=True)
+
+	@staticmethod
+	def _normalize (value):
+		# 1873 与 1873.0 应对应同一条记录
+		if isinstance(value, bool) or value is None or isinstance(value, str):
+			return value
+		if isinstance(value, (tuple, list)):
+			return [PersistentIntegralStore._normalize(item) for item in value]
+		return float(value)
+
+	@staticmethod
+	def _serialize_key (key) -> str:
+		return json.dumps(PersistentIntegralStore._normalize(key))
+
+	@staticmethod
+	def _deserialize_value (text):
+		value = json.loads(text)
+		return tuple(value) if isinstance(value, list) else value
+
+	def _load (self, path, purge_stale):
+		"""
+		载入一个缓存文件。purge_stale 为 True 时为用户缓存文件，可建表并删除失效条目；
+		否则为随程序发布的初始数据，以只读方式打开，不做任何修改。
+		"""
+		stale = []
+		try:
+			if purge_stale:
+				conn = sqlite3.connect(path)
+			else:
+				conn = sqlite3.connect(pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro", uri=True)
+		except sqlite3.Error as e:
+			print(f"读取积分缓存文件时出错 ({path}): {e}")
+			return
+		try:
+			if purge_stale:
+				conn.execute("CREATE TABLE IF NOT EXISTS integrals (key TEXT PRIMARY KEY, fingerprint TEXT, value TEXT)")
+			elif conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'integrals'").fetchone() is None:
+				return
+			if conn.execute("PRAGMA user_version").fetchone()[0] != PERSISTENT_CACHE_VERSION:
+				if purge_stale:
+					conn.execute("DELETE FROM integrals")
+					conn.execute(f"PRAGMA user_version = {PERSISTENT_CACHE_VERSION}")
+					conn.commit()
+				return
+			for key_text, fingerprint, value_text in conn.execute("SELECT key, fingerprint, value FROM integrals"):
+				elements = json.loads(key_text)[1]
+				if fingerprint == parameter_fingerprint(elements):
+					self._entries[key_text] = (fingerprint, self._deserialize_value(value_text))
+				else:
+					stale.append((key_text,))
+			if purge_stale and stale:
+				conn.executemany("DELETE FROM integrals WHERE key = ?", stale)
+				conn.commit()
+		except sqlite3.Error as e:
+			print(f"读取积分缓存文件时出错 ({path}): {e}")
+		finally:
+			conn.close()
+
+	def get (self, key):
+		"""返回缓存值；不存在或组元参数已被修改时返回 None。"""
+		with self._lock:
+			entry = self._entries.get(self._serialize_key(key))
+		if entry is None or entry[0] != parameter_fingerprint(key[1]):
+			return None
+		return entry[1]
+
+	def add (self, key, value):
+		key_text = self._serialize_key(key)
+		fingerprint = parameter_fingerprint(key[1])
+		with self._lock:
+			self._entries[key_text] = (fingerprint, value)
+			self._pending[key_text] = (fingerprint, json.dumps(value))
+
+	def __len__ (self):
+		return len(self._entries)
+
+	def flush (self):
+		"""将新增结果批量写入磁盘。"""
+		with self._lock:
+			pending, self._pending = self._pending, {}
+		if not pending:
+			return
+		try:
+			os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+			conn = sqlite3.connect(self.path)
+			try:
+				conn.execute("CREATE TABLE IF NOT EXISTS integrals (key TEXT PRIMARY KEY, fingerprint TEXT, value TEXT)")
+				if conn.execute("PRAGMA user_version").fetchone()[0] != PERSISTENT_CACHE_VERSION:
+					# 文件在本次载入之后才创建，或由旧版本写入：清空后按当前版本写入
+					conn.execute("DELETE FROM integrals")
+					conn.execute(f"PRAGMA user_version = {PERSISTENT_CACHE_VERSION}")
+				conn.executemany("INSERT OR REPLACE INTO integrals (key, fingerprint, value) VALUES (?, ?, ?)",
+				                 [(key_text, fingerprint, value) for key_text, (fingerprint, value) in pending.items()])
+				conn.commit()
+			finally:
+				conn.close()
+		except (OSError, sqlite3.Error) as e:
+			print(f"写入积分缓存文件时出错 ({self.path}): {e}")
+
+
+def default_persistent_cache_path () -> str:
+	"""用户目录下的磁盘缓存路径：~/.alloyact/integral_cache.db。"""
+	return os.path.join(os.path.expanduser("~"), ".alloyact", PERSISTENT_CACHE_FILENAME)
+
+
+def bundled_persistent_cache_path () -> str:
+	"""随程序发布的预生成缓存路径 (database/data/integral_cache.db)，兼容 PyInstaller 打包环境。"""
+	try:
+		base_path = sys._MEIPASS
+	except AttributeError:
+		base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+	return os.path.join(base_path, "database", "data", PERSISTENT_CACHE_FILENAME)
+
+
+_integral_cache = IntegralCache()
+
+
+def get_integral_cache () -> IntegralCache:
+	"""返回进程共享的二元积分缓存。"""
+	return _integral_cache
+
+
+def enable_persistent_cache (path: str = None) -> PersistentIntegralStore:
+	"""为共享积分缓存启用磁盘缓存。
+
+	参数:
+	path: 缓存文件路径，缺省为 ~/.alloyact/integral_cache.db。随程序发布的
+	      database/data/integral_cache.db 存在时作为只读的初始数据载入。
+
+	返回:
+	PersistentIntegralStore: 已挂接到共享缓存的磁盘缓存对象。
+	"""
+	store = PersistentIntegralStore(path or default_persistent_cache_path(),
+	                                seed_paths=(bundled_persistent_cache_path(),))
+	_integral_cache.attach_store(store)
+	atexit.register(store.flush)
+	return store
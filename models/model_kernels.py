@@ -0,0 +1,560 @@
+# model_kernels.py
+
+import math
+from functools import lru_cache
+
+import mpmath
+import numpy as np
+
+from core.constants import Constants
+from core.element import Element
+from models.integral_cache import get_integral_cache
+
+# 外推模型的无状态计算核：温度、相态、λ、求积方式等全部显式传入，不读写实例或全局状态
+# (mpmath 只在局部精度上下文中使用)，可以在多个线程中同时调用。各模型函数为模块级函数，
+# 可直接 pickle 后交给进程池，签名与 BinaryModel 的同名方法一致：f(k, i, j, T, phase_state)。
+
+# 二元积分的求积方式：快速的定阶 Gauss-Legendre 求积，或 mpmath 任意精度求积（参考精度）
+QUADRATURE_GAUSS_LEGENDRE = "gauss-legendre"
+QUADRATURE_MPMATH = "mpmath"
+DEFAULT_QUADRATURE_NODES = 64
+# mpmath 参考精度求积的十进制位数
+MPMATH_DPS = 30
+
+# 不计过剩熵的元素 (UEM2)
+NON_ENTROPY_ELEMENTS = frozenset({"H", "O", "N"})
+# BinaryModel 的默认温度与相态。UEM1 的 ξ 在原 BinaryModel 中按实例状态计算，
+# 计算核在该状态下求值，与界面中使用的 BinaryModel() 结果一致
+REFERENCE_TEMPERATURE = 1873
+REFERENCE_STATE = "liquid"
+
+
+@lru_cache(maxsize=None)
+def gauss_legendre_nodes (n: int):
+	"""返回映射到 [0, 1] 区间的 n 点 Gauss-Legendre 节点和权重。"""
+	x, w = np.polynomial.legendre.leggauss(n)
+	return 0.5 * (x + 1.0), 0.5 * w
+
+
+# ---- Miedema 二元模型 ----
+
+def miedema_rp (ea, eb, state):
+	"""计算 Miedema 模型中的 RP 项。"""
+	alpha = 1.0 if state == "solid" else 0.73
+	if ea.hybrid_factor == "other" or eb.hybrid_factor == "other": return 0.0
+	return 0.0 if ea.hybrid_factor == eb.hybrid_factor else alpha * ea.hybrid_value * eb.hybrid_value
+
+
+def miedema_fab (ea, eb, state):
+	"""计算 Miedema 模型中的 Fab 值。"""
+	if not (ea.is_exist and eb.is_exist): return float('nan')
+
+	p_ab = Constants.P_TT if (ea.is_trans_group and eb.is_trans_group) else \
+		(Constants.P_TN if (ea.is_trans_group or eb.is_trans_group) else Constants.P_NN)
+	rp_value = miedema_rp(ea, eb, state)
+	diff = 2 * p_ab * (-(ea.phi - eb.phi) ** 2 + Constants.QtoP * (ea.n_ws - eb.n_ws) ** 2 - rp_value) / \
+	       (1.0 / ea.n_ws + 1.0 / eb.n_ws)
+	return diff
+
+
+def alloy_volumes (ea, eb, xa, xb, lambda_=0):
+	"""计算合金中的体积。xa+xb=1"""
+	ya = xa / (xa + xb)
+	yb = xb / (xa + xb)
+
+	vaa = ea.v
+	vba = eb.v
+
+	if ea.name == "H" or eb.name == "H":
+		max_iterations = 1000
+		for _ in range(max_iterations):
+			new_vaa, new_vba = vaa, vba
+			pax = ya * vaa / (ya * vaa + yb * vba)
+			pbx = yb * vba / (ya * vaa + yb * vba)
+			vaa = ea.v * (1 + ea.u * pbx * (1 + lambda_ * (pax * pbx) ** 2) * (ea.phi - eb.phi))
+			vba = eb.v * (1 + eb.u * pax * (1 + lambda_ * (pax * pbx) ** 2) * (eb.phi - ea.phi))
+			if abs(vaa - new_vaa) < 1e-6 and abs(vba - new_vba) < 1e-6: break
+	else:
+		vaa = ea.v * (1 + ea.u * ya * (ea.phi - eb.phi))
+		vba = eb.v * (1 + eb.u * yb * (eb.phi - ea.phi))
+	return vaa, vba
+
+
+def alloy_volumes_array (ea, eb, xa, xb, lambda_=0):
+	"""alloy_volumes 的数组版本，xa、xb 为同形状的 NumPy 数组。
+
+	含 H 体系的体积不动点迭代逐元素进行：各点独立判断收敛，收敛后的点不再更新，
+	与逐点调用 alloy_volumes 的结果一致。
+	"""
+	ya = xa / (xa + xb)
+	yb = xb / (xa + xb)
+
+	if ea.name == "H" or eb.name == "H":
+		vaa = np.full(ya.shape, float(ea.v))
+		vba = np.full(ya.shape, float(eb.v))
+		active = np.ones(ya.shape, dtype=bool)
+		max_iterations = 1000
+		for _ in range(max_iterations):
+			pax = ya * vaa / (ya * vaa + yb * vba)
+			pbx = yb * vba / (ya * vaa + yb * vba)
+			new_vaa = ea.v * (1 + ea.u * pbx * (1 + lambda_ * (pax * pbx) ** 2) * (ea.phi - eb.phi))
+			new_vba = eb.v * (1 + eb.u * pax * (1 + lambda_ * (pax * pbx) ** 2) * (eb.phi - ea.phi))
+			converged = (np.abs(new_vaa - vaa) < 1e-6) & (np.abs(new_vba - vba) < 1e-6)
+			vaa = np.where(active, new_vaa, vaa)
+			vba = np.where(active, new_vba, vba)
+			active &= ~converged
+			if not active.any(): break
+	else:
+		vaa = ea.v * (1 + ea.u * ya * (ea.phi - eb.phi))
+		vba = eb.v * (1 + eb.u * yb * (eb.phi - ea.phi))
+	return vaa, vba
+
+
+def _transformation_enthalpies (ea, eb, state):
+	"""液态时 Si、Ge 以外元素的相变焓。"""
+	dh_trans_a = 0
+	dh_trans_b = 0
+	if state == "liquid":
+		if ea.name not in ["Si", "Ge"]:
+			dh_trans_a = ea.dh_trans
+		if eb.name not in ["Si", "Ge"]:
+			dh_trans_b = eb.dh_trans
+	return dh_trans_a, dh_trans_b
+
+
+def entropy_slope (ea, eb, state, entropy=True):
+	"""过剩熵修正 (1 - s·T) 中的系数 s；不计过剩熵时为 0。"""
+	if entropy and ea.tm and eb.tm:
+		avg_tm = 1.0 / ea.tm + 1.0 / eb.tm
+		factor = 15.1 if state == "solid" else 14.0
+		return 1.0 / factor * avg_tm
+	return 0.0
+
+
+def binary_enthalpy (a, b, xa, xb, T, state, entropy=True, lambda_=0):
+	"""二元混合焓 ΔH(xa, xb)，与 BinaryModel.binary_model 相同，但全部参数显式传入。"""
+	ea = Element(a)
+	eb = Element(b)
+	f_ab = miedema_fab(ea, eb, state)
+	entropy_term = 0
+
+	if entropy:
+		if ea.tm and eb.tm:  # Avoid division by zero
+			avg_tm = 1.0 / ea.tm + 1.0 / eb.tm
+			factor = 15.1 if state == "solid" else 14.0
+			entropy_term = 1.0 / factor * avg_tm * T
+		else:
+			entropy_term = 0.0
+
+	f_ab *= (1 - entropy_term)
+	vaa, vba = alloy_volumes(ea, eb, xa, xb, lambda_)
+	ca = xa / (xa + xb)
+	cb = xb / (xa + xb)
+	if (ca * vaa + cb * vba) == 0: return 0.0  # Avoid division by zero
+	cas = ca * vaa / (ca * vaa + cb * vba)
+	cbs = cb * vba / (ca * vaa + cb * vba)
+	fb = cbs * (1 + lambda_ * (cas * cbs) ** 2)
+	dh_trans_a, dh_trans_b = _transformation_enthalpies(ea, eb, state)
+	dh_trans = dh_trans_a * ca + dh_trans_b * cb
+
+	return fb * f_ab * ca * vaa + dh_trans
+
+
+def binary_enthalpy_terms (a, b, xa, state, entropy=True, lambda_=0, xb=None):
+	"""
+	将二元混合焓按温度分解：ΔH(x, T) = h0(x) - T·h1(x)，见 BinaryModel.binary_model_terms。
+	xa 可以是标量 (含 mpmath 数) 或 NumPy 数组。
+
+	返回:
+	(h0, h1): 与 xa 同形状的两项。
+	"""
+	ea = Element(a)
+	eb = Element(b)
+	is_array = isinstance(xa, np.ndarray)
+	if xb is None:
+		xb = 1 - xa
+
+	f_ab = miedema_fab(ea, eb, state)
+	slope = entropy_slope(ea, eb, state, entropy)
+	dh_trans_a, dh_trans_b = _transformation_enthalpies(ea, eb, state)
+
+	with np.errstate(divide='ignore', invalid='ignore'):
+		vaa, vba = alloy_volumes_array(ea, eb, xa, xb, lambda_) if is_array else \
+			alloy_volumes(ea, eb, xa, xb, lambda_)
+		ca = xa / (xa + xb)
+		cb = xb / (xa + xb)
+		denominator = ca * vaa + cb * vba
+		if not is_array and denominator == 0: return 0.0, 0.0  # Avoid division by zero
+		cas = ca * vaa / denominator
+		cbs = cb * vba / denominator
+		fb = cbs * (1 + lambda_ * (cas * cbs) ** 2)
+		mixing = fb * f_ab * ca * vaa
+		h0 = mixing + dh_trans_a * ca + dh_trans_b * cb
+		h1 = slope * mixing
+
+	if is_array:
+		h0 = np.where(denominator == 0, 0.0, h0)
+		h1 = np.where(denominator == 0, 0.0, h1)
+	return h0, h1
+
+
+# ---- 求积 ----
+
+def integrate_moments (func_array, func_scalar, quadrature=QUADRATURE_GAUSS_LEGENDRE,
+                       nodes=DEFAULT_QUADRATURE_NODES):
+	"""
+	在 [0, 1] 上同时积分多个被积函数。
+
+	参数:
+	func_array: 接受节点数组、返回多个同形状数组 (元组) 的函数，用于 Gauss-Legendre 求积。
+	func_scalar: 同一组被积函数的标量版本，返回元组，用于 mpmath 参考精度求积。
+	quadrature, nodes: 求积方式与 Gauss-Legendre 节点数。
+
+	返回:
+	(tuple, float): 各积分值，以及其中最大的误差估计。
+	"""
+	if quadrature == QUADRATURE_MPMATH:
+		values, errors = [], []
+		with mpmath.workdps(MPMATH_DPS):
+			for index in range(len(func_scalar(mpmath.mpf(0.5)))):
+				value, error = mpmath.quad(lambda x: func_scalar(x)[index], [0, 1], error=True)
+				values.append(float(value))
+				errors.append(float(error))
+	else:
+		x, w = gauss_legendre_nodes(nodes)
+		x_half, w_half = gauss_legendre_nodes(max(nodes // 2, 1))
+		values = [float(np.dot(w, f)) for f in func_array(x)]
+		coarse = [float(np.dot(w_half, f)) for f in func_array(x_half)]
+		errors = [abs(v - c) for v, c in zip(values, coarse)]
+	return tuple(values), max(errors)
+
+
+# ---- 各外推模型的辅助量 ----
+
+def kexi (solvent, solutei, T, state):
+	"""UEM1 中的 ξ^k_i (solvent、solutei 为 Element)，见 BinaryModel.kexi。"""
+	fik = miedema_fab(solvent, solutei, state)
+	elements_lst = ["Si", "Ge"]
+
+	if state == "liquid":
+		dhtrans_i = 0 if solutei.name in elements_lst else solutei.dh_trans
+		dhtrans_slv = 0 if solvent.name in elements_lst else solvent.dh_trans
+	else:
+		dhtrans_i = solutei.dh_trans
+		dhtrans_slv = solvent.dh_trans
+
+	dhtrans = dhtrans_i - dhtrans_slv
+
+	return 1000 * fik * solutei.v * (1 + solutei.u * (solutei.phi - solvent.phi)) / (Constants.R * T) + \
+	       1000 * dhtrans / (Constants.R * T)
+
+
+@lru_cache(maxsize=8192)
+def kexi_pair (solvent: str, solute: str, T, state):
+	"""按 (有序元素对, T, 相态) 缓存的 ξ，solvent、solute 为元素符号。"""
+	return kexi(Element(solvent), Element(solute), T, state)
+
+
+def miedema_fab_matrix (elements, state):
+	"""
+	miedema_fab 的矩阵形式：F[a, b] = Fab(elements[a], elements[b])，由元素属性数组一次算出。
+	任一元素不存在时为 NaN。
+	"""
+	phi = np.array([e.phi for e in elements], dtype=float)
+	n_ws = np.array([e.n_ws for e in elements], dtype=float)
+	hybrid_value = np.array([e.hybrid_value for e in elements], dtype=float)
+	hybrid_factor = np.array([e.hybrid_factor for e in elements], dtype=object)
+	trans = np.array([e.is_trans_group for e in elements], dtype=bool)
+	exist = np.array([e.is_exist for e in elements], dtype=bool)
+
+	p_ab = np.where(trans[:, None] & trans[None, :], Constants.P_TT,
+	                np.where(trans[:, None] | trans[None, :], Constants.P_TN, Constants.P_NN))
+	alpha = 1.0 if state == "solid" else 0.73
+	no_rp = (hybrid_factor[:, None] == "other") | (hybrid_factor[None, :] == "other") | \
+	        (hybrid_factor[:, None] == hybrid_factor[None, :])
+	rp_value = np.where(no_rp, 0.0, alpha * hybrid_value[:, None] * hybrid_value[None, :])
+	with np.errstate(divide='ignore', invalid='ignore'):
+		diff = 2 * p_ab * (-(phi[:, None] - phi[None, :]) ** 2 +
+		                   Constants.QtoP * (n_ws[:, None] - n_ws[None, :]) ** 2 - rp_value) / \
+		       (1.0 / n_ws[:, None] + 1.0 / n_ws[None, :])
+	return np.where(exist[:, None] & exist[None, :], diff, np.nan)
+
+
+@lru_cache(maxsize=256)
+def kexi_matrix (names: tuple, T, state):
+	"""
+	合金中全部有序元素对的 ξ 矩阵：X[a, b] = kexi(names[a] 为溶剂, names[b] 为溶质)。
+
+	由元素属性数组一次算出，按 (元素元组, T, 相态) 缓存；返回的数组只读。
+	"""
+	elements = [Element(name) for name in names]
+	v = np.array([e.v for e in elements], dtype=float)
+	u = np.array([e.u for e in elements], dtype=float)
+	phi = np.array([e.phi for e in elements], dtype=float)
+	dh_trans = np.array([e.dh_trans for e in elements], dtype=float)
+	if state == "liquid":
+		dh_trans = np.where([name in ["Si", "Ge"] for name in names], 0.0, dh_trans)
+
+	fik = miedema_fab_matrix(elements, state)
+	dhtrans = dh_trans[None, :] - dh_trans[:, None]
+	xi = 1000 * fik * v[None, :] * (1 + u[None, :] * (phi[None, :] - phi[:, None])) / (Constants.R * T) + \
+	     1000 * dhtrans / (Constants.R * T)
+	xi.setflags(write=False)
+	return xi
+
+
+def uem1_contribution_tensor (names, T, state):
+	"""
+	UEM1 全部有序三元组的贡献系数：A[k, i, j] = UEM1(names[k], names[i], names[j], T, state)，
+	由 ξ 矩阵一次广播算出。
+	"""
+	xi = kexi_matrix(tuple(names), T, state)
+	df = np.abs(xi - xi.T)
+	df_ki = df[:, :, None]
+	df_kj = df[:, None, :]
+	total = df_ki + df_kj
+	with np.errstate(divide='ignore', invalid='ignore'):
+		tensor = np.exp(-df_ki) * (df_kj / total)
+	return np.where(total == 0, 0.5, tensor)  # Avoid division by zero
+
+
+def uem2_deviation (k, i, j, T, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE, nodes=DEFAULT_QUADRATURE_NODES):
+	"""UEM2 中组元 k、i 相对 j 的偏差函数 d_ki，见 BinaryModel._get_dki_uem2 (二元积分按液态计算)。"""
+
+	def get_integral (e1_name, e2_name):
+		entropy = not (e1_name in NON_ENTROPY_ELEMENTS or e2_name in NON_ENTROPY_ELEMENTS)
+		# ∫ΔH dx = ∫h0 dx - T·∫h1 dx，缓存与温度无关的两项积分
+		key = ("uem2", (e1_name, e2_name), "liquid", lambda_, entropy, quadrature, nodes)
+
+		def compute ():
+			terms = lambda x: binary_enthalpy_terms(e1_name, e2_name, x, "liquid", entropy, lambda_)
+			return integrate_moments(terms, terms, quadrature, nodes)[0]
+
+		h0, h1 = get_integral_cache().get_or_compute(key, compute)
+		return (h0 - T * h1) * 1000 / (Constants.R * T)
+
+	f_ij = get_integral(i, j)
+	f_kj = get_integral(k, j)
+
+	denominator = f_ij + f_kj
+	if denominator == 0:
+		return float('inf')
+
+	return abs((f_ij - f_kj) / denominator)
+
+
+def gsm_similarity (k, a, b, T, state, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE,
+                    nodes=DEFAULT_QUADRATURE_NODES):
+	"""GSM 的相似系数，见 BinaryModel.yeta。"""
+	# 被积函数 (ΔH_ab - ΔH_ak)² = (d0 - T·d1)²，缓存与温度无关的 ∫d0²、∫d0·d1、∫d1²
+	key = ("yeta", (a, b, k), state, lambda_, True, quadrature, nodes)
+
+	def moments (x):
+		ab0, ab1 = binary_enthalpy_terms(a, b, x, state, True, lambda_)
+		ak0, ak1 = binary_enthalpy_terms(a, k, x, state, True, lambda_)
+		d0 = ab0 - ak0
+		d1 = ab1 - ak1
+		return d0 * d0, d0 * d1, d1 * d1
+
+	def compute ():
+		return integrate_moments(moments, moments, quadrature, nodes)[0]
+
+	c00, c01, c11 = get_integral_cache().get_or_compute(key, compute)
+	return max(c00 - 2 * T * c01 + T * T * c11, 0.0)
+
+
+def graphic_center_moments (k, i, state, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE,
+                            nodes=DEFAULT_QUADRATURE_NODES):
+	"""
+	图像中心所需积分的温度分解系数。ΔH_ki(x) = h0(x) - T·h1(x)，在同一组节点上一次求值后同时积分
+	∫h0、∫h1、∫x·h0、∫x·h1、∫h0²、∫h0·h1、∫h1²，按 (组元对, 相态, λ, 求积方式, 节点数) 缓存，与温度无关。
+	"""
+	key = ("graphic_center", (k, i), state, lambda_, True, quadrature, nodes)
+
+	def moments (x):
+		h0, h1 = binary_enthalpy_terms(k, i, x, state, True, lambda_)
+		return h0, h1, x * h0, x * h1, h0 * h0, h0 * h1, h1 * h1
+
+	def compute ():
+		return integrate_moments(moments, moments, quadrature, nodes)[0]
+
+	return get_integral_cache().get_or_compute(key, compute)
+
+
+def graphic_center (k, i, T, state, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE, nodes=DEFAULT_QUADRATURE_NODES):
+	"""二元混合焓曲线 ΔH_ki(x) 图像的中心坐标 (x, y)，见 BinaryModel.get_graphic_center。"""
+	a0, a1, b0, b1, c00, c01, c11 = graphic_center_moments(k, i, state, lambda_, quadrature, nodes)
+	# f(x) = 1000·ΔH_ki(x)：a = ∫f，x_bar = ∫x·f，y = ∫f²
+	a = 1000 * (a0 - T * a1)
+	x_bar = 1000 * (b0 - T * b1)
+	y = 1e6 * max(c00 - 2 * T * c01 + T * T * c11, 0.0)
+
+	x_ = x_bar / a if a != 0 else 0
+	y_ = y / (2.0 * a) if a != 0 else 0
+	return (x_ - 0.5, y_)
+
+
+def _delta_x (x, y):
+	pi_half = math.pi / 2.0
+	pi = math.pi
+	ax, ay = abs(x), abs(y)
+	if (0 <= ax <= pi_half and 0 <= ay <= pi_half) or \
+			(pi_half <= ax <= pi and pi_half <= ay <= pi):
+		return 0
+	else:
+		return pi_half
+
+
+def uem2_adv_deviation (k, i, j, T, state, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE,
+                        nodes=DEFAULT_QUADRATURE_NODES):
+	"""UEM2_Adv 中组元 k 和 i 之间的属性差异，见 BinaryModel.get_d_ki。"""
+	xij, yij = graphic_center(i, j, T, state, lambda_, quadrature, nodes)
+	xkj, ykj = graphic_center(k, j, T, state, lambda_, quadrature, nodes)
+
+	theta10 = math.atan2(xij, yij)
+	theta20 = math.atan2(xkj, ykj)
+	a = math.sqrt(xij ** 2 + yij ** 2)
+	b = math.sqrt(xkj ** 2 + ykj ** 2)
+
+	denom1 = (theta10 ** 2 + theta20 ** 2)
+	denom2 = math.sqrt(a ** 2 + b ** 2)
+
+	if denom1 == 0 or denom2 == 0: return float('inf')
+
+	return abs((math.pi / 2.0 * (theta10 ** 2 - theta20 ** 2) + _delta_x(theta10, theta20)) / denom1) * \
+	       abs(a - b) / denom2
+
+
+@lru_cache(maxsize=8192)
+def equimolar_enthalpy (a: str, b: str, T, state, lambda_=0):
+	"""x = 0.5 处的二元混合焓 (计入过剩熵)，按 (有序元素对, T, 相态, λ) 缓存。"""
+	return binary_enthalpy(a, b, 0.5, 0.5, T, state, True, lambda_)
+
+
+@lru_cache(maxsize=16384)
+def asym_component (k, i, j, T, state, lambda_=0):
+	"""
+	Qiao's 不对称组元选择规则，见 BinaryModel._asym_component_choice。
+
+	判定结果按有序三元组 (k, i, j) 与 (T, 相态, λ) 缓存：binary_enthalpy(a, b) 与 (b, a)
+	在末位上可能不同，按无序三元组共用结果会使个别接近零的判定与逐次计算不一致。
+	"""
+	bij = equimolar_enthalpy(i, j, T, state, lambda_)
+	bik = equimolar_enthalpy(i, k, T, state, lambda_)
+	bjk = equimolar_enthalpy(k, j, T, state, lambda_)
+
+	if (bij > 0 and bik > 0 and bjk > 0) or (bij < 0 and bik < 0 and bjk < 0):
+		enthalpies = {k: abs(bij), j: abs(bik), i: abs(bjk)}
+		return min(enthalpies, key=enthalpies.get)
+	else:
+		if bij * bik > 0:
+			return i
+		elif bij * bjk > 0:
+			return j
+		else:
+			return k
+
+
+# ---- 外推模型 ----
+
+def uem1_coefficient (k, i, j, T, state):
+	"""UEM1 贡献系数，ξ 按给定的温度与相态计算，见 BinaryModel.UEM1。"""
+	df_ki = abs(kexi_pair(k, i, T, state) - kexi_pair(i, k, T, state))
+	df_kj = abs(kexi_pair(k, j, T, state) - kexi_pair(j, k, T, state))
+	if df_ki + df_kj == 0: return 0.5  # Avoid division by zero
+	alpha = math.exp(-df_ki)
+	beta3 = df_kj / (df_ki + df_kj)
+	return alpha * beta3
+
+
+def UEM1 (k, i, j, Tem: float, phase_state: str):
+	"""
+	UEM1 模型，与 BinaryModel().UEM1 相同：ξ 在 BinaryModel 的默认状态
+	(REFERENCE_TEMPERATURE、REFERENCE_STATE) 下计算，不随 Tem、phase_state 变化。
+	"""
+	return uem1_coefficient(k, i, j, REFERENCE_TEMPERATURE, REFERENCE_STATE)
+
+
+def _uem1_reference_tensor (names, Tem, state):
+	"""UEM1 的 contribution_tensor：与 UEM1 相同，在默认状态下整体计算全部三元组。"""
+	return uem1_contribution_tensor(names, REFERENCE_TEMPERATURE, REFERENCE_STATE)
+
+
+# TernaryMelts.contribution_tensor 对带有 contribution_tensor 属性的外推模型整体计算全部三元组
+UEM1.contribution_tensor = _uem1_reference_tensor
+
+
+def UEM2 (k, i, j, Tem: float, phase_state: str, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE,
+          nodes=DEFAULT_QUADRATURE_NODES):
+	"""UEM2 模型。"""
+	df_ki = uem2_deviation(k, i, j, Tem, lambda_, quadrature, nodes)
+	df_kj = uem2_deviation(k, j, i, Tem, lambda_, quadrature, nodes)
+
+	denominator = df_ki + df_kj
+	if denominator == 0:
+		return 0.5
+
+	weight1 = df_kj / denominator
+	return math.exp(-df_ki) * weight1
+
+
+def GSM (k, i, j, Tem: float, phase_state: str, lambda_=0, quadrature=QUADRATURE_GAUSS_LEGENDRE,
+         nodes=DEFAULT_QUADRATURE_NODES):
+	"""GSM 模型。"""
+	nki = gsm_similarity(k, i, j, Tem, phase_state, lambda_, quadrature, nodes)
+	nkj = gsm_similarity(k, j, i, Tem, phase_state, lambda_, quadrature, nodes)
+	return nki / (nki + nkj) if (nki + nkj) != 0 else 0.5
+
+
+def Muggianu (k, i, j, Tem: float, phase_state: str):
+	return 0.5
+
+
+def Toop_Muggianu (k, i, j, Tem: float, phase_state: str, lambda_=0):
+	asym = asym_component(k, i, j, Tem, phase_state, lambda_)
+	if k == asym:
+		return 0.5
+	elif i == asym:
+		return 0.0
+	else:
+		return 1.0
+
+
+def Toop_Kohler (k: str, i: str, j: str, T: float, phase_state: str, lambda_=0):
+	asym = asym_component(k, i, j, T, phase_state, lambda_)
+	return 0.0 if asym == k or asym == i else 1.0
+
+
+def UEM2_Adv (k: str, i: str, j: str, T: float, phase_state: str, lambda_=0,
+              quadrature=QUADRATURE_GAUSS_LEGENDRE, nodes=DEFAULT_QUADRATURE_NODES):
+	"""UEM2_Adv 模型，图像中心按给定的温度与相态计算。"""
+	d_ki = uem2_adv_deviation(k, i, j, T, phase_state, lambda_, quadrature, nodes)
+	d_kj = uem2_adv_deviation(k, j, i, T, phase_state, lambda_, quadrature, nodes)
+	return d_kj / (d_ki + d_kj) * math.exp(-d_ki)
+
+
+MODEL_KERNELS = {
+	"UEM1": UEM1,
+	"UEM2": UEM2,
+	"UEM2_Adv": UEM2_Adv,
+	"GSM": GSM,
+	"Muggianu": Muggianu,
+	"Toop_Muggianu": Toop_Muggianu,
+	"Toop_Kohler": Toop_Kohler,
+}
+
+
+def get_model_kernel (name: str):
+	"""按名称 (如 "UEM1"、"Toop-Muggianu") 返回外推模型的计算核。"""
+	kernel = MODEL_KERNELS.get(name.replace('-', '_'))
+	if kernel is None:
+		raise ValueError(f"未知的外推模型: {name}")
+	return kernel
+
+
+def clear_parameter_caches ():
+	"""清空按元素符号缓存的派生量 (ξ、等摩尔混合焓、不对称组元判定)；MiedemaParameter 被修改后调用。"""
+	kexi_pair.cache_clear()
+	kexi_matrix.cache_clear()
+	equimolar_enthalpy.cache_clear()
+	asym_component.cache_clear()
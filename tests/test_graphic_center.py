@@ -0,0 +1,28 @@
+import itertools
+
+import pytest
+
+from models import model_kernels
+
+integrate = pytest.importorskip("scipy.integrate")
+
+ELEMENTS = ["Fe", "C", "Si", "Mn", "Cr", "Ni", "Al", "Cu"]
+
+
+def _scipy_graphic_center (k, i, T, state):
+	"""BinaryModel.get_graphic_center 原来的写法：对 f、x·f、f² 分别调用 scipy.integrate.quad。"""
+	func_x = lambda x: model_kernels.binary_enthalpy(k, i, x, 1 - x, T, state, True, 0) * 1000
+	x_bar = integrate.quad(lambda x: x * func_x(x), 0, 1)[0]
+	a = integrate.quad(func_x, 0, 1)[0]
+	y = integrate.quad(lambda x: func_x(x) * func_x(x), 0, 1)[0]
+	x_ = x_bar / a if a != 0 else 0
+	y_ = y / (2.0 * a) if a != 0 else 0
+	return (x_ - 0.5, y_)
+
+
+@pytest.mark.parametrize("temperature, state", [(1600.0, "liquid"), (1873.0, "liquid"), (1200.0, "solid")])
+def test_fused_moments_match_scipy_quad (temperature, state):
+	for k, i in itertools.permutations(ELEMENTS, 2):
+		expected = _scipy_graphic_center(k, i, temperature, state)
+		actual = model_kernels.graphic_center(k, i, temperature, state)
+		assert actual == pytest.approx(expected, rel=1e-8, abs=1e-10), (k, i)
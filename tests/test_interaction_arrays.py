@@ -0,0 +1,170 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from calculations.activity_calculator import ActivityCoefficient, TemperatureSweep
+from core.element import Element
+from models.activity_interaction_parameters import TernaryMelts
+from models.extrapolation_models import BinaryModel
+from utils import DataLogger
+
+# (溶剂, 成分)
+ALLOYS = [
+	("Fe", {"Fe": 0.90, "C": 0.04, "Si": 0.03, "Mn": 0.03}),
+	("Ni", {"Ni": 0.80, "Cr": 0.15, "C": 0.05}),
+]
+MODELS = ["UEM1", "GSM", "UEM2"]
+TEMPERATURES = [1600.0, 1873.0]
+FORMALISMS = ["Wagner", "Darken", "Elliott", "Elliot1"]
+STATE = "liquid"
+
+
+@pytest.fixture(autouse=True)
+def _no_contribution_log ():
+	DataLogger.set_logging_enabled(False)
+	yield
+	DataLogger.set_logging_enabled(True)
+
+
+def _model (name):
+	# 界面中每个窗口使用默认状态的 BinaryModel 实例
+	return getattr(BinaryModel(), name)
+
+
+def _solutes (alloy):
+	solvent, comp = alloy
+	return Element(solvent), [Element(k) for k in comp if k != solvent]
+
+
+def _pairwise_epsilon (solvent, solutes, T, model, name):
+	melts = TernaryMelts(T, STATE)
+	return np.array([[melts.activity_interact_coefficient_1st(solvent, i, j, T, STATE, model, name)
+	                  for j in solutes] for i in solutes])
+
+
+def _pairwise_rho (solvent, solutes, T, model, name):
+	melts = TernaryMelts(T, STATE)
+	return np.array([[[melts.roui_jk(solvent, i, j, k, T, STATE, model, name)
+	                   for k in solutes] for j in solutes] for i in solutes])
+
+
+def _loop_ln_gamma (comp, solvent, component, T, model, name, formalism):
+	"""ln γ 原来的逐项求和写法，参数逐对调用 activity_interact_coefficient_1st 与 roui_jk。"""
+	solv = Element(solvent)
+	keys = [k for k in comp if k != solvent]
+	elements = [Element(k) for k in keys]
+	x = [comp[k] for k in keys]
+	eps = _pairwise_epsilon(solv, elements, T, model, name)
+	n = len(keys)
+	pairs = list(itertools.product(range(n), repeat=2))
+	darken = sum(x[j] * x[k] * eps[j, k] for j, k in pairs)
+	if component == solvent:
+		return -0.5 * darken
+	i = keys.index(component)
+	base = TernaryMelts(T, STATE).ln_y0(solv, elements[i]) + sum(eps[i, j] * x[j] for j in range(n))
+	if formalism == "Wagner":
+		return base
+	if formalism == "Darken":
+		return base - 0.5 * darken
+	rho = _pairwise_rho(solv, elements, T, model, name)
+	elliott = sum(0.5 * rho[i, j, k] * x[j] * x[k] for j, k in pairs)
+	if formalism == "Elliott":
+		return base + elliott
+	corrected = sum(x[p] * x[j] * x[k] * (rho[k, p, j] + eps[j, k])
+	                for j, k, p in itertools.product(range(n), repeat=3))
+	return base + elliott - 1.0 / 3 * corrected
+
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("T", TEMPERATURES)
+@pytest.mark.parametrize("alloy", ALLOYS, ids=lambda a: a[0])
+def test_first_order_matrix_matches_pairwise (alloy, T, name):
+	solvent, solutes = _solutes(alloy)
+	model = _model(name)
+	matrix = TernaryMelts(T, STATE).first_order_matrix(solvent, solutes, T, STATE, model, name)
+	np.testing.assert_allclose(matrix, _pairwise_epsilon(solvent, solutes, T, model, name), rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("T", TEMPERATURES)
+@pytest.mark.parametrize("alloy", ALLOYS, ids=lambda a: a[0])
+def test_second_order_tensor_matches_roui_jk (alloy, T, name):
+	solvent, solutes = _solutes(alloy)
+	model = _model(name)
+	melts = TernaryMelts(T, STATE)
+	expected = _pairwise_rho(solvent, solutes, T, model, name)
+	np.testing.assert_allclose(melts.second_order_tensor(solvent, solutes, T, STATE, model, name),
+	                           expected, rtol=1e-10, atol=1e-12)
+	# 只计算部分溶质时取对应的层
+	rows = melts.second_order_tensor(solvent, solutes, T, STATE, model, name, targets=solutes[-1:])
+	np.testing.assert_allclose(rows, expected[-1:], rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("alloy", ALLOYS, ids=lambda a: a[0])
+def test_temperature_arrays_match_pointwise (alloy, name):
+	solvent, solutes = _solutes(alloy)
+	model = _model(name)
+	melts = TernaryMelts(TEMPERATURES[0], STATE)
+	epsilon = melts.first_order_matrices(solvent, solutes, TEMPERATURES, STATE, model, name)
+	rho = melts.second_order_tensors(solvent, solutes, TEMPERATURES, STATE, model, name)
+	for m, T in enumerate(TEMPERATURES):
+		np.testing.assert_allclose(epsilon[m], _pairwise_epsilon(solvent, solutes, T, model, name),
+		                           rtol=1e-10, atol=1e-12)
+		expected = _pairwise_rho(solvent, solutes, T, model, name)
+		if np.isnan(rho[m]).any():
+			# 逐项计算出现零除的温度整体为 NaN，由调用方改为逐点计算
+			assert np.isnan(rho[m]).all() and np.isnan(expected).any()
+		else:
+			np.testing.assert_allclose(rho[m], expected, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("formalism", FORMALISMS)
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("alloy", ALLOYS, ids=lambda a: a[0])
+def test_get_ln_gamma_matches_loop_sums (alloy, name, formalism):
+	solvent, comp = alloy
+	model = _model(name)
+	T = TEMPERATURES[-1]
+	for component in comp:
+		actual = ActivityCoefficient().get_ln_gamma(comp, component, solvent, T, STATE, model, name, formalism)
+		expected = _loop_ln_gamma(comp, solvent, component, T, model, name, formalism)
+		np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12, err_msg=component)
+
+
+@pytest.mark.parametrize("formalism", FORMALISMS)
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("alloy", ALLOYS, ids=lambda a: a[0])
+def test_ln_gamma_batch_matches_get_ln_gamma (alloy, name, formalism):
+	solvent, comp = alloy
+	model = _model(name)
+	T = TEMPERATURES[0]
+	components = list(comp)
+	# 沿第一个溶质的浓度变化，溶剂补足余量
+	compositions = []
+	for xs in (0.01, 0.03, 0.06):
+		point = dict(comp, **{components[1]: xs})
+		point[solvent] = 1.0 - sum(v for k, v in point.items() if k != solvent)
+		compositions.append([point[k] for k in components])
+	calculator = ActivityCoefficient()
+	batch = calculator.get_ln_gamma_batch(components, compositions, solvent, T, STATE, model, name, formalism)
+	for row, values in zip(batch, compositions):
+		point = dict(zip(components, values))
+		expected = [calculator.get_ln_gamma(point, c, solvent, T, STATE, model, name, formalism) for c in components]
+		np.testing.assert_allclose(row, expected, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("name", MODELS)
+@pytest.mark.parametrize("alloy", ALLOYS, ids=lambda a: a[0])
+def test_temperature_sweep_matches_get_ln_gamma (alloy, name):
+	solvent, comp = alloy
+	model = _model(name)
+	temperatures = [1500.0, 1700.0, 1873.0, 2000.0]
+	sweep = TemperatureSweep(comp, solvent, STATE, model, name)
+	calculator = ActivityCoefficient()
+	for component in comp:
+		result = sweep.evaluate(temperatures, component, FORMALISMS)
+		expected = [[calculator.get_ln_gamma(comp, component, solvent, T, STATE, model, name, f) for f in FORMALISMS]
+		            for T in temperatures]
+		np.testing.assert_allclose(result, expected, rtol=1e-10, atol=1e-12, err_msg=component)
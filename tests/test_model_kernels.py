@@ -0,0 +1,67 @@
+import itertools
+import math
+
+import pytest
+
+from core.element import Element
+from models import model_kernels
+from models.extrapolation_models import BinaryModel
+
+ELEMENTS = ["Fe", "C", "Si", "Mn", "Cr", "Ni"]
+CONDITIONS = [(1600.0, "liquid"), (1873.0, "liquid"), (2000.0, "liquid"), (1200.0, "solid")]
+
+
+def _original_uem1 (model, k, i, j):
+	"""BinaryModel.UEM1 原来的写法：ξ 由 BinaryModel.kexi 按实例的温度与相态计算。"""
+	df_ki = abs(model.kexi(Element(k), Element(i)) - model.kexi(Element(i), Element(k)))
+	df_kj = abs(model.kexi(Element(k), Element(j)) - model.kexi(Element(j), Element(k)))
+	if df_ki + df_kj == 0: return 0.5
+	return math.exp(-df_ki) * df_kj / (df_ki + df_kj)
+
+
+@pytest.mark.parametrize("temperature, state", CONDITIONS)
+def test_uem1_matches_original_formula (temperature, state):
+	model = BinaryModel()
+	model.set_temperature(temperature)
+	model.set_state(state)
+	for k, i, j in itertools.permutations(ELEMENTS, 3):
+		assert model.UEM1(k, i, j, 1873, "liquid") == pytest.approx(_original_uem1(model, k, i, j), rel=1e-12)
+
+
+def test_uem1_uses_instance_state_not_call_arguments ():
+	model = BinaryModel()
+	expected = _original_uem1(model, "Fe", "C", "Si")
+	assert model.UEM1("Fe", "C", "Si", 1600.0, "solid") == pytest.approx(expected, rel=1e-12)
+	assert model_kernels.UEM1("Fe", "C", "Si", 1600.0, "solid") == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("name", sorted(model_kernels.MODEL_KERNELS))
+@pytest.mark.parametrize("temperature, state", CONDITIONS)
+def test_kernel_matches_binary_model (name, temperature, state):
+	kernel = model_kernels.get_model_kernel(name)
+	for k, i, j in itertools.permutations(ELEMENTS[:4], 3):
+		# 界面中每个窗口使用默认状态的 BinaryModel 实例
+		method = getattr(BinaryModel(), name)
+		expected = method(k, i, j, temperature, state)
+		assert kernel(k, i, j, temperature, state) == pytest.approx(expected, rel=1e-9, nan_ok=True), (k, i, j)
+
+
+# 图像中心改为按调用温度计算之前的 UEM2_Adv 结果 (当时固定按实例的 1873 K 计算)
+UEM2_ADV_AT_1873 = {
+	("Fe", "C", "Si"): 0.01050954027399239,
+	("Fe", "Mn", "C"): 0.7004685707576945,
+	("Si", "Cr", "Ni"): 0.942056047640735,
+}
+
+
+@pytest.mark.parametrize("triple", sorted(UEM2_ADV_AT_1873))
+def test_uem2_adv_follows_call_temperature (triple):
+	old = UEM2_ADV_AT_1873[triple]
+	# 在实例温度下与原结果相同
+	assert BinaryModel().UEM2_Adv(*triple, 1873.0, "liquid") == pytest.approx(old, rel=1e-12)
+	# 其他温度下图像中心随 T 变化，不再停留在 1873 K 的结果
+	model = BinaryModel()
+	at_1600 = model.UEM2_Adv(*triple, 1600.0, "liquid")
+	assert at_1600 != pytest.approx(old, rel=1e-6)
+	model.set_temperature(1600.0)
+	assert model.UEM2_Adv(*triple, 1600.0, "liquid") == at_1600
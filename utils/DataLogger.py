@@ -1,9 +1,64 @@
+import atexit
 import os
+import queue
+import sqlite3
+import threading
+import time
 from datetime import datetime
 from core.utils import get_canonical_alloy_name
 
 # 定义存放所有日志的文件夹名称
 LOG_DIRECTORY = "calculation_logs"
+# 贡献系数日志数据库 (位于 LOG_DIRECTORY 中)
+CONTRIBUTION_LOG_DB = "contribution_log.db"
+
+# 空闲多少秒后将暂存的日志写入文件
+FLUSH_INTERVAL = 0.5
+
+# 全局开关：批量计算或性能测试时可关闭贡献系数日志
+_logging_enabled = True
+
+
+def set_logging_enabled (enabled: bool):
+	"""打开或关闭贡献系数日志。"""
+	global _logging_enabled
+	_logging_enabled = bool(enabled)
+
+
+def is_logging_enabled () -> bool:
+	return _logging_enabled
+
+
+def _log_directory ():
+	current_dir = os.path.dirname(os.path.abspath(__file__))
+	project_root = os.path.dirname(current_dir)
+	return os.path.join(project_root, LOG_DIRECTORY)
+
+
+def _format_log (canonical_name, model_name, temperature, contribution_data, timestamp):
+	"""按日志文件的固定格式生成文本。"""
+	content = []
+	# Header
+	content.append(f"Contribution Coefficient Log for Alloy System: {canonical_name}")
+	content.append(f"Extrapolation Model: {model_name} 模型")
+	content.append("=" * 60)
+
+	# Calculation Record
+	content.append(f"\n# --- Calculation Record: {timestamp} ---")
+	content.append(f"# Calculation Type: Fixed Point")
+	content.append(f"# Parameter 'temperature': {temperature:.2f}K")
+	content.append("#" + "-" * 50)
+
+	# 遍历贡献系数数据来格式化输出
+	for subsystem, contributions in contribution_data.items():
+		content.append(f"\n# For Binary Sub-system: {subsystem}")
+		for contributor, value in contributions.items():
+			# 使用 f-string 的格式化功能来创建对齐的列
+			# {contributor:<12} 表示左对齐，并占用12个字符的宽度
+			line = f"{contributor:<12}: {value:.4f}"
+			content.append(line)
+		content.append(f"\t\t in {subsystem}")  # 此处的对齐保持不变
+	return "\n".join(content)
 
 
 def log_contribution_coefficients (
@@ -14,7 +69,7 @@ def log_contribution_coefficients (
 		full_alloy_context: str = ""
 ):
 	"""
-	根据用户指定的最终精确格式，将贡献系数记录到日志文件中。
+	根据用户指定的最终精确格式，将贡献系数记录到日志文件中 (同步写入)。
 	"""
 	try:
 		# --- 文件名生成逻辑 (此部分已正确，无需修改) ---
@@ -22,47 +77,255 @@ def log_contribution_coefficients (
 			canonical_name = get_canonical_alloy_name(full_alloy_context)
 		else:
 			canonical_name = get_canonical_alloy_name(ternary_system)
-		
+
 		filename = f"Log_{canonical_name}_{model_name}.txt"
-		
+
 		# --- 目录和路径逻辑 (无需修改) ---
-		current_dir = os.path.dirname(os.path.abspath(__file__))
-		project_root = os.path.dirname(current_dir)
-		log_path = os.path.join(project_root, LOG_DIRECTORY)
-		
+		log_path = _log_directory()
+
 		if not os.path.exists(log_path):
 			os.makedirs(log_path)
-		
+
 		filepath = os.path.join(log_path, filename)
-		
-		# ★★★★★ 内容格式化逻辑 (精确对齐修正) ★★★★★
 		timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-		
-		content = []
-		# Header
-		content.append(f"Contribution Coefficient Log for Alloy System: {canonical_name}")
-		content.append(f"Extrapolation Model: {model_name} 模型")
-		content.append("=" * 60)
-		
-		# Calculation Record
-		content.append(f"\n# --- Calculation Record: {timestamp} ---")
-		content.append(f"# Calculation Type: Fixed Point")
-		content.append(f"# Parameter 'temperature': {temperature:.2f}K")
-		content.append("#" + "-" * 50)
-		
-		# 遍历贡献系数数据来格式化输出
-		for subsystem, contributions in contribution_data.items():
-			content.append(f"\n# For Binary Sub-system: {subsystem}")
-			for contributor, value in contributions.items():
-				# 使用 f-string 的格式化功能来创建对齐的列
-				# {contributor:<12} 表示左对齐，并占用12个字符的宽度
-				line = f"{contributor:<12}: {value:.4f}"
-				content.append(line)
-			content.append(f"\t\t in {subsystem}")  # 此处的对齐保持不变
-		
+
 		# 写入文件
 		with open(filepath, "w", encoding="utf-8") as f:
-			f.write("\n".join(content))
-	
+			f.write(_format_log(canonical_name, model_name, temperature, contribution_data, timestamp))
+
 	except Exception as e:
-		print(f"Error while writing log file: {e}")
\ No newline at end of file
+		print(f"Error while writing log file: {e}")
+
+
+class ContributionLogStore:
+	"""贡献系数日志库 (SQLite 文件)，只追加不修改。
+
+	每个贡献系数一行：(记录号, 时间, 合金体系, 外推模型, T, 三元体系, 二元子体系, 贡献项, 数值)，
+	同一次记录的各行共用记录号。按合金体系与外推模型建有索引，export_text() 可导出
+	原来的 Log_<体系>_<模型>.txt 文本格式。
+	"""
+
+	_SCHEMA = (
+		"CREATE TABLE IF NOT EXISTS contributions ("
+		"record INTEGER, recorded_at TEXT, system TEXT, model TEXT, temperature REAL, "
+		"ternary TEXT, subsystem TEXT, contributor TEXT, value REAL)",
+		"CREATE INDEX IF NOT EXISTS idx_contributions_system ON contributions (system, model)",
+		"CREATE INDEX IF NOT EXISTS idx_contributions_model ON contributions (model)",
+	)
+
+	def __init__ (self, path: str):
+		self.path = path
+		self._lock = threading.Lock()
+
+	def _connect (self):
+		os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+		conn = sqlite3.connect(self.path)
+		for statement in self._SCHEMA:
+			conn.execute(statement)
+		return conn
+
+	def append (self, records):
+		"""
+		批量追加记录。
+
+		参数:
+		records: (时间, 合金体系, 外推模型, T, 三元体系, 贡献系数字典) 的序列，
+		         贡献系数字典的格式与 log_contribution_coefficients 相同。
+		"""
+		records = list(records)
+		if not records:
+			return
+		with self._lock:
+			conn = self._connect()
+			try:
+				# 读取最大记录号与写入放在同一个写事务中，避免多个进程同时追加时分到相同的记录号
+				conn.execute("BEGIN IMMEDIATE")
+				record = conn.execute("SELECT COALESCE(MAX(record), 0) FROM contributions").fetchone()[0]
+				rows = []
+				for recorded_at, system, model, temperature, ternary, contribution_data in records:
+					record += 1
+					for subsystem, contributions in contribution_data.items():
+						for contributor, value in contributions.items():
+							rows.append((record, recorded_at, system, model, float(temperature), ternary, subsystem,
+							             contributor, float(value)))
+				conn.executemany("INSERT INTO contributions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+				conn.commit()
+			except Exception:
+				conn.rollback()
+				raise
+			finally:
+				conn.close()
+
+	def query (self, system: str = None, model: str = None):
+		"""
+		按合金体系 (规范名称，如 "C-Fe-Si") 和/或外推模型查询，返回按写入顺序排列的行：
+		(记录号, 时间, 合金体系, 外推模型, T, 三元体系, 二元子体系, 贡献项, 数值)。
+		"""
+		conditions, params = [], []
+		if system is not None:
+			conditions.append("system = ?")
+			params.append(system)
+		if model is not None:
+			conditions.append("model = ?")
+			params.append(model)
+		where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+		if not os.path.exists(self.path):
+			return []
+		with self._lock:
+			conn = self._connect()
+			try:
+				return conn.execute(f"SELECT record, recorded_at, system, model, temperature, ternary, subsystem, "
+				                    f"contributor, value FROM contributions{where} ORDER BY rowid", params).fetchall()
+			finally:
+				conn.close()
+
+	def export_text (self, directory: str = None, system: str = None, model: str = None):
+		"""
+		以原来的文本格式导出：每个 (合金体系, 外推模型) 一个 Log_<体系>_<模型>.txt，
+		内容为该组合最后一次的记录。
+
+		返回:
+		list: 写出的文件路径。
+		"""
+		directory = directory or _log_directory()
+		latest = {}
+		for record, recorded_at, sys_name, model_name, temperature, ternary, subsystem, contributor, value in \
+				self.query(system, model):
+			entry = latest.get((sys_name, model_name))
+			if entry is None or entry[0] != record:
+				entry = latest[(sys_name, model_name)] = (record, recorded_at, temperature, {})
+			entry[3].setdefault(subsystem, {})[contributor] = value
+
+		os.makedirs(directory, exist_ok=True)
+		paths = []
+		for (sys_name, model_name), (record, recorded_at, temperature, contribution_data) in latest.items():
+			path = os.path.join(directory, f"Log_{sys_name}_{model_name}.txt")
+			with open(path, "w", encoding="utf-8") as f:
+				f.write(_format_log(sys_name, model_name, temperature, contribution_data, recorded_at))
+			paths.append(path)
+		return paths
+
+
+def default_contribution_log_path () -> str:
+	return os.path.join(_log_directory(), CONTRIBUTION_LOG_DB)
+
+
+def get_contribution_log_store () -> ContributionLogStore:
+	"""返回当前日志目录下的贡献系数日志库。"""
+	return ContributionLogStore(default_contribution_log_path())
+
+
+class ContributionLogWriter:
+	"""贡献系数日志的后台写入线程。
+
+	计算线程只把记录放入队列；写入线程负责规范化合金名称、过滤组元数不足 3 的体系，
+	并合并一次计算中完全相同的记录。队列空闲 FLUSH_INTERVAL 秒或调用 flush() 时，
+	暂存的记录一次批量追加到贡献系数日志库 (ContributionLogStore)。
+	"""
+
+	_FLUSH = object()
+
+	def __init__ (self):
+		self._queue = queue.Queue()
+		self._pending = {}
+		self._canonical_names = {}
+		self._thread = None
+		self._lock = threading.Lock()
+
+	def _ensure_started (self):
+		if self._thread is not None:
+			return
+		with self._lock:
+			if self._thread is None:
+				self._thread = threading.Thread(target=self._run, name="ContributionLogWriter", daemon=True)
+				self._thread.start()
+
+	def submit (self, ternary_system: str, model_name: str, temperature: float, contribution_data: dict,
+	            full_alloy_context: str = ""):
+		"""放入一条记录，立即返回。"""
+		self._ensure_started()
+		self._queue.put((ternary_system, model_name, temperature, contribution_data, full_alloy_context, time.time()))
+
+	def flush (self, timeout: float = None):
+		"""写入全部已提交的记录，写完 (或超时) 后返回。"""
+		if self._thread is None:
+			return
+		done = threading.Event()
+		self._queue.put((self._FLUSH, done))
+		done.wait(timeout)
+
+	def _canonical_name (self, system):
+		name = self._canonical_names.get(system)
+		if name is None:
+			name = self._canonical_names[system] = get_canonical_alloy_name(system)
+		return name
+
+	def _add (self, record):
+		ternary_system, model_name, temperature, contribution_data, full_alloy_context, submitted = record
+		canonical_name = self._canonical_name(full_alloy_context if full_alloy_context else ternary_system)
+		# 只在体系组元数大于等于3时才记录日志
+		if len(canonical_name.split('-')) < 3:
+			return
+		key = (canonical_name, model_name, temperature, ternary_system,
+		       tuple((subsystem, tuple(values.items())) for subsystem, values in contribution_data.items()))
+		if key in self._pending:
+			return
+		timestamp = datetime.fromtimestamp(submitted).strftime("%Y-%m-%d %H:%M:%S")
+		self._pending[key] = (timestamp, canonical_name, model_name, temperature, ternary_system, contribution_data)
+
+	def _write_pending (self):
+		pending, self._pending = self._pending, {}
+		if not pending:
+			return
+		try:
+			get_contribution_log_store().append(pending.values())
+		except Exception as e:
+			print(f"Error while writing log file: {e}")
+
+	def _run (self):
+		while True:
+			try:
+				item = self._queue.get(timeout=FLUSH_INTERVAL)
+			except queue.Empty:
+				self._write_pending()
+				continue
+			if item[0] is self._FLUSH:
+				self._write_pending()
+				item[1].set()
+			else:
+				self._add(item)
+
+
+_contribution_log_writer = ContributionLogWriter()
+atexit.register(_contribution_log_writer.flush, 5.0)
+
+
+def queue_contribution_coefficients (ternary_system: str, model_name: str, temperature: float,
+                                     contribution_data: dict, full_alloy_context: str = ""):
+	"""
+	异步记录贡献系数：参数与 log_contribution_coefficients 相同，由后台线程合并后
+	追加到贡献系数日志库。日志被关闭时直接忽略。
+	"""
+	if _logging_enabled:
+		_contribution_log_writer.submit(ternary_system, model_name, temperature, contribution_data,
+		                                full_alloy_context)
+
+
+def flush_contribution_logs (timeout: float = None):
+	"""等待已提交的贡献系数日志全部写入文件。"""
+	_contribution_log_writer.flush(timeout)
+
+
+def export_contribution_logs (directory: str = None, system: str = None, model: str = None):
+	"""
+	先写入尚在队列中的记录，再把贡献系数日志库导出为 Log_<体系>_<模型>.txt 文本文件。
+
+	参数:
+	directory: 导出目录，缺省为日志目录 (calculation_logs)。
+	system, model: 只导出指定的合金体系或外推模型 (可选)。
+
+	返回:
+	list: 写出的文件路径。
+	"""
+	flush_contribution_logs(5.0)
+	return get_contribution_log_store().export_text(directory, system, model)